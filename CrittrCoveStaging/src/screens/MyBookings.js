@@ -22,7 +22,7 @@ const MyBookings = () => {
   const [bookings, setBookings] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
-  const [page, setPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState(null);
   const [hasMore, setHasMore] = useState(true);
   const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [activeFilter, setActiveFilter] = useState('all');
@@ -50,7 +50,7 @@ const MyBookings = () => {
     }
   }, [userRole, isApprovedProfessional]);
 
-  const fetchBookings = async (pageNum = 1, isLoadMore = false) => {
+  const fetchBookings = async (cursor = null, isLoadMore = false) => {
     if (isLoadMore) {
       setIsLoadingMore(true);
     } else {
@@ -69,7 +69,7 @@ const MyBookings = () => {
           isApprovedProfessional,
           userRole,
           activeTab,
-          page: pageNum,
+          cursor,
           status: activeFilter
         });
       }
@@ -79,9 +79,12 @@ const MyBookings = () => {
         { 
           headers: { Authorization: `Bearer ${token}` },
           params: {
-            page: pageNum,
             page_size: 20,
-            status: activeFilter
+            status: activeFilter,
+            // Each list is paged by the cursor the previous response returned for it
+            ...(cursor && {
+              [activeTab === 'professional' ? 'professional_cursor' : 'client_cursor']: cursor
+            })
           }
         }
       );
@@ -96,8 +99,10 @@ const MyBookings = () => {
         setBookings(newBookings);
       }
 
-      setHasMore(newBookings.length === 20);
-      setPage(pageNum);
+      const nextPage = response.data.next_page || {};
+      const newCursor = (activeTab === 'professional' ? nextPage.professional_cursor : nextPage.client_cursor) || null;
+      setNextCursor(newCursor);
+      setHasMore(newCursor !== null);
     } catch (error) {
       console.error('Error fetching bookings:', error);
       setError('Failed to fetch bookings');
@@ -117,9 +122,9 @@ const MyBookings = () => {
         activeFilter
       });
     }
-    setPage(1);
+    setNextCursor(null);
     setBookings([]);
-    fetchBookings(1);
+    fetchBookings();
   }, [activeTab, userRole, isApprovedProfessional, activeFilter]);
 
   // Handle search
@@ -127,9 +132,9 @@ const MyBookings = () => {
     setSearchQuery(query);
     
     if (!query.trim()) {
-      setPage(1);
+      setNextCursor(null);
       setBookings([]);
-      fetchBookings(1);
+      fetchBookings();
       return;
     }
 
@@ -152,8 +157,8 @@ const MyBookings = () => {
   };
 
   const handleLoadMore = () => {
-    if (!isLoadingMore && hasMore) {
-      fetchBookings(page + 1, true);
+    if (!isLoadingMore && hasMore && nextCursor) {
+      fetchBookings(nextCursor, true);
     }
   };
 
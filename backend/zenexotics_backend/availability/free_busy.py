@@ -0,0 +1,393 @@
+"""
+Per-professional free/busy calendar.
+
+Answering "is the professional free between D1 and D2" used to mean walking
+Availability rows and BookingOccurrence rows date by date. Here everything
+that holds a professional's time (UNAVAILABLE/BOOKED Availability blocks and
+the occurrences of confirmed bookings) is loaded once into an IntervalIndex:
+the source intervals sorted by start, plus the merged busy blocks as two
+parallel sorted lists of starts and ends. A range query bisects to the first
+block that ends after the range start and walks forward, so it costs
+O(log n + k) for k blocks in the range. The professional's latest
+DefaultAvailability decides what the time outside those blocks is: free when
+AVAILABLE (or never set), none of it when UNAVAILABLE.
+
+All times are naive UTC datetimes, the same convention as BookingOccurrence.
+A block whose end time isn't after its start time runs past midnight into
+the next day (00:00-00:00 is the whole day).
+
+Calendars are cached per process. When a transaction that saves or deletes an
+Availability row, a booking or one of its occurrences commits, the cached
+calendar of that professional is updated in place: only the affected source
+intervals are added or removed and only the merged block they belonged to is
+re-merged. Saving DefaultAvailability drops the professional's calendar.
+Other worker processes pick up changes when their copy is older than
+AVAILABILITY_CALENDAR_MAX_AGE_SECONDS. Writers that bypass signals
+(bulk_create/bulk_update) call mark_booking_availability_dirty themselves.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from bookings.constants import BookingStates
+from core.commit_batches import CommitBatches
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_CALENDAR_MAX_AGE_SECONDS = 300
+AVAILABILITY_CALENDAR_CACHE_SIZE = 500
+
+# Availability types that take the professional's time
+BUSY_AVAILABILITY_TYPES = ('UNAVAILABLE', 'BOOKED')
+
+# Booking states whose occurrences hold the professional's time
+CONFIRMED_STATES = (
+    BookingStates.CONFIRMED,
+    BookingStates.CONFIRMED_PENDING_PROFESSIONAL_CHANGES,
+    BookingStates.CONFIRMED_PENDING_CLIENT_APPROVAL,
+)
+
+_lock = threading.RLock()
+_calendars = OrderedDict()
+
+
+def block_window(day, start_time, end_time):
+    """(start, end) datetimes of an Availability block on day"""
+    start = datetime.combine(day, start_time)
+    end = datetime.combine(day, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+def occurrence_window(start_date, start_time, end_date, end_time):
+    """(start, end) datetimes of a BookingOccurrence"""
+    return datetime.combine(start_date, start_time), datetime.combine(end_date, end_time)
+
+
+def _merge(intervals):
+    """Sorted (start, end, key) intervals -> merged (starts, ends); touching intervals merge"""
+    starts, ends = [], []
+    for start, end, _ in intervals:
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+class IntervalIndex:
+    """
+    Busy intervals keyed by their source, with the merged blocks kept sorted.
+
+    add() and remove() update only the merged blocks the interval touches;
+    overlapping() and gaps() bisect into the merged blocks.
+    """
+
+    def __init__(self, intervals=()):
+        self._sources = {}
+        for key, start, end in intervals:
+            if end > start:
+                self._sources[key] = (start, end)
+        self._intervals = sorted((start, end, key) for key, (start, end) in self._sources.items())
+        self._interval_starts = [start for start, _, _ in self._intervals]
+        self._starts, self._ends = _merge(self._intervals)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __contains__(self, key):
+        return key in self._sources
+
+    def add(self, key, start, end):
+        """Add or move a source interval"""
+        if key in self._sources:
+            if self._sources[key] == (start, end):
+                return
+            self.remove(key)
+        if end <= start:
+            return
+
+        self._sources[key] = (start, end)
+        position = bisect_left(self._intervals, (start, end, key))
+        self._intervals.insert(position, (start, end, key))
+        self._interval_starts.insert(position, start)
+
+        # Merged blocks that overlap or touch [start, end) collapse into one
+        first = bisect_left(self._ends, start)
+        last = bisect_right(self._starts, end)
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def remove(self, key):
+        """Remove a source interval; unknown keys are ignored"""
+        window = self._sources.pop(key, None)
+        if window is None:
+            return
+        start, end = window
+        position = bisect_left(self._intervals, (start, end, key))
+        del self._intervals[position]
+        del self._interval_starts[position]
+
+        # Re-merge the sources of the one block the interval belonged to. A block
+        # starts at its earliest source, so they're the sources starting inside it.
+        block = bisect_right(self._starts, start) - 1
+        block_start, block_end = self._starts[block], self._ends[block]
+        low = bisect_left(self._interval_starts, block_start)
+        high = bisect_right(self._interval_starts, block_end)
+        starts, ends = _merge(self._intervals[low:high])
+        self._starts[block:block + 1] = starts
+        self._ends[block:block + 1] = ends
+
+    def overlapping(self, start, end):
+        """Merged busy blocks overlapping [start, end), clipped to it"""
+        blocks = []
+        index = bisect_right(self._ends, start)
+        while index < len(self._starts) and self._starts[index] < end:
+            blocks.append((max(self._starts[index], start), min(self._ends[index], end)))
+            index += 1
+        return blocks
+
+    def gaps(self, start, end):
+        """The parts of [start, end) no busy block covers"""
+        gaps = []
+        cursor = start
+        for block_start, block_end in self.overlapping(start, end):
+            if block_start > cursor:
+                gaps.append((cursor, block_start))
+            cursor = block_end
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+
+class AvailabilityCalendar:
+    """A professional's busy blocks and default state"""
+
+    def __init__(self, professional_id, default_state, intervals=()):
+        self.professional_id = professional_id
+        self.default_state = default_state or 'AVAILABLE'
+        self.busy = IntervalIndex(intervals)
+        self.booking_occurrences = {}
+        self.loaded_at = time.monotonic()
+
+    @property
+    def available_by_default(self):
+        return self.default_state != 'UNAVAILABLE'
+
+    def free_slots(self, start, end, min_duration=None):
+        """
+        Free (start, end) slots within [start, end).
+
+        Args:
+            min_duration: Optional timedelta; shorter slots are left out
+        """
+        if not self.available_by_default or end <= start:
+            return []
+        slots = self.busy.gaps(start, end)
+        if min_duration:
+            slots = [(slot_start, slot_end) for slot_start, slot_end in slots if slot_end - slot_start >= min_duration]
+        return slots
+
+    def busy_slots(self, start, end):
+        """Merged busy (start, end) blocks within [start, end)"""
+        if not self.available_by_default:
+            return [(start, end)] if end > start else []
+        return self.busy.overlapping(start, end)
+
+    def is_free(self, start, end):
+        """Whether the whole of [start, end) is free"""
+        return self.available_by_default and not self.busy.overlapping(start, end)
+
+    def set_booking_occurrences(self, booking_id, windows):
+        """
+        Replace the busy intervals of a booking's occurrences.
+
+        Args:
+            windows: {occurrence_id: (start, end)}, empty when the booking no longer holds time
+        """
+        previous = self.booking_occurrences.pop(booking_id, set())
+        for occurrence_id in previous - set(windows):
+            self.busy.remove(('occurrence', occurrence_id))
+        for occurrence_id, (start, end) in windows.items():
+            self.busy.add(('occurrence', occurrence_id), start, end)
+        if windows:
+            self.booking_occurrences[booking_id] = set(windows)
+
+
+def _confirmed_occurrences(**filters):
+    """(booking_id, occurrence_id, start, end) of occurrences that hold a professional's time"""
+    from booking_occurrences.models import BookingOccurrence
+
+    rows = (
+        BookingOccurrence.objects.filter(booking__status__in=CONFIRMED_STATES, **filters)
+        .exclude(status='CANCELLED')
+        .values_list('booking_id', 'occurrence_id', 'start_date', 'start_time', 'end_date', 'end_time')
+    )
+    return [
+        (booking_id, occurrence_id) + occurrence_window(start_date, start_time, end_date, end_time)
+        for booking_id, occurrence_id, start_date, start_time, end_date, end_time in rows
+    ]
+
+
+def load_calendar(professional_id):
+    """Build a professional's calendar from the database (three queries)"""
+    from default_availability.models import DefaultAvailability
+    from .models import Availability
+
+    default_state = DefaultAvailability.objects.filter(professional_id=professional_id).order_by(
+        '-created_at'
+    ).values_list('default_state', flat=True).first()
+
+    intervals = [
+        (('availability', availability_id),) + block_window(day, start_time, end_time)
+        for availability_id, day, start_time, end_time in Availability.objects.filter(
+            professional_id=professional_id, type__in=BUSY_AVAILABILITY_TYPES
+        ).values_list('availability_id', 'date', 'start_time', 'end_time')
+    ]
+
+    occurrences = _confirmed_occurrences(booking__professional_id=professional_id)
+    intervals += [(('occurrence', occurrence_id), start, end) for _, occurrence_id, start, end in occurrences]
+
+    calendar = AvailabilityCalendar(professional_id, default_state, intervals)
+    for booking_id, occurrence_id, _, _ in occurrences:
+        calendar.booking_occurrences.setdefault(booking_id, set()).add(occurrence_id)
+
+    logger.info(
+        f"Loaded availability calendar for professional {professional_id}: "
+        f"{len(intervals)} busy intervals in {len(calendar.busy)} blocks, default {calendar.default_state}"
+    )
+    return calendar
+
+
+def _cached(professional_id):
+    """The cached calendar if it's still fresh, else None; call with _lock held"""
+    calendar = _calendars.get(professional_id)
+    if calendar is None:
+        return None
+    if time.monotonic() - calendar.loaded_at >= AVAILABILITY_CALENDAR_MAX_AGE_SECONDS:
+        del _calendars[professional_id]
+        return None
+    _calendars.move_to_end(professional_id)
+    return calendar
+
+
+def get_calendar(professional_id):
+    """A professional's calendar, loading it on first use"""
+    with _lock:
+        calendar = _cached(professional_id)
+    if calendar is not None:
+        return calendar
+
+    calendar = load_calendar(professional_id)
+    with _lock:
+        _calendars[professional_id] = calendar
+        _calendars.move_to_end(professional_id)
+        while len(_calendars) > AVAILABILITY_CALENDAR_CACHE_SIZE:
+            _calendars.popitem(last=False)
+    return calendar
+
+
+def free_slots(professional_id, start, end, min_duration=None):
+    """Free (start, end) slots of a professional within [start, end)"""
+    calendar = get_calendar(professional_id)
+    with _lock:
+        return calendar.free_slots(start, end, min_duration)
+
+
+def free_busy(professional_id, start, end, min_duration=None):
+    """
+    A professional's free and busy time within [start, end).
+
+    Returns:
+        dict: default_state, and free_slots / busy_slots as lists of (start, end)
+    """
+    calendar = get_calendar(professional_id)
+    with _lock:
+        return {
+            'default_state': calendar.default_state,
+            'free_slots': calendar.free_slots(start, end, min_duration),
+            'busy_slots': calendar.busy_slots(start, end),
+        }
+
+
+def is_professional_free(professional_id, start, end):
+    """Whether the professional has nothing booked or blocked in [start, end)"""
+    calendar = get_calendar(professional_id)
+    with _lock:
+        return calendar.is_free(start, end)
+
+
+def invalidate_calendar(professional_id=None):
+    """Drop one professional's cached calendar, or all of them"""
+    with _lock:
+        if professional_id is None:
+            _calendars.clear()
+        else:
+            _calendars.pop(professional_id, None)
+
+
+def apply_availability_block(professional_id, availability_id, day=None, start_time=None, end_time=None, block_type=None):
+    """
+    Update a cached calendar for a saved or deleted Availability row.
+
+    Leave day/start_time/end_time out for a deleted row.
+    """
+    with _lock:
+        calendar = _cached(professional_id)
+        if calendar is None:
+            return
+        key = ('availability', availability_id)
+        if day is None or block_type not in BUSY_AVAILABILITY_TYPES:
+            calendar.busy.remove(key)
+        else:
+            calendar.busy.add(key, *block_window(day, start_time, end_time))
+
+
+def _flush(booking_ids):
+    from bookings.models import Booking
+
+    with _lock:
+        if not _calendars:
+            return
+        cached_ids = set(_calendars)
+
+    professional_ids = dict(
+        Booking.objects.filter(booking_id__in=booking_ids, professional_id__in=cached_ids).values_list(
+            'booking_id', 'professional_id'
+        )
+    )
+    windows = {booking_id: {} for booking_id in professional_ids}
+    if professional_ids:
+        for booking_id, occurrence_id, start, end in _confirmed_occurrences(booking_id__in=list(professional_ids)):
+            windows[booking_id][occurrence_id] = (start, end)
+
+    with _lock:
+        for booking_id in booking_ids:
+            professional_id = professional_ids.get(booking_id)
+            if professional_id is None:
+                # Deleted, or its professional's calendar isn't cached; drop it wherever it's held
+                for calendar in _calendars.values():
+                    if booking_id in calendar.booking_occurrences:
+                        calendar.set_booking_occurrences(booking_id, {})
+                continue
+            calendar = _cached(professional_id)
+            if calendar is not None:
+                calendar.set_booking_occurrences(booking_id, windows[booking_id])
+
+
+_pending = CommitBatches(_flush, 'booking_ids')
+
+
+def mark_booking_availability_dirty(booking_id):
+    """Resync this booking's occurrences into cached calendars when the current transaction commits"""
+    _pending.add(booking_ids=booking_id)
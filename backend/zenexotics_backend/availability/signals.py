@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Availability
+from .free_busy import apply_availability_block, invalidate_calendar, mark_booking_availability_dirty
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Availability)
+def update_calendar_for_block(sender, instance, **kwargs):
+    transaction.on_commit(lambda: apply_availability_block(
+        instance.professional_id, instance.availability_id,
+        instance.date, instance.start_time, instance.end_time, instance.type
+    ))
+
+
+@receiver(post_delete, sender=Availability)
+def remove_block_from_calendar(sender, instance, **kwargs):
+    availability_id = instance.availability_id
+    transaction.on_commit(lambda: apply_availability_block(instance.professional_id, availability_id))
+
+
+@receiver([post_save, post_delete], sender='bookings.Booking')
+def update_calendar_for_booking(sender, instance, **kwargs):
+    """Whether a booking's occurrences hold time depends on its status"""
+    mark_booking_availability_dirty(instance.booking_id)
+
+
+@receiver([post_save, post_delete], sender='booking_occurrences.BookingOccurrence')
+def update_calendar_for_occurrence(sender, instance, **kwargs):
+    mark_booking_availability_dirty(instance.booking_id)
+
+
+@receiver([post_save, post_delete], sender='default_availability.DefaultAvailability')
+def reload_calendar_for_default(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_calendar(instance.professional_id))
@@ -1,3 +1,113 @@
-from django.test import TestCase
+from datetime import datetime
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from availability.free_busy import IntervalIndex
+from availability.v1.views import FreeSlotsView
+
+
+def at(hour, minute=0):
+    return datetime(2030, 5, 3, hour, minute)
+
+
+class IntervalIndexTests(SimpleTestCase):
+    def test_overlapping_and_touching_intervals_merge(self):
+        index = IntervalIndex([
+            ('a', at(9), at(10)),
+            ('b', at(9, 30), at(11)),
+            ('c', at(11), at(12)),
+            ('d', at(14), at(15)),
+        ])
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.overlapping(at(0), at(23)), [(at(9), at(12)), (at(14), at(15))])
+
+    def test_empty_intervals_are_ignored(self):
+        index = IntervalIndex([('a', at(9), at(9))])
+        index.add('b', at(11), at(10))
+
+        self.assertEqual(len(index), 0)
+        self.assertNotIn('a', index)
+        self.assertNotIn('b', index)
+
+    def test_add_bridges_blocks(self):
+        index = IntervalIndex([('a', at(9), at(10)), ('b', at(11), at(12))])
+        index.add('c', at(10), at(11))
+
+        self.assertEqual(index.overlapping(at(0), at(23)), [(at(9), at(12))])
+
+    def test_add_moves_an_existing_source(self):
+        index = IntervalIndex([('a', at(9), at(10))])
+        index.add('a', at(13), at(14))
+
+        self.assertEqual(index.overlapping(at(0), at(23)), [(at(13), at(14))])
+
+    def test_remove_splits_the_block_it_held_together(self):
+        index = IntervalIndex([('a', at(9), at(10)), ('b', at(10), at(11)), ('c', at(11), at(12))])
+        index.remove('b')
+
+        self.assertEqual(index.overlapping(at(0), at(23)), [(at(9), at(10)), (at(11), at(12))])
+        self.assertNotIn('b', index)
+
+    def test_remove_keeps_blocks_covered_by_other_sources(self):
+        index = IntervalIndex([('a', at(9), at(12)), ('b', at(10), at(11)), ('c', at(14), at(15))])
+        index.remove('b')
+
+        self.assertEqual(index.overlapping(at(0), at(23)), [(at(9), at(12)), (at(14), at(15))])
+
+    def test_remove_unknown_key_is_ignored(self):
+        index = IntervalIndex([('a', at(9), at(10))])
+        index.remove('missing')
+
+        self.assertEqual(index.overlapping(at(0), at(23)), [(at(9), at(10))])
+
+    def test_gaps(self):
+        index = IntervalIndex([('a', at(9), at(10)), ('b', at(12), at(13))])
+
+        self.assertEqual(index.gaps(at(8), at(14)), [(at(8), at(9)), (at(10), at(12)), (at(13), at(14))])
+        # Blocks are clipped to the range asked for
+        self.assertEqual(index.gaps(at(9, 30), at(12, 30)), [(at(10), at(12))])
+        self.assertEqual(index.gaps(at(9), at(10)), [])
+        self.assertEqual(IntervalIndex().gaps(at(8), at(9)), [(at(8), at(9))])
+
+    def test_gaps_after_add_and_remove_match_a_rebuilt_index(self):
+        sources = {
+            'a': (at(8), at(9)),
+            'b': (at(8, 30), at(10)),
+            'c': (at(11), at(12)),
+            'd': (at(12), at(13)),
+            'e': (at(15), at(16)),
+        }
+        index = IntervalIndex()
+        for key, (start, end) in sources.items():
+            index.add(key, start, end)
+        for key in ('b', 'd'):
+            index.remove(key)
+            del sources[key]
+        index.add('f', at(9, 30), at(11, 30))
+        sources['f'] = (at(9, 30), at(11, 30))
+
+        rebuilt = IntervalIndex((key, start, end) for key, (start, end) in sources.items())
+        self.assertEqual(index.gaps(at(0), at(23)), rebuilt.gaps(at(0), at(23)))
+        self.assertEqual(index.gaps(at(0), at(23)), [(at(0), at(8)), (at(9), at(9, 30)), (at(12), at(15)), (at(16), at(23))])
+
+
+class FreeSlotsViewValidationTests(SimpleTestCase):
+    def get(self, **params):
+        request = APIRequestFactory().get('/free_slots/', params)
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True))
+        return FreeSlotsView.as_view()(request)
+
+    def test_invalid_params_are_bad_requests(self):
+        for params in (
+            {},
+            {'start': '2030-05-03', 'end': 'soon'},
+            {'start': '2030-05-03', 'end': '2030-05-04', 'min_minutes': 'ten'},
+            {'start': '2030-05-03', 'end': '2030-05-04', 'professional_id': 'abc'},
+            {'start': '2030-05-04', 'end': '2030-05-02'},
+            {'start': '2030-01-01', 'end': '2031-06-01'},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 400)
@@ -1,3 +1,6 @@
 from django.urls import path
+from .views import FreeSlotsView
 
-urlpatterns = []
\ No newline at end of file
+urlpatterns = [
+    path('free-slots/', FreeSlotsView.as_view(), name='free-slots'),
+]
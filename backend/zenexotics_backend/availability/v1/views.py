@@ -1,6 +1,98 @@
-# Views for the availability app
-# Ready for view implementations
+import logging
+import traceback
+import pytz
+from datetime import datetime, timedelta
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from professionals.models import Professional
+from availability.free_busy import free_busy
 
-from django.shortcuts import render
+logger = logging.getLogger(__name__)
 
-# Add your views here
\ No newline at end of file
+# Longest range FreeSlotsView answers in one request
+AVAILABILITY_MAX_QUERY_DAYS = 366
+
+
+def _parse_bound(value, is_end):
+    """'YYYY-MM-DD' (end dates inclusive) or an ISO datetime in UTC -> naive datetime"""
+    if len(value) == 10:
+        day = datetime.strptime(value, '%Y-%m-%d')
+        return day + timedelta(days=1) if is_end else day
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(pytz.UTC).replace(tzinfo=None)
+    return parsed
+
+
+def _slots(slots):
+    return [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in slots]
+
+
+class FreeSlotsView(APIView):
+    """
+    A professional's free and busy time between two dates (or UTC datetimes).
+
+    Query params: start, end, optional professional_id (defaults to the
+    requesting professional) and min_minutes (shortest free slot to return).
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer]
+
+    def get(self, request):
+        try:
+            start_param = request.query_params.get('start')
+            end_param = request.query_params.get('end')
+            if not start_param or not end_param:
+                return Response({"error": "start and end are required"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                start = _parse_bound(start_param, is_end=False)
+                end = _parse_bound(end_param, is_end=True)
+                min_minutes = request.query_params.get('min_minutes')
+                min_duration = timedelta(minutes=int(min_minutes)) if min_minutes else None
+                professional_id = request.query_params.get('professional_id')
+                professional_id = int(professional_id) if professional_id else None
+            except ValueError:
+                return Response(
+                    {"error": "start and end must be YYYY-MM-DD or ISO datetimes, min_minutes and professional_id numbers"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if end <= start:
+                return Response({"error": "end must be after start"}, status=status.HTTP_400_BAD_REQUEST)
+            if end - start > timedelta(days=AVAILABILITY_MAX_QUERY_DAYS):
+                return Response(
+                    {"error": f"Range can't be longer than {AVAILABILITY_MAX_QUERY_DAYS} days"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if professional_id is not None:
+                if not Professional.objects.filter(professional_id=professional_id).exists():
+                    return Response({"error": "Professional not found"}, status=status.HTTP_404_NOT_FOUND)
+            else:
+                professional_id = Professional.objects.filter(user=request.user).values_list(
+                    'professional_id', flat=True
+                ).first()
+                if professional_id is None:
+                    return Response({"error": "professional_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+            calendar = free_busy(professional_id, start, end, min_duration)
+
+            return Response({
+                'professional_id': professional_id,
+                'default_state': calendar['default_state'],
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'is_free': not calendar['busy_slots'],
+                'free_slots': _slots(calendar['free_slots']),
+                'busy_slots': _slots(calendar['busy_slots']),
+            })
+
+        except Exception as e:
+            logger.error(f"MBA_AVAILABILITY - Error getting free slots: {str(e)}")
+            logger.error(f"MBA_AVAILABILITY - Full error traceback: {traceback.format_exc()}")
+            return Response(
+                {"error": "An error occurred while getting availability"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
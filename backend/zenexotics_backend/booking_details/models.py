@@ -1,8 +1,10 @@
 from django.db import models
 from decimal import Decimal
-from datetime import datetime
 import logging
 
+from core.pricing import get_unit_multiple, occurrence_window, price_units
+from holiday_calendar.holidays import is_holiday
+
 logger = logging.getLogger(__name__)
 
 class BookingDetails(models.Model):
@@ -28,103 +30,58 @@ class BookingDetails(models.Model):
     def calculate_prorated_multiplier(self, start_datetime, end_datetime):
         """Calculate the prorated multiplier based on unit of time"""
         duration_hours = (end_datetime - start_datetime).total_seconds() / 3600
-        
-        unit_mapping = {
-            '15 Min': 0.25,
-            '30 Min': 0.5,
-            '45 Min': 0.75,
-            '1 Hour': 1,
-            '2 Hour': 2,
-            '3 Hour': 3,
-            '4 Hour': 4,
-            '5 Hour': 5,
-            '6 Hour': 6,
-            '7 Hour': 7,
-            '8 Hour': 8,
-            '24 Hour': 24,
-            'Per Day': 24,
-            'Per Visit': None,  # Special case - no proration
-            'Per Night': 'Per Night',
-            'Week': 168  # 24 * 7
+        # Per Night bookings are charged per night, everything else by core.pricing.UNIT_HOURS
+        return get_unit_multiple(self.unit_of_time, duration_hours, nights=self.nights)
+
+    def rate_card(self):
+        """This occurrence's stored rates in core.pricing.build_rate_card form (additional rates live on BookingOccurrenceRate)"""
+        return {
+            'base_rate': self.base_rate,
+            'additional_animal_rate': self.additional_pet_rate or Decimal('0'),
+            'applies_after': self.applies_after,
+            'holiday_rate': self.holiday_rate or Decimal('0'),
+            'unit_of_time': self.unit_of_time,
         }
 
-        # Debug logging for unit_of_time matching
-        logger.info(f"MBA1234 Exact unit_of_time from request: {self.unit_of_time}")
-        logger.info(f"MBA1234 Available mappings: {list(unit_mapping.keys())}")
-        
-        # Use exact case matching
-        unit_hours = unit_mapping.get(self.unit_of_time)
-
-        if self.unit_of_time == 'Per Night':
-            return Decimal(str(self.nights))
-        
-        logger.info(f"Calculating prorated multiplier for occurrence {self.booking_occurrence.occurrence_id}:")
-        logger.info(f"  Duration: {duration_hours} hours")
-        logger.info(f"  Unit of time: {self.unit_of_time}")
-        logger.info(f"  Unit hours: {unit_hours}")
-
-        if unit_hours is None:  # PER_VISIT case
-            logger.info("  Using PER_VISIT rate (multiplier = 1)")
-            return Decimal('1')
-            
-        multiplier = Decimal(str(duration_hours / unit_hours)).quantize(Decimal('0.00001'))
-        logger.info(f"  Final multiplier: {multiplier}")
-        return multiplier
-
-    def calculate_occurrence_cost(self, is_prorated=True):
-        """Calculate total cost for an occurrence including prorated base rate and all additional rates"""
-        logger.info(f"\nCalculating occurrence cost for occurrence {self.booking_occurrence.occurrence_id}:")
-        logger.info(f"  Base rate: ${self.base_rate}")
-        logger.info(f"  Additional pet rate: ${self.additional_pet_rate}")
-        logger.info(f"  Holiday rate: ${self.holiday_rate}")
-        logger.info(f"  Number of pets: {self.num_pets}")
-        logger.info(f"  Applies after: {self.applies_after}")
-        logger.info(f"  Is prorated: {is_prorated}")
-
-        # Get start and end datetime
-        start_datetime = datetime.combine(self.booking_occurrence.start_date, self.booking_occurrence.start_time)
-        end_datetime = datetime.combine(self.booking_occurrence.end_date, self.booking_occurrence.end_time)
-        logger.info(f"  Start datetime: {start_datetime}")
-        logger.info(f"  End datetime: {end_datetime}")
+    def calculate_occurrence_cost(self, is_prorated=True, multiple=None):
+        """
+        Calculate the occurrence's cost (base, additional animals and holiday surcharge)
+        with core.pricing, the same rule drafts are priced with. multiple overrides the
+        prorated unit count (e.g. the multiple the draft was priced with).
+        """
+        if multiple is None:
+            if is_prorated:
+                start_datetime, end_datetime = occurrence_window(self.booking_occurrence)
+                multiple = self.calculate_prorated_multiplier(start_datetime, end_datetime)
+            else:
+                multiple = Decimal('1')
 
-        # Calculate base rate
         is_holiday = self.is_holiday(self.booking_occurrence.start_date)
-        base_rate = self.holiday_rate if is_holiday else self.base_rate
-        logger.info(f"  Is holiday: {is_holiday}")
-        logger.info(f"  Using base rate: ${base_rate}")
-
-        if is_prorated:
-            multiplier = self.calculate_prorated_multiplier(start_datetime, end_datetime)
-            base_total = base_rate * multiplier
-            logger.info(f"  Applied multiplier {multiplier} to base rate: ${base_total}")
-        else:
-            base_total = base_rate
-            logger.info(f"  Using flat base rate: ${base_total}")
-
-        # Add additional animal rate if applicable
-        if self.additional_pet_rate and self.num_pets > self.applies_after:
-            additional_pets = self.num_pets - self.applies_after
-            additional_pet_cost = self.additional_pet_rate * additional_pets
-            base_total += additional_pet_cost
-            logger.info(f"  Added cost for {additional_pets} additional pets at ${self.additional_pet_rate} each: ${additional_pet_cost}")
-
-        logger.info(f"  Final calculated cost: ${base_total}")
-        return base_total.quantize(Decimal('0.01'))
+        line_item = price_units(self.rate_card(), self.num_pets, multiple, is_holiday=is_holiday)
+        cost = line_item['total_cost']
+
+        logger.debug(f"Occurrence {self.booking_occurrence.occurrence_id} cost: ${cost} (holiday={is_holiday}, multiple={multiple})")
+        return cost.quantize(Decimal('0.01'))
+
+    def refresh_calculated_rate(self, multiple=None):
+        """
+        Set multiple and calculated_rate from the current rates (what save() stores, for bulk writes).
+        Pass multiple to keep a unit count priced elsewhere instead of recomputing it.
+        """
+        if multiple is None:
+            # Get start and end datetime for multiple calculation
+            start_datetime, end_datetime = occurrence_window(self.booking_occurrence)
+            multiple = self.calculate_prorated_multiplier(start_datetime, end_datetime)
+        self.multiple = multiple
+        
+        # Calculate the rate before saving
+        self.calculated_rate = self.calculate_occurrence_cost(multiple=multiple)
 
     def save(self, *args, **kwargs):
         """Override save to automatically calculate and set calculated_rate"""
-        # Get start and end datetime for multiple calculation
-        start_datetime = datetime.combine(self.booking_occurrence.start_date, self.booking_occurrence.start_time)
-        end_datetime = datetime.combine(self.booking_occurrence.end_date, self.booking_occurrence.end_time)
-        
-        # Calculate and store the multiple
-        self.multiple = self.calculate_prorated_multiplier(start_datetime, end_datetime)
-        
-        # Calculate the rate before saving
-        self.calculated_rate = self.calculate_occurrence_cost(is_prorated=True)
+        self.refresh_calculated_rate()
         super().save(*args, **kwargs)
 
     def is_holiday(self, date):
-        """Check if a date is a holiday"""
-        # TODO: Implement holiday checking logic
-        return False
+        """Check if a date is a holiday (compiled holiday calendar, no query per call)"""
+        return is_holiday(date)
@@ -0,0 +1,54 @@
+"""
+Keep BookingDetails.num_pets in step with a booking's BookingPets.
+
+Counting once and writing every occurrence's details with one bulk_update
+replaces a count and a full BookingDetails.save() per occurrence (each of
+which queued its own cost recalculation). The occurrence costs and the
+booking summary are then recomputed once, on commit, by
+booking_summary.recalculation.
+"""
+
+import logging
+
+from booking_pets.models import BookingPets
+from booking_summary.recalculation import mark_occurrence_dirty
+from .models import BookingDetails
+
+logger = logging.getLogger(__name__)
+
+
+def sync_booking_num_pets(booking_id):
+    """
+    Set num_pets on the details of every occurrence of a booking to its current pet count.
+
+    Returns:
+        int: Number of BookingDetails rows written
+    """
+    num_pets = BookingPets.objects.filter(booking_id=booking_id).count()
+
+    details_by_occurrence = {}
+    for booking_details in (
+        BookingDetails.objects.filter(booking_occurrence__booking_id=booking_id)
+        .select_related('booking_occurrence')
+        .order_by('-detail_id')
+    ):
+        # An occurrence's first details row is the one that counts, same as occurrence.booking_details.first()
+        details_by_occurrence[booking_details.booking_occurrence_id] = booking_details
+
+    changed = []
+    for booking_details in details_by_occurrence.values():
+        previous = (booking_details.num_pets, booking_details.multiple, booking_details.calculated_rate)
+        booking_details.num_pets = num_pets
+        # Keep the unit count the booking was priced with (e.g. the draft's multiple)
+        booking_details.refresh_calculated_rate(multiple=booking_details.multiple)
+        if (booking_details.num_pets, booking_details.multiple, booking_details.calculated_rate) != previous:
+            changed.append(booking_details)
+
+    # bulk_update doesn't send post_save, so queue the occurrence costs ourselves
+    if changed:
+        BookingDetails.objects.bulk_update(changed, ['num_pets', 'multiple', 'calculated_rate'])
+    for occurrence_id in details_by_occurrence:
+        mark_occurrence_dirty(occurrence_id, booking_id)
+
+    logger.info(f"Set num_pets={num_pets} on {len(changed)} of {len(details_by_occurrence)} occurrences for booking {booking_id}")
+    return len(changed)
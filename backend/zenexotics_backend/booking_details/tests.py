@@ -1,3 +1,89 @@
-from django.test import TestCase
+from datetime import date, time, datetime
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from booking_details.models import BookingDetails
+from booking_details.pet_counts import sync_booking_num_pets
+from booking_occurrences.models import BookingOccurrence
+from core.pricing import price_window
+
+
+RATE_CARD = {
+    'base_rate': Decimal('20.00'),
+    'additional_animal_rate': Decimal('5.00'),
+    'applies_after': 1,
+    'holiday_rate': Decimal('10.00'),
+    'unit_of_time': '1 Hour',
+}
+
+
+def details(num_pets=3):
+    occurrence = BookingOccurrence(
+        occurrence_id=1,
+        start_date=date(2026, 12, 25),
+        end_date=date(2026, 12, 25),
+        start_time=time(9, 0),
+        end_time=time(12, 0),
+    )
+    return BookingDetails(
+        booking_occurrence=occurrence,
+        num_pets=num_pets,
+        base_rate=RATE_CARD['base_rate'],
+        additional_pet_rate=RATE_CARD['additional_animal_rate'],
+        applies_after=RATE_CARD['applies_after'],
+        holiday_rate=RATE_CARD['holiday_rate'],
+        unit_of_time=RATE_CARD['unit_of_time'],
+    )
+
+
+class BookingDetailsCostTests(SimpleTestCase):
+    def cost(self, holiday, **kwargs):
+        with mock.patch.object(BookingDetails, 'is_holiday', return_value=holiday):
+            return details().calculate_occurrence_cost(**kwargs)
+
+    def test_regular_day(self):
+        # 3 hours at $20 plus 2 extra pets at $5 once each
+        self.assertEqual(self.cost(False), Decimal('70.00'))
+
+    def test_holiday_rate_is_added_once(self):
+        self.assertEqual(self.cost(True), Decimal('80.00'))
+
+    def test_matches_draft_pricing(self):
+        start, end = datetime(2026, 12, 25, 9), datetime(2026, 12, 25, 12)
+        for holiday in (False, True):
+            line_item = price_window(RATE_CARD, 3, start, end, is_holiday=holiday)
+            self.assertEqual(self.cost(holiday), line_item['total_cost'])
+
+    def test_stored_multiple_overrides_the_duration(self):
+        self.assertEqual(self.cost(False, multiple=Decimal('2.5')), Decimal('60.00'))
+
+    def test_refresh_calculated_rate_keeps_a_given_multiple(self):
+        booking_details = details()
+        with mock.patch.object(BookingDetails, 'is_holiday', return_value=False):
+            booking_details.refresh_calculated_rate(multiple=Decimal('2.5'))
+        self.assertEqual(booking_details.multiple, Decimal('2.5'))
+        self.assertEqual(booking_details.calculated_rate, Decimal('60.00'))
+
+
+class SyncBookingNumPetsTests(SimpleTestCase):
+    def test_keeps_the_stored_multiple(self):
+        booking_details = details(num_pets=1)
+        booking_details.multiple = Decimal('2.5')
+        booking_details.booking_occurrence_id = 1
+        queryset = mock.Mock()
+        queryset.select_related.return_value.order_by.return_value = [booking_details]
+
+        with mock.patch.object(BookingDetails, 'is_holiday', return_value=False), \
+                mock.patch('booking_details.pet_counts.BookingPets.objects.filter') as pets_filter, \
+                mock.patch('booking_details.pet_counts.BookingDetails.objects.filter', return_value=queryset), \
+                mock.patch('booking_details.pet_counts.BookingDetails.objects.bulk_update') as bulk_update, \
+                mock.patch('booking_details.pet_counts.mark_occurrence_dirty'):
+            pets_filter.return_value.count.return_value = 3
+            self.assertEqual(sync_booking_num_pets('b1'), 1)
+
+        bulk_update.assert_called_once()
+        # 2.5 units at $20 plus 2 extra pets at $5, not re-priced from the 3 hour window
+        self.assertEqual(booking_details.multiple, Decimal('2.5'))
+        self.assertEqual(booking_details.calculated_rate, Decimal('60.00'))
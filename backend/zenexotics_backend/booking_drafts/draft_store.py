@@ -0,0 +1,524 @@
+"""
+Versioned, incremental updates to BookingDraft.draft_data.
+
+The draft endpoints load the whole draft_data blob, change it in Python and
+write all of it back, however small the edit. Here the editor sends
+JSON-patch operations (RFC 6902 add/remove/replace/test) against the version
+it last saw:
+
+    * a stale version is rejected before draft_data is even loaded
+    * only editable inputs can be patched: pets, and occurrences with their
+      dates, times and rates; costs and totals are always computed here
+    * the patch is applied copy-on-write, so untouched occurrences keep their
+      identity and are neither repriced nor written
+    * only occurrences whose dates, times or rates changed (or every one, when
+      the pet count changed) are repriced, with the same pricing drafts use
+    * the cost summary is recomputed with fee percentages and tax state
+      resolved on the server, never the ones stored in the draft
+    * the write is a single conditional UPDATE that jsonb_set()s just the
+      changed keys / occurrences and bumps the version
+
+BookingDraft.save() bumps the version too, so a full rewrite by any other
+endpoint invalidates patches made against the old data.
+"""
+
+import copy
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import F, Func, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from clients.models import Client
+from core.platform_fee_utils import calculate_platform_fees
+from core.pricing import price_occurrences
+from core.tax_utils import calculate_booking_taxes, get_state_from_address
+from holiday_calendar.holidays import is_holiday
+from user_addresses.models import Address, AddressType
+from .models import BookingDraft
+
+logger = logging.getLogger(__name__)
+
+# Occurrence fields that feed its price; other fields can change without repricing
+PRICED_OCCURRENCE_FIELDS = ('start_date', 'end_date', 'start_time', 'end_time', 'nights')
+PRICED_RATE_FIELDS = ('base_rate', 'additional_animal_rate', 'applies_after', 'holiday_rate', 'unit_of_time', 'additional_rates')
+
+# What a patch may touch. Everything else in draft_data (cost_summary, service
+# details, statuses) is written by the server only.
+EDITABLE_OCCURRENCE_FIELDS = ('start_date', 'end_date', 'start_time', 'end_time', 'nights')
+EDITABLE_RATE_FIELDS = ('base_rate', 'additional_animal_rate', 'applies_after', 'holiday_rate', 'additional_rates')
+EDITABLE_ADDITIONAL_RATE_FIELDS = ('title', 'amount', 'description')
+
+# Computed when an occurrence is priced; rejected anywhere in a patch, as are '*_total' keys
+DERIVED_FIELDS = ('cost_summary', 'calculated_cost', 'base_total', 'multiple')
+
+# Past this share of changed occurrences, rewrite the occurrences array instead of setting each one
+PARTIAL_WRITE_MAX_SHARE = 0.5
+
+
+class DraftVersionConflict(Exception):
+    """The draft changed since the version the patch was made against"""
+
+    def __init__(self, draft_id, current_version):
+        super().__init__(f"Draft {draft_id} is at version {current_version}")
+        self.current_version = current_version
+
+
+class InvalidDraftPatch(ValueError):
+    """A patch operation is malformed, points nowhere or failed its test"""
+
+
+class JSONBSet(Func):
+    function = 'jsonb_set'
+    output_field = models.JSONField()
+
+    def __init__(self, expression, path, value):
+        super().__init__(
+            expression,
+            Value([str(token) for token in path], output_field=ArrayField(models.TextField())),
+            Cast(Value(value, output_field=models.JSONField(encoder=DjangoJSONEncoder)), models.JSONField()),
+        )
+
+
+def _parse_pointer(path):
+    """'/occurrences/3/rates' -> ['occurrences', '3', 'rates']"""
+    if path == '':
+        return []
+    if not isinstance(path, str) or not path.startswith('/'):
+        raise InvalidDraftPatch(f"Invalid path {path!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in path[1:].split('/')]
+
+
+def _child(container, token, path, allow_end=False):
+    """Key or list index for token inside container"""
+    if isinstance(container, dict):
+        return token
+    if isinstance(container, list):
+        if allow_end and token == '-':
+            return len(container)
+        if not token.isdigit():
+            raise InvalidDraftPatch(f"Invalid list index {token!r} in {path}")
+        index = int(token)
+        if index > len(container) or (index == len(container) and not allow_end):
+            raise InvalidDraftPatch(f"Index {index} out of range in {path}")
+        return index
+    raise InvalidDraftPatch(f"Can't descend into {path}")
+
+
+def _get(document, tokens, path):
+    value = document
+    for token in tokens:
+        key = _child(value, token, path)
+        if isinstance(value, dict) and key not in value:
+            raise InvalidDraftPatch(f"Path {path} doesn't exist")
+        value = value[key]
+    return value
+
+
+def _is_derived(key):
+    return key in DERIVED_FIELDS or str(key).endswith('_total')
+
+
+def _is_editable(tokens):
+    """Whether a patch may write the path tokens point to (see EDITABLE_* above)"""
+    if not tokens:
+        return False
+    if tokens[0] == 'pets':
+        return True
+    if tokens[0] != 'occurrences':
+        return False
+    # The list itself, or a whole occurrence
+    if len(tokens) <= 2:
+        return True
+    field, rest = tokens[2], tokens[3:]
+    if field in EDITABLE_OCCURRENCE_FIELDS:
+        return not rest
+    if field != 'rates':
+        return False
+    # The whole rates object, or one rate
+    if not rest:
+        return True
+    if rest[0] not in EDITABLE_RATE_FIELDS:
+        return False
+    if rest[0] != 'additional_rates':
+        return len(rest) == 1
+    # additional_rates, one of them, or one of its fields
+    return len(rest) <= 2 or (len(rest) == 3 and rest[2] in EDITABLE_ADDITIONAL_RATE_FIELDS)
+
+
+def _check_no_derived(value, path):
+    """Reject computed fields inside an operation's value (e.g. a whole occurrence with its calculated_cost)"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if _is_derived(key):
+                raise InvalidDraftPatch(f"{key} is computed by the server and can't be set at {path}")
+            _check_no_derived(item, path)
+    elif isinstance(value, list):
+        for item in value:
+            _check_no_derived(item, path)
+
+
+def _apply_operation(document, operation):
+    """Apply one operation copy-on-write: only containers along its path are copied"""
+    op = operation.get('op')
+    path = operation.get('path')
+    tokens = _parse_pointer(path)
+
+    if op == 'test':
+        if _get(document, tokens, path) != operation.get('value'):
+            raise InvalidDraftPatch(f"Test failed at {path}")
+        return document
+    if op not in ('add', 'remove', 'replace'):
+        raise InvalidDraftPatch(f"Unsupported operation {op!r}")
+    if op != 'remove' and 'value' not in operation:
+        raise InvalidDraftPatch(f"Operation {op} at {path} needs a value")
+    if not _is_editable(tokens):
+        raise InvalidDraftPatch(f"Path {path or '/'} can't be patched")
+    if op != 'remove':
+        _check_no_derived(operation['value'], path)
+
+    root = copy.copy(document)
+    parent = root
+    for token in tokens[:-1]:
+        key = _child(parent, token, path)
+        if isinstance(parent, dict) and key not in parent:
+            raise InvalidDraftPatch(f"Path {path} doesn't exist")
+        parent[key] = copy.copy(parent[key])
+        parent = parent[key]
+
+    key = _child(parent, tokens[-1], path, allow_end=(op == 'add'))
+    if op == 'add' and isinstance(parent, list):
+        parent.insert(key, copy.deepcopy(operation['value']))
+    elif op == 'remove' or op == 'replace':
+        if isinstance(parent, dict) and key not in parent:
+            raise InvalidDraftPatch(f"Path {path} doesn't exist")
+        if op == 'remove':
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(operation['value'])
+    else:
+        parent[key] = copy.deepcopy(operation['value'])
+    return root
+
+
+def apply_draft_patch(draft_data, operations):
+    """
+    Apply JSON-patch operations to draft_data without modifying it.
+
+    Returns:
+        dict: The patched draft data; unchanged containers are shared with the input
+    """
+    if not isinstance(operations, list):
+        raise InvalidDraftPatch("Operations must be a list")
+    document = draft_data
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise InvalidDraftPatch("Each operation must be an object")
+        document = _apply_operation(document, operation)
+    return document
+
+
+def _pricing_inputs(occurrence):
+    rates = occurrence.get('rates') or {}
+    return (
+        tuple(occurrence.get(field) for field in PRICED_OCCURRENCE_FIELDS),
+        tuple(repr(rates.get(field)) for field in PRICED_RATE_FIELDS),
+    )
+
+
+def _parse_time(value):
+    for time_format in ('%H:%M', '%I:%M %p'):
+        try:
+            return datetime.strptime(value, time_format).time()
+        except (TypeError, ValueError):
+            continue
+    raise InvalidDraftPatch(f"Invalid time {value!r}")
+
+
+def _parse_amount(amount):
+    try:
+        return Decimal(str(amount).replace('$', '').strip() or '0')
+    except Exception:
+        raise InvalidDraftPatch(f"Invalid amount {amount!r}")
+
+
+def _parse_count(value, default):
+    try:
+        return int(value or default)
+    except (TypeError, ValueError):
+        raise InvalidDraftPatch(f"Invalid count {value!r}")
+
+
+def draft_rate_card(rates):
+    """
+    A draft occurrence's own rates (as edited in the draft) in build_rate_card form.
+
+    Raises:
+        InvalidDraftPatch: An amount or applies_after isn't a number
+    """
+    if not isinstance(rates, dict):
+        raise InvalidDraftPatch("Occurrence rates must be an object")
+    additional_rates = rates.get('additional_rates') or []
+    if not isinstance(additional_rates, list) or not all(isinstance(rate, dict) for rate in additional_rates):
+        raise InvalidDraftPatch("additional_rates must be a list of objects")
+    return {
+        'base_rate': _parse_amount(rates.get('base_rate', 0)),
+        'additional_animal_rate': _parse_amount(rates.get('additional_animal_rate', 0)),
+        'applies_after': _parse_count(rates.get('applies_after'), 1),
+        'holiday_rate': _parse_amount(rates.get('holiday_rate', 0)),
+        'unit_of_time': rates.get('unit_of_time'),
+        'additional_rates': [
+            {'amount': _parse_amount(rate.get('amount', 0))}
+            for rate in additional_rates
+        ],
+    }
+
+
+def reprice_draft_occurrence(occurrence, num_pets):
+    """
+    Recompute an occurrence's cost fields from its own rates, like
+    core.booking_operations.calculate_occurrence_rates does for service rates.
+
+    Returns:
+        dict: A copy of the occurrence with calculated_cost, base_total, multiple
+              and the derived rate fields updated
+    """
+    if not isinstance(occurrence, dict):
+        raise InvalidDraftPatch("Each occurrence must be an object")
+    try:
+        window = {
+            'start_date': datetime.strptime(occurrence['start_date'], '%Y-%m-%d').date(),
+            'end_date': datetime.strptime(occurrence['end_date'], '%Y-%m-%d').date(),
+            'start_time': _parse_time(occurrence['start_time']),
+            'end_time': _parse_time(occurrence['end_time']),
+        }
+    except KeyError as e:
+        raise InvalidDraftPatch(f"Occurrence is missing {e}")
+    except (TypeError, ValueError):
+        raise InvalidDraftPatch(f"Invalid date in occurrence {occurrence.get('occurrence_id')}")
+    if occurrence.get('nights') is not None:
+        window['nights'] = _parse_count(occurrence['nights'], 0)
+
+    rate_card = draft_rate_card(occurrence.get('rates') or {})
+    line_item = price_occurrences([window], rate_card, num_pets, holiday_checker=is_holiday)[0]
+    rates = OrderedDict(occurrence.get('rates') or {})
+
+    rates['additional_animal_rate_total'] = str(line_item['additional_animal_rate_total'])
+    rates['additional_animal_rate_applies'] = line_item['additional_animal_rate_applies']
+    rates['holiday_days'] = line_item['holiday_days']
+
+    repriced = OrderedDict(occurrence)
+    repriced['calculated_cost'] = str(line_item['total_cost'])
+    repriced['base_total'] = str(line_item['base_total'])
+    repriced['multiple'] = float(line_item['multiple'])
+    repriced['rates'] = rates
+    return repriced
+
+
+def draft_client_user(draft):
+    """
+    The client's user for fee purposes: the booking's client, or for a draft
+    without a booking yet, draft_data['client_id'] like the other draft endpoints.
+    """
+    if draft.booking and draft.booking.client:
+        return draft.booking.client.user
+    client_id = (draft.draft_data or {}).get('client_id')
+    if not client_id:
+        return None
+    try:
+        return Client.objects.select_related('user').get(id=client_id).user
+    except (Client.DoesNotExist, TypeError, ValueError) as e:
+        logger.error(f"MBA_DRAFT_PATCH - Error retrieving client {client_id} for draft {draft.draft_id}: {str(e)}")
+        return None
+
+
+def build_cost_summary(draft, subtotal, professional, previous=None):
+    """
+    Draft cost summary for subtotal, in the shape the draft endpoints write.
+
+    Fee percentages and the tax state are always resolved here, never taken
+    from previous; only keys this doesn't compute are carried over from it.
+    """
+    address = Address.objects.filter(user=professional.user, address_type=AddressType.SERVICE).first()
+    state = get_state_from_address(address, default_state='CO')
+    platform_fees = calculate_platform_fees(subtotal, draft_client_user(draft), professional.user)
+
+    client_platform_fee = platform_fees['client_platform_fee']
+    pro_platform_fee = platform_fees['pro_platform_fee']
+    taxes = calculate_booking_taxes(state, subtotal, client_platform_fee, pro_platform_fee)
+
+    cost_summary = OrderedDict(previous)
+    cost_summary.update([
+        ('subtotal', float(subtotal)),
+        ('client_platform_fee', float(client_platform_fee)),
+        ('pro_platform_fee', float(pro_platform_fee)),
+        ('total_platform_fee', float(platform_fees['total_platform_fee'])),
+        ('taxes', float(taxes)),
+        ('total_client_cost', float(subtotal + client_platform_fee + taxes)),
+        ('total_sitter_payout', float((subtotal - pro_platform_fee).quantize(Decimal('0.01')))),
+        ('is_prorated', True),
+        ('tax_state', state),
+        ('client_platform_fee_percentage', float(platform_fees['client_platform_fee_percentage'] * 100)),
+        ('pro_platform_fee_percentage', float(platform_fees['pro_platform_fee_percentage'] * 100)),
+    ])
+    # subtotal is a full sum here, so the running-subtotal count starts over
+    cost_summary.pop('subtotal_delta_updates', None)
+    return cost_summary
+
+
+def _reprice_changed_occurrences(old_data, new_data):
+    """
+    Reprice the occurrences the patch added or whose pricing inputs it changed.
+
+    Returns:
+        list: Indexes (into new_data['occurrences']) of repriced occurrences
+    """
+    old_occurrences = old_data.get('occurrences') or []
+    new_occurrences = new_data.get('occurrences') or []
+    num_pets = len(new_data.get('pets') or [])
+    pets_changed = num_pets != len(old_data.get('pets') or [])
+
+    untouched = {id(occurrence) for occurrence in old_occurrences}
+    old_by_id = {occurrence.get('occurrence_id'): occurrence for occurrence in old_occurrences}
+
+    repriced = []
+    for index, occurrence in enumerate(new_occurrences):
+        if id(occurrence) in untouched and not pets_changed:
+            continue
+        if not isinstance(occurrence, dict):
+            raise InvalidDraftPatch("Each occurrence must be an object")
+        old = old_by_id.get(occurrence.get('occurrence_id'))
+        if old is not None and not pets_changed and _pricing_inputs(old) == _pricing_inputs(occurrence):
+            # Rewritten without a price change: keep the stored occurrence and its costs
+            new_occurrences[index] = old
+            continue
+        new_occurrences[index] = reprice_draft_occurrence(occurrence, num_pets)
+        repriced.append(index)
+    return repriced
+
+
+def _draft_data_update(old_data, new_data):
+    """
+    Expression writing only what differs between old_data and new_data.
+
+    Returns:
+        (expression, changed): changed maps top-level keys to their new value,
+        or 'occurrences' to {index: occurrence} when only some occurrences changed
+    """
+    if set(old_data) - set(new_data):
+        # Removed keys: write the whole document
+        return Value(new_data, output_field=models.JSONField(encoder=DjangoJSONEncoder)), dict(new_data)
+
+    expression = F('draft_data')
+    changed = {}
+    for key, value in new_data.items():
+        if key in old_data and old_data[key] is value:
+            continue
+        old_value = old_data.get(key)
+        if key == 'occurrences' and isinstance(value, list) and isinstance(old_value, list) and len(value) == len(old_value):
+            indexes = [index for index, occurrence in enumerate(value) if occurrence is not old_value[index]]
+            if not indexes:
+                continue
+            if len(indexes) <= len(value) * PARTIAL_WRITE_MAX_SHARE:
+                for index in indexes:
+                    expression = JSONBSet(expression, [key, index], value[index])
+                changed[key] = {index: value[index] for index in indexes}
+                continue
+        expression = JSONBSet(expression, [key], value)
+        changed[key] = value
+    return expression, changed
+
+
+def patch_draft(draft_id, version, operations, professional, modified_by='PROFESSIONAL'):
+    """
+    Apply a JSON patch to a draft made against version.
+
+    Args:
+        draft_id: BookingDraft to patch
+        version: Draft version the operations were made against
+        operations: JSON-patch operations on draft_data
+        professional: Professional making the edit (fee and tax context)
+        modified_by: BookingDraft.last_modified_by value
+
+    Returns:
+        (new_version, changed): changed holds the new value of each top-level key
+        written; occurrences map index -> occurrence when only some were written
+
+    Raises:
+        BookingDraft.DoesNotExist, DraftVersionConflict, InvalidDraftPatch
+    """
+    draft = BookingDraft.objects.select_related('booking__client__user').filter(draft_id=draft_id, version=version).first()
+    if draft is None:
+        # Stale or missing, tell the editor which without reading draft_data
+        current_version = BookingDraft.objects.filter(draft_id=draft_id).values_list('version', flat=True).first()
+        if current_version is None:
+            raise BookingDraft.DoesNotExist(f"Draft {draft_id} not found")
+        raise DraftVersionConflict(draft_id, current_version)
+
+    old_data = draft.draft_data or {}
+    new_data = apply_draft_patch(old_data, operations)
+    if not isinstance(new_data, dict):
+        raise InvalidDraftPatch("Draft data must stay an object")
+
+    if new_data is not old_data and (new_data.get('occurrences') is not old_data.get('occurrences') or new_data.get('pets') is not old_data.get('pets')):
+        if not isinstance(new_data.get('occurrences', []), list):
+            raise InvalidDraftPatch("occurrences must be a list")
+        if not isinstance(new_data.get('pets', []), list):
+            raise InvalidDraftPatch("pets must be a list")
+        new_data = dict(new_data)
+        new_data['occurrences'] = list(new_data.get('occurrences') or [])
+        repriced = _reprice_changed_occurrences(old_data, new_data)
+
+        if repriced or len(new_data['occurrences']) != len(old_data.get('occurrences') or []):
+            subtotal = sum(
+                (_parse_amount(occurrence.get('calculated_cost', 0)) for occurrence in new_data['occurrences']),
+                Decimal('0')
+            )
+            new_data['cost_summary'] = build_cost_summary(draft, subtotal, professional, old_data.get('cost_summary'))
+        logger.info(f"MBA_DRAFT_PATCH - Repriced {len(repriced)} of {len(new_data['occurrences'])} occurrences for draft {draft_id}")
+
+    expression, changed = _draft_data_update(old_data, new_data)
+    if not changed:
+        return version, changed
+
+    updated = BookingDraft.objects.filter(draft_id=draft_id, version=version).update(
+        draft_data=expression,
+        version=F('version') + 1,
+        last_modified_by=modified_by,
+        updated_at=timezone.now()
+    )
+    if not updated:
+        current_version = BookingDraft.objects.filter(draft_id=draft_id).values_list('version', flat=True).first()
+        raise DraftVersionConflict(draft_id, current_version)
+
+    logger.info(f"MBA_DRAFT_PATCH - Draft {draft_id} patched to version {version + 1}, wrote {sorted(changed)}")
+    return version + 1, changed
+
+
+def save_draft_data(draft, new_data, modified_by=None):
+    """
+    Replace draft.draft_data with new_data, writing only the keys and
+    occurrences that aren't the same objects as before. Bumps the version like save().
+
+    Returns:
+        dict: What was written, as patch_draft reports it
+    """
+    expression, changed = _draft_data_update(draft.draft_data or {}, new_data)
+    if not changed:
+        return changed
+
+    fields = {'draft_data': expression, 'version': F('version') + 1, 'updated_at': timezone.now()}
+    if modified_by:
+        fields['last_modified_by'] = modified_by
+        draft.last_modified_by = modified_by
+    BookingDraft.objects.filter(draft_id=draft.draft_id).update(**fields)
+
+    draft.draft_data = new_data
+    draft.version += 1
+    return changed
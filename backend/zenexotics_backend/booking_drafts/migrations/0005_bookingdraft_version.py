@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_drafts', '0004_alter_bookingdraft_booking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookingdraft',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
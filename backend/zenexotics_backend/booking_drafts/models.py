@@ -17,10 +17,20 @@ class BookingDraft(models.Model):
     draft_data = models.JSONField()  # Using Django's built-in JSONField
     original_status = models.CharField(max_length=100, null=True)  # Store original booking status
     last_modified_by = models.CharField(max_length=50, choices=MODIFIER_CHOICES)
+    version = models.PositiveIntegerField(default=1)  # Bumped on every write, see booking_drafts.draft_store
     status = models.CharField(max_length=50, choices=STATUS_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        # Any full rewrite invalidates patches made against the previous version
+        if self.pk is not None and not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'version' not in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['version']
+        super().save(*args, **kwargs)
+
     def __str__(self):
         if self.booking is None:
             return f"Draft (Unsaved) - {self.status}"
@@ -42,4 +42,8 @@ class OccurrenceSerializer(serializers.Serializer):
     rates = RatesSerializer(required=True)
 
 class UpdateRatesSerializer(serializers.Serializer):
-    occurrences = OccurrenceSerializer(many=True, required=True) 
\ No newline at end of file
+    occurrences = OccurrenceSerializer(many=True, required=True) 
+
+class DraftPatchSerializer(serializers.Serializer):
+    version = serializers.IntegerField(min_value=1)
+    operations = serializers.ListField(child=serializers.DictField(), allow_empty=False)
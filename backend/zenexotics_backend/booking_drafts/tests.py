@@ -1,3 +1,273 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from booking_drafts.draft_store import InvalidDraftPatch, apply_draft_patch, build_cost_summary, reprice_draft_occurrence
+from booking_drafts.models import BookingDraft
+from core.constants import RecurrenceFrequency
+from core.recurrence import iter_recurring_dates
+
+
+def occurrence(occurrence_id, start_date='2026-03-03'):
+    return {
+        'occurrence_id': occurrence_id,
+        'start_date': start_date,
+        'end_date': start_date,
+        'start_time': '09:00',
+        'end_time': '12:00',
+        'calculated_cost': '70.00',
+        'base_total': '60.00',
+        'multiple': 3.0,
+        'rates': {
+            'base_rate': '20.00',
+            'additional_animal_rate': '5.00',
+            'applies_after': 1,
+            'holiday_rate': '10.00',
+            'unit_of_time': '1 Hour',
+            'additional_animal_rate_total': '10.00',
+            'additional_rates': [{'title': 'Meds', 'amount': '2.00', 'description': ''}],
+        },
+    }
+
+
+def draft_data():
+    return {
+        'pets': [{'pet_id': 1}, {'pet_id': 2}, {'pet_id': 3}],
+        'occurrences': [occurrence('o1'), occurrence('o2', '2026-03-04')],
+        'cost_summary': {'subtotal': 140.0, 'tax_state': 'CO'},
+        'notes_from_pro': 'hi',
+    }
+
+
+class ApplyDraftPatchTests(SimpleTestCase):
+    def test_replace_is_copy_on_write(self):
+        data = draft_data()
+        patched = apply_draft_patch(data, [{'op': 'replace', 'path': '/occurrences/1/rates/base_rate', 'value': '25.00'}])
+
+        self.assertEqual(patched['occurrences'][1]['rates']['base_rate'], '25.00')
+        self.assertEqual(data['occurrences'][1]['rates']['base_rate'], '20.00')
+        # Only containers along the path are copied
+        self.assertIs(patched['occurrences'][0], data['occurrences'][0])
+        self.assertIs(patched['pets'], data['pets'])
+        self.assertIs(patched['occurrences'][1]['rates']['additional_rates'], data['occurrences'][1]['rates']['additional_rates'])
+
+    def test_no_operations_returns_the_same_data(self):
+        data = draft_data()
+        self.assertIs(apply_draft_patch(data, []), data)
+
+    def test_add_and_remove_occurrences(self):
+        added = {key: value for key, value in occurrence('o3', '2026-03-05').items() if key not in ('calculated_cost', 'base_total', 'multiple')}
+        added['rates'] = {key: value for key, value in added['rates'].items() if not key.endswith('_total')}
+        patched = apply_draft_patch(draft_data(), [
+            {'op': 'remove', 'path': '/occurrences/0'},
+            {'op': 'add', 'path': '/occurrences/-', 'value': added},
+        ])
+
+        self.assertEqual([item['occurrence_id'] for item in patched['occurrences']], ['o2', 'o3'])
+
+    def test_edit_pets_and_additional_rates(self):
+        patched = apply_draft_patch(draft_data(), [
+            {'op': 'remove', 'path': '/pets/2'},
+            {'op': 'replace', 'path': '/occurrences/0/rates/additional_rates/0/amount', 'value': '4.00'},
+            {'op': 'add', 'path': '/occurrences/0/rates/additional_rates/-', 'value': {'title': 'Walk', 'amount': '3.00'}},
+        ])
+
+        self.assertEqual(len(patched['pets']), 2)
+        self.assertEqual([rate['amount'] for rate in patched['occurrences'][0]['rates']['additional_rates']], ['4.00', '3.00'])
+
+    def test_operations_apply_in_order(self):
+        patched = apply_draft_patch(draft_data(), [
+            {'op': 'replace', 'path': '/occurrences/0/start_time', 'value': '10:00'},
+            {'op': 'test', 'path': '/occurrences/0/start_time', 'value': '10:00'},
+        ])
+
+        self.assertEqual(patched['occurrences'][0]['start_time'], '10:00')
+
+    def test_failed_test_rejects_the_patch(self):
+        with self.assertRaises(InvalidDraftPatch):
+            apply_draft_patch(draft_data(), [{'op': 'test', 'path': '/cost_summary/tax_state', 'value': 'NY'}])
+
+    def test_test_can_read_server_fields(self):
+        data = draft_data()
+        self.assertIs(apply_draft_patch(data, [{'op': 'test', 'path': '/cost_summary/tax_state', 'value': 'CO'}]), data)
+
+    def test_derived_and_server_paths_are_rejected(self):
+        for path in (
+            '',
+            '/cost_summary',
+            '/cost_summary/subtotal',
+            '/notes_from_pro',
+            '/occurrences/0/calculated_cost',
+            '/occurrences/0/base_total',
+            '/occurrences/0/multiple',
+            '/occurrences/0/rates/additional_animal_rate_total',
+            '/occurrences/0/rates/unit_of_time',
+            '/occurrences/0/rates/base_rate/x',
+        ):
+            with self.subTest(path=path), self.assertRaises(InvalidDraftPatch):
+                apply_draft_patch(draft_data(), [{'op': 'replace', 'path': path, 'value': '1'}])
+
+    def test_derived_fields_inside_values_are_rejected(self):
+        for value in (
+            occurrence('o3'),
+            {'base_rate': '1.00', 'holiday_rate_total': '0'},
+        ):
+            with self.subTest(value=value), self.assertRaises(InvalidDraftPatch):
+                apply_draft_patch(draft_data(), [{'op': 'replace', 'path': '/occurrences/0/rates', 'value': value}])
+
+    def test_malformed_operations(self):
+        for operations in (
+            {'op': 'replace'},
+            [{'op': 'move', 'path': '/pets/0', 'from': '/pets/1'}],
+            [{'op': 'replace', 'path': '/pets/0'}],
+            [{'op': 'replace', 'path': 'pets', 'value': []}],
+            [{'op': 'replace', 'path': '/occurrences/5/start_time', 'value': '10:00'}],
+            [{'op': 'replace', 'path': '/occurrences/x/start_time', 'value': '10:00'}],
+            ['replace'],
+        ):
+            with self.subTest(operations=operations), self.assertRaises(InvalidDraftPatch):
+                apply_draft_patch(draft_data(), operations)
+
+
+@mock.patch('booking_drafts.draft_store.is_holiday', return_value=False)
+class RepriceDraftOccurrenceTests(SimpleTestCase):
+    def test_prices_from_the_occurrences_own_rates(self, is_holiday):
+        repriced = reprice_draft_occurrence(occurrence('o1'), 3)
+
+        # 3 hours at $20, 2 extra pets at $5 once each, $2 additional rate
+        self.assertEqual(Decimal(repriced['calculated_cost']), Decimal('72.00'))
+        self.assertEqual(Decimal(repriced['base_total']), Decimal('60.00'))
+        self.assertEqual(repriced['multiple'], 3.0)
+        self.assertEqual(repriced['rates']['additional_animal_rate_applies'], 2)
+
+    def test_holiday_surcharge(self, is_holiday):
+        is_holiday.return_value = True
+        repriced = reprice_draft_occurrence(occurrence('o1'), 3)
+
+        self.assertEqual(Decimal(repriced['calculated_cost']), Decimal('82.00'))
+        self.assertEqual(repriced['rates']['holiday_days'], 1)
+
+    def test_does_not_modify_the_input(self, is_holiday):
+        original = occurrence('o1')
+        original['start_time'] = '10:00'
+        reprice_draft_occurrence(original, 1)
+
+        self.assertEqual(original['calculated_cost'], '70.00')
+
+    def test_malformed_occurrences_are_invalid_patches(self, is_holiday):
+        bad_rates = occurrence('o1')
+        bad_rates['rates'] = dict(bad_rates['rates'], applies_after='two')
+        for bad in (
+            'o1',
+            [occurrence('o1')],
+            {key: value for key, value in occurrence('o1').items() if key != 'end_time'},
+            dict(occurrence('o1'), start_date=20260303),
+            dict(occurrence('o1'), start_time='9 o\'clock'),
+            dict(occurrence('o1'), nights='two'),
+            dict(occurrence('o1'), rates=['20.00']),
+            bad_rates,
+        ):
+            with self.subTest(occurrence=bad), self.assertRaises(InvalidDraftPatch):
+                reprice_draft_occurrence(bad, 2)
+
+    def test_rates_editor_prices_the_same_way(self, is_holiday):
+        from booking_drafts.v1.views import reprice_occurrence_rates
+
+        for holiday in (False, True):
+            is_holiday.return_value = holiday
+            repriced = reprice_draft_occurrence(occurrence('o1'), 3)
+            new_rates = {
+                'base_rate': Decimal('25.00'),
+                'additional_animal_rate': Decimal('6.00'),
+                'applies_after': 1,
+                'holiday_rate': Decimal('12.00'),
+                'additional_rates': [{'title': 'Meds', 'amount': Decimal('2.00'), 'description': ''}],
+            }
+            edited = reprice_occurrence_rates(repriced, new_rates, 3)
+            patched = dict(repriced, rates=dict(repriced['rates'], base_rate='25.00', additional_animal_rate='6.00', holiday_rate='12.00'))
+
+            with self.subTest(holiday=holiday):
+                self.assertEqual(Decimal(str(edited['calculated_cost'])), Decimal(reprice_draft_occurrence(patched, 3)['calculated_cost']))
+
+
+@mock.patch('booking_drafts.draft_store.Address.objects.filter', return_value=mock.Mock(first=mock.Mock(return_value=None)))
+@mock.patch('booking_drafts.draft_store.Client.objects.select_related')
+class BuildCostSummaryTests(SimpleTestCase):
+    professional = SimpleNamespace(user='pro user')
+
+    def fees_client(self, draft):
+        with mock.patch('booking_drafts.draft_store.calculate_platform_fees', return_value={
+            'client_platform_fee': Decimal('0'), 'pro_platform_fee': Decimal('0'), 'total_platform_fee': Decimal('0'),
+            'client_platform_fee_percentage': Decimal('0'), 'pro_platform_fee_percentage': Decimal('0'),
+        }) as calculate_platform_fees:
+            build_cost_summary(draft, Decimal('100.00'), self.professional, {'subtotal': 90.0})
+        return calculate_platform_fees.call_args.args[1]
+
+    def test_draft_without_a_booking_uses_the_client_id(self, select_related, address_filter):
+        select_related.return_value.get.return_value = SimpleNamespace(user='client user')
+        draft = BookingDraft(draft_id='d1', booking=None, draft_data={'client_id': 7})
+
+        self.assertEqual(self.fees_client(draft), 'client user')
+        select_related.return_value.get.assert_called_once_with(id=7)
+
+    def test_unknown_client(self, select_related, address_filter):
+        from clients.models import Client
+
+        select_related.return_value.get.side_effect = Client.DoesNotExist
+        self.assertIsNone(self.fees_client(BookingDraft(draft_id='d1', booking=None, draft_data={'client_id': 7})))
+        self.assertIsNone(self.fees_client(BookingDraft(draft_id='d1', booking=None, draft_data={})))
+
+
+class RecurringDatesTests(SimpleTestCase):
+    def dates(self, start, end, days, frequency=RecurrenceFrequency.WEEKLY, max_occurrences=None):
+        return list(iter_recurring_dates(start, end, days, frequency, max_occurrences))
+
+    def test_weekly(self):
+        # Wednesday Jan 7th 2026 to Sunday Jan 25th, Mondays and Fridays
+        self.assertEqual(
+            self.dates(date(2026, 1, 7), date(2026, 1, 25), [4, 0]),
+            [date(2026, 1, 9), date(2026, 1, 12), date(2026, 1, 16), date(2026, 1, 19), date(2026, 1, 23)]
+        )
+
+    def test_bi_weekly_keeps_the_start_week_and_every_other_one(self):
+        # The week of Jan 5th is week 0 even though the range starts on Wednesday
+        self.assertEqual(
+            self.dates(date(2026, 1, 7), date(2026, 2, 8), [0, 4], RecurrenceFrequency.BI_WEEKLY),
+            [date(2026, 1, 9), date(2026, 1, 19), date(2026, 1, 23), date(2026, 2, 2), date(2026, 2, 6)]
+        )
+
+    def test_bi_weekly_weeks_run_monday_to_sunday(self):
+        # Starting on a Sunday, the next day already begins the skipped week
+        self.assertEqual(
+            self.dates(date(2026, 1, 11), date(2026, 2, 1), [0, 6], RecurrenceFrequency.BI_WEEKLY),
+            [date(2026, 1, 11), date(2026, 1, 19), date(2026, 1, 25)]
+        )
+
+    def test_bi_weekly_across_a_year_boundary(self):
+        self.assertEqual(
+            self.dates(date(2025, 12, 22), date(2026, 1, 20), [1], RecurrenceFrequency.BI_WEEKLY),
+            [date(2025, 12, 23), date(2026, 1, 6), date(2026, 1, 20)]
+        )
+
+    def test_max_occurrences(self):
+        self.assertEqual(
+            self.dates(date(2026, 1, 5), date(2026, 12, 31), [0, 2], RecurrenceFrequency.BI_WEEKLY, max_occurrences=3),
+            [date(2026, 1, 5), date(2026, 1, 7), date(2026, 1, 19)]
+        )
+        self.assertEqual(self.dates(date(2026, 1, 5), date(2026, 12, 31), [0], max_occurrences=0), [])
+
+    def test_empty_ranges_and_weekdays(self):
+        self.assertEqual(self.dates(date(2026, 1, 10), date(2026, 1, 5), [0]), [])
+        self.assertEqual(self.dates(date(2026, 1, 5), date(2026, 1, 31), []), [])
+        self.assertEqual(self.dates(date(2026, 1, 5), date(2026, 1, 11), [7, -1, 2]), [date(2026, 1, 7)])
+
+    def test_frequency(self):
+        self.assertEqual(
+            self.dates(date(2026, 1, 5), date(2026, 1, 19), [0], None),
+            [date(2026, 1, 5), date(2026, 1, 12), date(2026, 1, 19)]
+        )
+        with self.assertRaises(ValueError):
+            self.dates(date(2026, 1, 5), date(2026, 3, 1), [0], 'monthly')
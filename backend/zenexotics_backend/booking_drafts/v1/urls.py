@@ -10,6 +10,8 @@ from .views import (
     GetBookingDraftDatesAndTimesView,
     CreateDraftFromBookingView,
     UpdateNotesFromProView,
+    PatchBookingDraftView,
+    BookingDraftChangesView,
 )
 from booking_drafts.v1.views import UpdateBookingDraftTimeAndDateView
 
@@ -23,5 +25,7 @@ urlpatterns = [
     path('update-recurring/<str:draft_id>/', UpdateBookingDraftRecurringView.as_view(), name='update-recurring'),
     path('<int:draft_id>/dates_and_times/', GetBookingDraftDatesAndTimesView.as_view(), name='get_booking_draft_dates_and_times'),
     path('create-from-booking/<int:booking_id>/', CreateDraftFromBookingView.as_view(), name='create-draft-from-booking'),
+    path('<int:draft_id>/changes/', BookingDraftChangesView.as_view(), name='booking-draft-changes'),
+    path('patch/<int:draft_id>/', PatchBookingDraftView.as_view(), name='patch-booking-draft'),
     path('update-notes-from-pro/', UpdateNotesFromProView.as_view(), name='update-notes-from-pro'),
 ]
\ No newline at end of file
@@ -24,21 +24,27 @@ from datetime import datetime, date, time, timedelta
 from interaction_logs.models import InteractionLog
 from engagement_logs.models import EngagementLog
 from error_logs.models import ErrorLog
-from core.time_utils import convert_to_utc, get_formatted_times
+from core.time_utils import convert_to_utc, get_formatted_times, get_user_time_settings
 from users.models import UserSettings
 from user_addresses.models import Address, AddressType
-from core.constants import STATE_TAX_RATES
+from core.constants import STATE_TAX_RATES, RECURRENCE_WEEK_INTERVALS
+from core.pricing import build_rate_card, price_units
+from core.recurrence import iter_recurring_dates
+from bookings.content_hash import booking_state, diff_states, draft_content_hash, draft_state, get_booking_content_hash
 from core.booking_operations import (
     calculate_occurrence_rates, 
+    calculate_series_rates,
     create_occurrence_data, 
     calculate_cost_summary
 )
 import pytz
 from django.utils import timezone
-from booking_drafts.serializers import OvernightBookingCalculationSerializer, UpdateRatesSerializer
+from booking_drafts.serializers import OvernightBookingCalculationSerializer, UpdateRatesSerializer, DraftPatchSerializer
+from booking_drafts.draft_store import draft_rate_card, patch_draft, save_draft_data, DraftVersionConflict, InvalidDraftPatch
 from core.tax_utils import get_state_from_address, calculate_booking_taxes
 from core.platform_fee_utils import calculate_platform_fees
 import uuid
+from types import SimpleNamespace
 import re
 from collections import OrderedDict
 from decimal import Decimal, ROUND_HALF_UP
@@ -49,6 +55,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# UpdateBookingRatesView keeps the draft subtotal as a running total; every this
+# many updates it is summed from the occurrences again to catch any drift
+DRAFT_SUBTOTAL_FULL_RECOMPUTE_INTERVAL = 20
+
 def validate_time_combination(start_date, end_date, start_time, end_time, occurrence_identifier=""):
     """
     Validate that end time is not before or equal to start time when considering dates.
@@ -239,76 +249,22 @@ def pets_are_different(current_pets, new_pets):
     return current_set != new_set
 
 def has_changes_from_original(booking, draft_data):
-    """Compare all fields between booking and draft data to determine if there are any changes"""
+    """
+    Whether the draft differs from its booking (service, pets, occurrence times and rates).
+    Compares the booking's stored content hash with the draft's, see bookings.content_hash.
+    """
     try:
-        # Compare service details
-        if booking.service_id and 'service_details' in draft_data:
-            if booking.service_id.service_name != draft_data['service_details']['service_type']:
-                logger.info(f"Service changed from {booking.service_id.service_name} to {draft_data['service_details']['service_type']}")
-                return True
-
-        # Compare pets
-        current_pets = set([
-            (bp.pet.pet_id, bp.pet.name, bp.pet.species, bp.pet.breed)
-            for bp in booking.booking_pets.select_related('pet').all()
-        ])
-        draft_pets = set([
-            (pet['pet_id'], pet['name'], pet['species'], pet['breed'])
-            for pet in draft_data.get('pets', [])
-        ])
-        if current_pets != draft_pets:
-            logger.info("Pets have changed")
-            return True
-
-        # Always check for rate differences in occurrences
-        if 'occurrences' in draft_data:
-            for draft_occ in draft_data['occurrences']:
-                # Get the corresponding booking occurrence and its details
-                try:
-                    occurrence = BookingOccurrence.objects.get(
-                        occurrence_id=draft_occ['occurrence_id'],
-                        booking=booking
-                    )
-                    booking_details = occurrence.booking_details.first()
-                    
-                    if booking_details:
-                        # Compare rates - convert everything to Decimal for accurate comparison
-                        original_base_rate = Decimal(str(booking_details.base_rate))
-                        original_additional_rate = Decimal(str(booking_details.additional_pet_rate))
-                        original_holiday_rate = Decimal(str(booking_details.holiday_rate))
-                        original_applies_after = int(booking_details.applies_after)
-
-                        # Clean the draft values by removing '$' and whitespace
-                        draft_base_rate = Decimal(str(draft_occ['rates']['base_rate']).replace('$', '').strip())
-                        draft_additional_rate = Decimal(str(draft_occ['rates']['additional_animal_rate']).replace('$', '').strip())
-                        draft_holiday_rate = Decimal(str(draft_occ['rates']['holiday_rate']).replace('$', '').strip())
-                        draft_applies_after = int(str(draft_occ['rates']['applies_after']))
-
-                        # Log the comparison
-                        logger.info(f"Comparing rates for occurrence {draft_occ['occurrence_id']}:")
-                        logger.info(f"Original - Base: {original_base_rate}, Additional: {original_additional_rate}, Holiday: {original_holiday_rate}, Applies After: {original_applies_after}")
-                        logger.info(f"Draft - Base: {draft_base_rate}, Additional: {draft_additional_rate}, Holiday: {draft_holiday_rate}, Applies After: {draft_applies_after}")
-
-                        # Compare the values
-                        if (original_base_rate != draft_base_rate or
-                            original_additional_rate != draft_additional_rate or
-                            original_holiday_rate != draft_holiday_rate or
-                            original_applies_after != draft_applies_after):
-                            logger.info("Rates have changed")
-                            logger.info(f"Base rate changed: {original_base_rate} != {draft_base_rate}")
-                            logger.info(f"Additional rate changed: {original_additional_rate} != {draft_additional_rate}")
-                            logger.info(f"Holiday rate changed: {original_holiday_rate} != {draft_holiday_rate}")
-                            logger.info(f"Applies after changed: {original_applies_after} != {draft_applies_after}")
-                            return True
-                except BookingOccurrence.DoesNotExist:
-                    logger.warning(f"Occurrence {draft_occ['occurrence_id']} not found")
-                    continue
-
-        return False
+        return get_booking_content_hash(booking) != draft_content_hash(draft_data)
     except Exception as e:
         logger.error(f"Error comparing booking with draft: {e}")
         return True  # Default to True if comparison fails
 
+def changes_from_original(booking, draft_data):
+    """Detailed differences between a booking and its draft, for when the UI needs to show them"""
+    if not has_changes_from_original(booking, draft_data):
+        return OrderedDict()
+    return diff_states(booking_state(booking), draft_state(draft_data))
+
 def update_draft_with_service(booking, service_id=None, occurrence_services=None):
     """
     Updates draft data with new service(s)
@@ -648,6 +604,7 @@ class UpdateBookingPetsView(APIView):
             # Process occurrences
             processed_occurrences = []
             num_pets = len(new_pets_data)
+            rate_card = build_rate_card(service)  # Read the service's rates once for all occurrences
             
             # Get existing occurrences from draft
             existing_occurrences = current_draft_data.get('occurrences', [])
@@ -681,7 +638,7 @@ class UpdateBookingPetsView(APIView):
                     )
 
                     # Calculate rates using the new service
-                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets)
+                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets, rate_card)
                     if not rate_data:
                         raise Exception(f"Failed to calculate rates for occurrence {occurrence_data['occurrence_id']}")
 
@@ -858,6 +815,7 @@ class UpdateServiceTypeView(APIView):
             # Process occurrences
             processed_occurrences = []
             num_pets = len(pets_data)
+            rate_card = build_rate_card(service)  # Read the service's rates once for all occurrences
             existing_occurrences = []
             
             # Get existing occurrences from draft and booking
@@ -904,7 +862,7 @@ class UpdateServiceTypeView(APIView):
                     )
 
                     # Calculate rates using the new service
-                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets)
+                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets, rate_card)
                     if not rate_data:
                         raise Exception(f"Failed to calculate rates for occurrence {occurrence_data['occurrence_id']}")
 
@@ -1298,6 +1256,93 @@ class UpdateBookingDraftView(APIView):
         
         return Response(response_data, status=status.HTTP_200_OK)
 
+class BookingDraftChangesView(APIView):
+    """Whether a draft differs from its booking; pass ?detailed=true for what changed"""
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer]
+
+    def get(self, request, draft_id):
+        try:
+            draft = get_object_or_404(BookingDraft.objects.select_related('booking'), draft_id=draft_id)
+            professional = get_object_or_404(Professional, user=request.user)
+
+            if draft.booking and draft.booking.professional_id != professional.professional_id:
+                logger.error(f"MBA_DRAFT_CHANGES - Unauthorized access attempt by {request.user.email} for draft {draft_id}")
+                return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+            if not draft.booking:
+                # Nothing to compare against yet, everything in the draft is new
+                return Response({'has_changes': True, 'changes': None})
+
+            has_changes = has_changes_from_original(draft.booking, draft.draft_data)
+            response_data = {'has_changes': has_changes}
+            if request.query_params.get('detailed') == 'true':
+                response_data['changes'] = changes_from_original(draft.booking, draft.draft_data) if has_changes else {}
+            return Response(response_data)
+
+        except Exception as e:
+            logger.error(f"MBA_DRAFT_CHANGES - Error comparing draft {draft_id}: {str(e)}")
+            logger.error(f"MBA_DRAFT_CHANGES - Full error traceback: {traceback.format_exc()}")
+            return Response(
+                {"error": f"An error occurred while comparing the booking draft: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class PatchBookingDraftView(APIView):
+    """
+    Apply JSON-patch operations to a draft's data against the version the editor last saw.
+    Only the changed parts of the draft are repriced, written and returned.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer]
+
+    def patch(self, request, draft_id):
+        logger.info(f"MBA_DRAFT_PATCH - Starting PatchBookingDraftView.patch for draft {draft_id}")
+
+        try:
+            professional = get_object_or_404(Professional, user=request.user)
+            booking_professional_id = BookingDraft.objects.filter(draft_id=draft_id).values_list(
+                'booking__professional_id', flat=True
+            ).first()
+            if booking_professional_id is not None and booking_professional_id != professional.professional_id:
+                logger.error(f"MBA_DRAFT_PATCH - Unauthorized access attempt by {request.user.email} for draft {draft_id}")
+                return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+            serializer = DraftPatchSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            version, changed = patch_draft(
+                draft_id,
+                serializer.validated_data['version'],
+                serializer.validated_data['operations'],
+                professional
+            )
+
+            return Response({
+                'status': 'success',
+                'version': version,
+                'changed': changed
+            })
+
+        except BookingDraft.DoesNotExist:
+            return Response({"error": "Booking draft not found."}, status=status.HTTP_404_NOT_FOUND)
+        except DraftVersionConflict as e:
+            logger.warning(f"MBA_DRAFT_PATCH - Stale patch for draft {draft_id}: {str(e)}")
+            return Response(
+                {"error": "This draft was changed by someone else. Please refresh and try again.", "current_version": e.current_version},
+                status=status.HTTP_409_CONFLICT
+            )
+        except InvalidDraftPatch as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"MBA_DRAFT_PATCH - Error patching draft {draft_id}: {str(e)}")
+            logger.error(f"MBA_DRAFT_PATCH - Full error traceback: {traceback.format_exc()}")
+            return Response(
+                {"error": f"An error occurred while updating the booking draft: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
 class UpdateBookingDraftPetsAndServicesView(APIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [JSONRenderer]
@@ -1785,80 +1830,33 @@ class UpdateBookingRatesView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Update rates in the draft occurrences
+            # Reprice only the occurrences whose rates actually changed; the rest are kept as they are
+            draft_data = dict(draft.draft_data)
+            num_pets = len(draft_data.get('pets', []))
+            occurrences_by_id = {occurrence['occurrence_id']: occurrence for occurrence in draft_data['occurrences']}
             updated_occurrences = []
+            repriced_ids = []
+            additional_rates_changed = False
+            subtotal_delta = Decimal('0')
             
             for occurrence_update in occurrences_data:
                 occurrence_id = occurrence_update['occurrence_id']
+                occurrence = occurrences_by_id.get(occurrence_id)
+                if occurrence is None:
+                    continue
+                
                 new_rates = occurrence_update['rates']
+                if not rates_update_changes_occurrence(occurrence, new_rates):
+                    updated_occurrences.append(occurrence)
+                    continue
                 
-                # Find the occurrence in the draft data
-                for i, occurrence in enumerate(draft.draft_data['occurrences']):
-                    if occurrence['occurrence_id'] == occurrence_id:
-                        # Update the occurrence rates
-                        occurrence['rates']['base_rate'] = str(new_rates['base_rate'])
-                        if 'additional_animal_rate' in new_rates:
-                            occurrence['rates']['additional_animal_rate'] = str(new_rates['additional_animal_rate'])
-                        if 'applies_after' in new_rates:
-                            occurrence['rates']['applies_after'] = new_rates['applies_after']
-                        if 'holiday_rate' in new_rates:
-                            occurrence['rates']['holiday_rate'] = str(new_rates['holiday_rate'])
-                        
-                        # Update additional rates if provided
-                        if 'additional_rates' in new_rates:
-                            additional_rates = []
-                            for rate in new_rates['additional_rates']:
-                                additional_rates.append(OrderedDict([
-                                    ('title', rate['title']),
-                                    ('amount', str(rate['amount'])),
-                                    ('description', rate.get('description', ''))
-                                ]))
-                            occurrence['rates']['additional_rates'] = additional_rates
-                        
-                        # Update calculated costs
-                        base_rate = Decimal(str(new_rates['base_rate']))
-                        unit_of_time = occurrence.get('unit_of_time', 'Per Visit')
-                        multiple = occurrence.get('multiple', 1)
-                        base_total = base_rate * Decimal(str(multiple))
-                        occurrence['base_total'] = float(base_total)
-                        
-                        # Calculate additional animal rates
-                        additional_animal_rate_total = Decimal('0')
-                        if 'additional_animal_rate' in new_rates and 'applies_after' in new_rates:
-                            num_pets = len(draft.draft_data.get('pets', []))
-                            applies_after = new_rates['applies_after']
-                            if num_pets > applies_after:
-                                additional_pets = num_pets - applies_after
-                                additional_animal_rate = Decimal(str(new_rates['additional_animal_rate']))
-                                multiple = occurrence.get('multiple', 1)
-                                # For overnight services: additional animal rate × additional pets × nights
-                                additional_animal_rate_total = additional_animal_rate * additional_pets * Decimal(str(multiple))
-                                occurrence['rates']['additional_animal_rate_total'] = float(additional_animal_rate_total)
-                                logger.info(f"MBA98765 - Additional animal rate calc: {num_pets} pets - {applies_after} applies_after = {additional_pets} extra pets × ${additional_animal_rate} × {multiple} = ${additional_animal_rate_total}")
-                            else:
-                                occurrence['rates']['additional_animal_rate_total'] = 0.0
-                        
-                        # Calculate holiday rates
-                        holiday_rate_total = Decimal('0')
-                        if 'holiday_rate' in new_rates and occurrence['rates'].get('holiday_days', 0) > 0:
-                            holiday_days = occurrence['rates']['holiday_days']
-                            holiday_rate = Decimal(str(new_rates['holiday_rate']))
-                            holiday_rate_total = holiday_rate * Decimal(str(holiday_days))
-                            occurrence['rates']['holiday_rate_total'] = float(holiday_rate_total)
-                        
-                        # Calculate additional rates total
-                        additional_rates_total = Decimal('0')
-                        if 'additional_rates' in new_rates:
-                            for rate in new_rates['additional_rates']:
-                                additional_rates_total += Decimal(str(rate['amount']))
-                        
-                        # Update the calculated total cost for this occurrence
-                        calculated_cost = base_total + additional_animal_rate_total + holiday_rate_total + additional_rates_total
-                        occurrence['calculated_cost'] = float(calculated_cost)
-                        
-                        # Add to updated occurrences
-                        updated_occurrences.append(occurrence)
-                        break
+                updated = reprice_occurrence_rates(occurrence, new_rates, num_pets)
+                subtotal_delta += Decimal(str(updated['calculated_cost'])) - Decimal(str(occurrence.get('calculated_cost', '0')))
+                if updated['rates'].get('additional_rates') != occurrence.get('rates', {}).get('additional_rates'):
+                    additional_rates_changed = True
+                occurrences_by_id[occurrence_id] = updated
+                updated_occurrences.append(updated)
+                repriced_ids.append(occurrence_id)
             
             # If we didn't update any occurrences, return error
             if not updated_occurrences:
@@ -1868,26 +1866,43 @@ class UpdateBookingRatesView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Update occurrences in draft data
-            draft.draft_data['occurrences'] = updated_occurrences
-            
-            # Get service for managing additional rates
-            service = None
-            if 'service_details' in draft.draft_data:
-                try:
-                    service = Service.objects.get(
-                        service_name=draft.draft_data['service_details']['service_type'],
-                        professional=professional,
-                        moderation_status='APPROVED'
-                    )
-                except Service.DoesNotExist:
-                    service = draft.booking.service_id if draft.booking else None
-            elif draft.booking:
-                service = draft.booking.service_id
+            # Occurrences left out of the request are dropped, same as before
+            kept_ids = {occurrence['occurrence_id'] for occurrence in updated_occurrences}
+            dropped_occurrences = [
+                occurrence for occurrence in draft_data['occurrences']
+                if occurrence['occurrence_id'] not in kept_ids
+            ]
+            for occurrence in dropped_occurrences:
+                subtotal_delta -= Decimal(str(occurrence.get('calculated_cost', '0')))
             
-            # Manage service additional rates based on updated occurrences
-            if service:
-                draft.draft_data = manage_service_additional_rates(draft.draft_data, service, updated_occurrences)
+            # Update occurrences in draft data
+            draft_data['occurrences'] = updated_occurrences
+            logger.info(f"MBA98765 - Repriced {len(repriced_ids)} of {len(updated_occurrences)} occurrences, dropped {len(dropped_occurrences)}")
+            
+            # The additional rates rollup only changes when some occurrence's additional rates did
+            if (
+                additional_rates_changed
+                or dropped_occurrences
+                or 'additional_rates' not in draft_data.get('service_details', {})
+            ):
+                # Get service for managing additional rates
+                service = None
+                if 'service_details' in draft_data:
+                    try:
+                        service = Service.objects.get(
+                            service_name=draft_data['service_details']['service_type'],
+                            professional=professional,
+                            moderation_status='APPROVED'
+                        )
+                    except Service.DoesNotExist:
+                        service = draft.booking.service_id if draft.booking else None
+                elif draft.booking:
+                    service = draft.booking.service_id
+                
+                # Manage service additional rates based on updated occurrences
+                if service:
+                    draft_data['service_details'] = dict(draft_data.get('service_details', {}))
+                    draft_data = manage_service_additional_rates(draft_data, service, updated_occurrences)
             
             # Get professional's service address for tax calculation
             address = Address.objects.filter(
@@ -1898,10 +1913,23 @@ class UpdateBookingRatesView(APIView):
             # Get state from address or use default
             state = get_state_from_address(address, default_state='CO')
             
-            # Calculate cost summary based on updated occurrences
-            subtotal = Decimal('0')
-            for occ in updated_occurrences:
-                subtotal += Decimal(str(occ['calculated_cost']))
+            # Running subtotal, with a full sum every so often (or when there's nothing to run from).
+            # The count of updates since the last full sum is server bookkeeping, kept in cost_summary.
+            previous_cost_summary = draft_data.get('cost_summary') or {}
+            previous_subtotal = previous_cost_summary.get('subtotal')
+            updates_since_full_sum = previous_cost_summary.get('subtotal_delta_updates', 0) + 1
+            if previous_subtotal is None or updates_since_full_sum >= DRAFT_SUBTOTAL_FULL_RECOMPUTE_INTERVAL:
+                subtotal = Decimal('0')
+                for occ in updated_occurrences:
+                    subtotal += Decimal(str(occ['calculated_cost']))
+                if previous_subtotal is not None:
+                    running_subtotal = (Decimal(str(previous_subtotal)) + subtotal_delta).quantize(Decimal('0.01'))
+                    if running_subtotal != subtotal.quantize(Decimal('0.01')):
+                        logger.warning(f"MBA98765 - Running subtotal {running_subtotal} drifted from {subtotal} for draft {draft_id}")
+                updates_since_full_sum = 0
+            else:
+                subtotal = Decimal(str(previous_subtotal)) + subtotal_delta
+            draft_data.pop('subtotal_delta_updates', None)
             
             # Get client from the booking or draft data
             client = None
@@ -1913,9 +1941,9 @@ class UpdateBookingRatesView(APIView):
                 client_user = client.user if client else None
                 logger.info(f"MBA98765 - Found client from booking: {client.id if client else 'None'}")
             # If not in booking, try to get from draft data
-            elif draft.draft_data and 'client_id' in draft.draft_data and draft.draft_data['client_id']:
+            elif draft_data and 'client_id' in draft_data and draft_data['client_id']:
                 try:
-                    client_id = draft.draft_data['client_id']
+                    client_id = draft_data['client_id']
                     client = Client.objects.get(id=client_id)
                     client_user = client.user if client else None
                     logger.info(f"MBA98765 - Found client from draft data: {client.id if client else 'None'}")
@@ -1965,18 +1993,19 @@ class UpdateBookingRatesView(APIView):
                 ('tax_state', state),
                 ('client_platform_fee_percentage', float(client_platform_fee_percentage * 100)),
                 ('pro_platform_fee_percentage', float(pro_platform_fee_percentage * 100)),
-                ('pro_subscription_plan', pro_subscription_plan)
+                ('pro_subscription_plan', pro_subscription_plan),
+                ('subtotal_delta_updates', updates_since_full_sum)
             ])
             
             # Update cost summary in draft data
-            draft.draft_data['cost_summary'] = cost_summary
+            draft_data['cost_summary'] = cost_summary
             
             # Update draft status if needed
             if draft.booking and draft.booking.status == BookingStates.CONFIRMED:
-                draft.draft_data['status'] = BookingStates.CONFIRMED_PENDING_PROFESSIONAL_CHANGES
+                draft_data['status'] = BookingStates.CONFIRMED_PENDING_PROFESSIONAL_CHANGES
             
-            # Save the draft
-            draft.save()
+            # Save the draft, writing only the repriced occurrences and the keys that changed
+            save_draft_data(draft, draft_data)
             
             # Log the interaction
             InteractionLog.objects.create(
@@ -1987,10 +2016,11 @@ class UpdateBookingRatesView(APIView):
                 metadata={
                     'draft_id': draft_id,
                     'updated_occurrences': len(updated_occurrences),
+                    'repriced_occurrence_ids': repriced_ids,
                     'subtotal': float(subtotal),
                     'tax_state': state,
                     'taxes': float(taxes),
-                    'draft_data': draft.draft_data
+                    'cost_summary': cost_summary
                 }
             )
             
@@ -2008,6 +2038,73 @@ class UpdateBookingRatesView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+def rates_update_changes_occurrence(occurrence, new_rates):
+    """Whether applying new_rates (UpdateRatesSerializer data) would change any of the occurrence's rates"""
+    rates = occurrence.get('rates', {})
+    if str(rates.get('base_rate')) != str(new_rates['base_rate']):
+        return True
+    for field in ('additional_animal_rate', 'holiday_rate'):
+        if field in new_rates and str(rates.get(field)) != str(new_rates[field]):
+            return True
+    if 'applies_after' in new_rates and rates.get('applies_after') != new_rates['applies_after']:
+        return True
+    if 'additional_rates' in new_rates:
+        current = [
+            (rate.get('title'), str(rate.get('amount')), rate.get('description', ''))
+            for rate in rates.get('additional_rates', [])
+        ]
+        updated = [
+            (rate['title'], str(rate['amount']), rate.get('description', ''))
+            for rate in new_rates['additional_rates']
+        ]
+        if current != updated:
+            return True
+    return False
+
+def reprice_occurrence_rates(occurrence, new_rates, num_pets):
+    """
+    Copy of a draft occurrence with new_rates (UpdateRatesSerializer data) applied
+    and its costs recalculated
+    """
+    occurrence = OrderedDict(occurrence)
+    occurrence['rates'] = OrderedDict(occurrence['rates'])
+    
+    # Update the occurrence rates
+    occurrence['rates']['base_rate'] = str(new_rates['base_rate'])
+    if 'additional_animal_rate' in new_rates:
+        occurrence['rates']['additional_animal_rate'] = str(new_rates['additional_animal_rate'])
+    if 'applies_after' in new_rates:
+        occurrence['rates']['applies_after'] = new_rates['applies_after']
+    if 'holiday_rate' in new_rates:
+        occurrence['rates']['holiday_rate'] = str(new_rates['holiday_rate'])
+    
+    # Update additional rates if provided
+    if 'additional_rates' in new_rates:
+        additional_rates = []
+        for rate in new_rates['additional_rates']:
+            additional_rates.append(OrderedDict([
+                ('title', rate['title']),
+                ('amount', str(rate['amount'])),
+                ('description', rate.get('description', ''))
+            ]))
+        occurrence['rates']['additional_rates'] = additional_rates
+    
+    # Update calculated costs with the occurrence's stored multiple, priced like every other draft occurrence
+    multiple = Decimal(str(occurrence.get('multiple', 1)))
+    holiday = (occurrence['rates'].get('holiday_days') or 0) > 0
+    line_item = price_units(draft_rate_card(occurrence['rates']), num_pets, multiple, is_holiday=holiday)
+    occurrence['base_total'] = float(line_item['base_total'])
+    occurrence['rates']['additional_animal_rate_total'] = float(line_item['additional_animal_rate_total'])
+    occurrence['rates']['additional_animal_rate_applies'] = line_item['additional_animal_rate_applies']
+    if holiday:
+        occurrence['rates']['holiday_rate_total'] = float(line_item['holiday_total'])
+    logger.info(f"MBA98765 - Repriced occurrence {occurrence.get('occurrence_id')}: {multiple} units, {line_item['additional_animal_rate_applies']} extra pets = ${line_item['total_cost']}")
+    
+    # Update the calculated total cost for this occurrence
+    occurrence['calculated_cost'] = float(line_item['total_cost'])
+    
+    return occurrence
+
 def manage_service_additional_rates(draft_data, service, occurrences_data):
     """
     Manages the service_details.additional_rates object based on service rates and occurrence rates.
@@ -2185,6 +2282,7 @@ class UpdateBookingDraftMultipleDaysView(APIView):
 
             # Get number of pets
             num_pets = len(draft.draft_data.get('pets', [])) if draft.draft_data else 0
+            rate_card = build_rate_card(service)  # Read the service's rates once for all occurrences
 
             # Get existing occurrences for comparison
             existing_occurrences = draft.draft_data.get('occurrences', [])
@@ -2309,7 +2407,7 @@ class UpdateBookingDraftMultipleDaysView(APIView):
                         temp_occurrence.end_time = end_time_obj
                         
                         # Calculate new rates data
-                        rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets)
+                        rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets, rate_card)
                         
                         if rate_data:
                             # Update the matching occurrence with new base rates but preserve user's additional_rates
@@ -2362,7 +2460,7 @@ class UpdateBookingDraftMultipleDaysView(APIView):
                     temp_occurrence.end_time = end_time_obj
                     
                     # Calculate new occurrence data
-                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets)
+                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets, rate_card)
                     
                     if rate_data:
                         # CRITICAL FIX: For new occurrences, always include all service additional rates
@@ -2627,89 +2725,76 @@ class UpdateBookingDraftRecurringView(APIView):
 
             # Get number of pets
             num_pets = len(draft.draft_data.get('pets', [])) if draft.draft_data else 0
+            rate_card = build_rate_card(service)  # Read the service's rates once for all occurrences
 
             # Generate recurring dates
             start_date = datetime.strptime(recurring_data['startDate'], '%Y-%m-%d').date()
             end_date = datetime.strptime(recurring_data['endDate'], '%Y-%m-%d').date()
             days_of_week = recurring_data['daysOfWeek']
             frequency = recurring_data['frequency']
+            if frequency not in RECURRENCE_WEEK_INTERVALS:
+                return Response(
+                    {"error": f"Unsupported frequency '{frequency}', use one of: {', '.join(RECURRENCE_WEEK_INTERVALS)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             start_time = datetime.strptime(recurring_data['startTime'], '%H:%M').time()
             end_time = datetime.strptime(recurring_data['endTime'], '%H:%M').time()
 
-            # Generate all dates between start and end that match the days of week
-            current_date = start_date
-            recurring_dates = []
-            week_count = 0
+            max_occurrences = recurring_data.get('maxOccurrences')
+            if max_occurrences is not None:
+                try:
+                    max_occurrences = int(max_occurrences)
+                except (TypeError, ValueError):
+                    return Response(
+                        {"error": "maxOccurrences must be a whole number"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
 
-            while current_date <= end_date:
-                # Check if this date's day of week is selected
-                if current_date.weekday() in days_of_week:
-                    # For bi-weekly, only include if it's an even week number
-                    if frequency == 'bi-weekly' and week_count % 2 != 0:
-                        current_date += timedelta(days=1)
-                        continue
+            # Occurrence windows straight from the recurrence rule, priced together below
+            windows = [
+                {'start_date': date_obj, 'end_date': date_obj, 'start_time': start_time, 'end_time': end_time}
+                for date_obj in iter_recurring_dates(start_date, end_date, days_of_week, frequency, max_occurrences)
+            ]
 
-                    recurring_dates.append(current_date)
+            series_rates = calculate_series_rates(windows, service, num_pets, rate_card)
+            if series_rates is None:
+                logger.error(f"MBA5asdt3f4321 - Failed to calculate rates for {len(windows)} recurring dates")
+                return Response(
+                    {"error": "Error processing recurring date: Failed to calculate rates"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-                current_date += timedelta(days=1)
-                if current_date.weekday() == 0:  # Monday
-                    week_count += 1
+            # The client's time settings are the same for every occurrence, read them once
+            time_user_id = draft.booking.client.user.id if draft.booking else None
+            time_settings = get_user_time_settings(time_user_id)
 
             # Process each recurring date
             processed_occurrences = []
-            for date_obj in recurring_dates:
-                try:
-                    # Create temporary occurrence for rate calculation
-                    class TempOccurrence:
-                        def __init__(self, start_date, end_date, start_time, end_time):
-                            self.start_date = start_date
-                            self.end_date = end_date
-                            self.start_time = start_time
-                            self.end_time = end_time
-
-                    temp_occurrence = TempOccurrence(
-                        start_date=date_obj,
-                        end_date=date_obj,
-                        start_time=start_time,
-                        end_time=end_time
-                    )
-
-                    # Calculate rates
-                    rate_data = calculate_occurrence_rates(temp_occurrence, service, num_pets)
-                    if not rate_data:
-                        raise Exception(f"Failed to calculate rates for date {date_obj}")
-
-                    # Get formatted times
-                    formatted_times = get_formatted_times(
-                        occurrence=temp_occurrence,
-                        user_id=draft.booking.client.user.id if draft.booking else None
-                    )
-
-                    # Create occurrence data
-                    occurrence = OrderedDict([
-                        ('occurrence_id', f"draft_{int(datetime.now().timestamp() * 1000)}_{str(uuid.uuid4())[:8]}"),
-                        ('start_date', date_obj.isoformat()),
-                        ('end_date', date_obj.isoformat()),
-                        ('start_time', start_time.strftime('%H:%M')),
-                        ('end_time', end_time.strftime('%H:%M')),
-                        ('calculated_cost', rate_data['calculated_cost']),
-                        ('base_total', rate_data['base_total']),
-                        ('multiple', rate_data['multiple']),
-                        ('rates', rate_data['rates']),
-                        ('formatted_start', formatted_times['formatted_start']),
-                        ('formatted_end', formatted_times['formatted_end']),
-                        ('duration', formatted_times['duration']),
-                        ('timezone', formatted_times['timezone'])
-                    ])
+            for window, rate_data in zip(windows, series_rates):
+                formatted_times = get_formatted_times(
+                    occurrence=SimpleNamespace(**window),
+                    user_id=time_user_id,
+                    time_settings=time_settings
+                )
 
-                    processed_occurrences.append(occurrence)
+                # Create occurrence data
+                occurrence = OrderedDict([
+                    ('occurrence_id', f"draft_{int(datetime.now().timestamp() * 1000)}_{str(uuid.uuid4())[:8]}"),
+                    ('start_date', window['start_date'].isoformat()),
+                    ('end_date', window['end_date'].isoformat()),
+                    ('start_time', start_time.strftime('%H:%M')),
+                    ('end_time', end_time.strftime('%H:%M')),
+                    ('calculated_cost', rate_data['calculated_cost']),
+                    ('base_total', rate_data['base_total']),
+                    ('multiple', rate_data['multiple']),
+                    ('rates', rate_data['rates']),
+                    ('formatted_start', formatted_times['formatted_start']),
+                    ('formatted_end', formatted_times['formatted_end']),
+                    ('duration', formatted_times['duration']),
+                    ('timezone', formatted_times['timezone'])
+                ])
 
-                except Exception as e:
-                    logger.error(f"MBA5asdt3f4321 - Error processing recurring date: {str(e)}")
-                    return Response(
-                        {"error": f"Error processing recurring date: {str(e)}"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+                processed_occurrences.append(occurrence)
 
             # Calculate subtotal from all occurrences
             subtotal = Decimal('0')
@@ -97,27 +97,12 @@ class BookingOccurrenceRate(models.Model):
 @receiver([post_save], sender=BookingOccurrenceRate)
 def update_occurrence_calculated_cost(sender, instance, created, **kwargs):
     """
-    Signal handler to update the BookingOccurrence calculated cost when rates change
+    Signal handler to update the BookingOccurrence calculated cost when rates change.
+    The cost is recomputed once per transaction, see booking_summary.recalculation.
     """
+    from booking_summary.recalculation import mark_occurrence_dirty
     occurrence = instance.occurrence
-    
-    # Get the total from occurrence rates
-    occurrence_rates_total = instance.get_total()
-    
-    # Get the calculated cost from booking details
-    booking_details_cost = Decimal('0.00')
-    booking_details = occurrence.booking_details.first()
-    if booking_details:
-        booking_details_cost = booking_details.calculate_occurrence_cost(is_prorated=True)
-    
-    # Log the values
-    logger.info(f"Updating occurrence {occurrence.occurrence_id} calculated cost:")
-    logger.info(f"Booking details cost: ${booking_details_cost}")
-    logger.info(f"Occurrence rates total: ${occurrence_rates_total}")
-    logger.info(f"Total: ${booking_details_cost + occurrence_rates_total}")
-    
-    # Update the occurrence's calculated cost
-    occurrence.update_calculated_cost()
+    mark_occurrence_dirty(occurrence.occurrence_id, occurrence.booking_id)
 
 # @receiver(post_save, sender='booking_occurrences.BookingOccurrence')
 # def create_occurrence_rates(sender, instance, created, **kwargs):
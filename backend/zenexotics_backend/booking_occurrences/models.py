@@ -4,6 +4,7 @@ from datetime import datetime, time
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from core.time_utils import convert_to_utc, convert_from_utc, format_datetime_for_user, get_formatted_times, format_booking_occurrence
+from core.pricing import UNIT_HOURS, get_unit_multiple
 import logging
 import pytz
 
@@ -121,18 +122,10 @@ class BookingOccurrence(models.Model):
                 
                 duration_hours = (end_datetime - start_datetime).total_seconds() / 3600
                 
-                if service.unit_of_time == 'PER_DAY':
-                    multiple = duration_hours / 24
-                elif service.unit_of_time == 'WEEK':
-                    multiple = duration_hours / (24 * 7)
-                elif service.unit_of_time == '1_HOUR':
-                    multiple = duration_hours
-                elif service.unit_of_time == '30_MIN':
-                    multiple = duration_hours * 2
-                elif service.unit_of_time == '15_MIN':
-                    multiple = duration_hours * 4
-                else:
+                # Per Visit and unknown units have no time-based multiple
+                if UNIT_HOURS.get(service.unit_of_time) is None:
                     return None
+                multiple = get_unit_multiple(service.unit_of_time, duration_hours)
                 
                 if is_prorated:
                     return Decimal(str(multiple)).quantize(Decimal('0.001'))
@@ -171,7 +164,7 @@ class BookingOccurrence(models.Model):
             # Get the calculated cost from booking details
             booking_details = self.booking_details.first()
             if booking_details:
-                total += booking_details.calculate_occurrence_cost(is_prorated=True)
+                total += booking_details.calculate_occurrence_cost(multiple=booking_details.multiple)
             
             # Add the total from occurrence rates
             if hasattr(self, 'rates'):
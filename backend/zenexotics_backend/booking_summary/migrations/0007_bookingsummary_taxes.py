@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:52
+
+from decimal import Decimal
+from django.db import migrations, models
+from core.tax_utils import calculate_taxes
+
+
+def backfill_taxes(apps, schema_editor):
+    BookingSummary = apps.get_model('booking_summary', 'BookingSummary')
+
+    # Historical models don't run BookingSummary.save(), so compute the taxes here
+    summaries = list(BookingSummary.objects.select_related('booking__professional__user'))
+    for summary in summaries:
+        try:
+            summary.taxes = calculate_taxes(
+                subtotal=summary.subtotal,
+                platform_fee=summary.client_platform_fee,
+                user=summary.booking.professional.user
+            )
+        except Exception:
+            summary.taxes = (summary.subtotal * summary.tax_percentage / Decimal('100.00')).quantize(Decimal('0.01'))
+    BookingSummary.objects.bulk_update(summaries, ['taxes'], batch_size=500)
+
+
+def reverse_backfill_taxes(apps, schema_editor):
+    # Column is dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking_summary', '0006_remove_bookingsummary_fee_percentage_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookingsummary',
+            name='taxes',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Taxes on subtotal and client fee, recalculated on save when either changes', max_digits=10),
+        ),
+        migrations.RunPython(backfill_taxes, reverse_backfill_taxes),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Sum
 from decimal import Decimal
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -41,6 +42,12 @@ class BookingSummary(models.Model):
         help_text="Tax percentage (e.g., 8.00 for 8%)",
         default=8.00
     )
+    taxes = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Taxes on subtotal and client fee, recalculated on save when either changes"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -71,28 +78,29 @@ class BookingSummary(models.Model):
         """Calculate the total including subtotal, fee, and tax"""
         return (self.subtotal + self.client_platform_fee + self.taxes).quantize(Decimal('0.01'))
 
+    def calculate_subtotal(self):
+        """Sum of all occurrence calculated costs, added up by the database"""
+        from booking_occurrences.models import BookingOccurrence
+
+        total = BookingOccurrence.objects.filter(booking_id=self.booking_id).aggregate(
+            total=Sum('calculated_cost')
+        )['total'] or Decimal('0.00')
+        return total.quantize(Decimal('0.01'))
+
     def update_subtotal(self):
         """Update the subtotal by summing all occurrence calculated costs"""
-        from booking_occurrences.models import BookingOccurrence
-        
-        total = Decimal('0.00')
-        occurrences = BookingOccurrence.objects.filter(booking=self.booking)
-        
-        for occurrence in occurrences:
-            total += occurrence.calculated_cost
-        
+        total = self.calculate_subtotal()
         if self.subtotal != total:
-            self.subtotal = total.quantize(Decimal('0.01'))
+            self.subtotal = total
             self.save()
-            logger.info(f"Updated booking {self.booking.booking_id} summary subtotal to: ${self.subtotal}")
+            logger.info(f"Updated booking {self.booking_id} summary subtotal to: ${self.subtotal}")
 
     @property
     def platform_fee(self):
         """Calculate total platform fee (client fee)"""
         return self.client_platform_fee
 
-    @property
-    def taxes(self):
+    def compute_taxes(self):
         """
         Calculate taxes based on the professional's state and tax rules.
         Uses the core.tax_utils functions to determine the correct tax amount.
@@ -108,18 +116,28 @@ class BookingSummary(models.Model):
                 user=professional.user
             )
             
-            logger.info(f"Calculated taxes for booking {self.booking.booking_id}: ${tax_amount}")
+            logger.info(f"Calculated taxes for booking {self.booking_id}: ${tax_amount}")
             return tax_amount
         except Exception as e:
             logger.error(f"Error calculating taxes: {str(e)}")
             # Fallback to legacy calculation
             return self.calculate_tax()
 
+    def save(self, *args, **kwargs):
+        """Store taxes whenever the amounts they depend on changed since they were last computed"""
+        tax_inputs = (self.subtotal, self.client_platform_fee)
+        if tax_inputs != getattr(self, '_tax_inputs', None):
+            self.taxes = self.compute_taxes()
+            self._tax_inputs = tax_inputs
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'taxes' not in update_fields:
+                kwargs['update_fields'] = list(update_fields) + ['taxes']
+        super().save(*args, **kwargs)
+
     @property
     def total_client_cost(self):
         """Calculate total cost for the client including fees and taxes"""
-        taxes = self.taxes
-        return (self.subtotal + self.client_platform_fee + taxes).quantize(Decimal('0.01'))
+        return (self.subtotal + self.client_platform_fee + self.taxes).quantize(Decimal('0.01'))
 
     @property
     def total_sitter_payout(self):
@@ -127,13 +145,13 @@ class BookingSummary(models.Model):
         return (self.subtotal - self.pro_platform_fee).quantize(Decimal('0.01'))
 
 @receiver([post_save], sender='booking_occurrences.BookingOccurrence')
-def update_booking_summary(sender, instance, **kwargs):
+def update_booking_summary(sender, instance, update_fields=None, **kwargs):
     """
-    Signal handler to update the booking summary when an occurrence's calculated cost changes
+    Signal handler to update the booking summary when an occurrence's calculated cost changes.
+    The summary is recalculated once per transaction, see booking_summary.recalculation.
     """
-    try:
-        # Use the centralized service to update the booking summary
-        from .services import BookingSummaryService
-        BookingSummaryService.recalculate_from_occurrence_change(instance.booking)
-    except Exception as e:
-        logger.error(f"Error updating booking summary for occurrence {instance.occurrence_id}: {str(e)}")
+    from .recalculation import discard_occurrence, mark_booking_dirty
+    if update_fields and 'calculated_cost' in update_fields:
+        # Explicitly written cost, keep it rather than recomputing from details at commit
+        discard_occurrence(instance.occurrence_id)
+    mark_booking_dirty(instance.booking_id)
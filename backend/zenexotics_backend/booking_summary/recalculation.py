@@ -0,0 +1,129 @@
+"""
+Coalesced booking cost recalculation.
+
+Saving occurrences, BookingDetails and BookingOccurrenceRates used to recompute
+the occurrence cost and the whole BookingSummary from inside each post_save
+signal, so building an N-occurrence booking cost O(N²) queries. The signals now
+only mark what changed; the work runs once per transaction in
+transaction.on_commit (immediately when not in a transaction):
+
+    * occurrences whose details/rates changed get calculated_cost recomputed
+      in one batch
+    * every touched booking gets its summary recalculated exactly once
+
+Costs read later in the same transaction are only current after
+recalculate_pending_bookings(), which BookingSummaryService calls before it
+writes a summary. Marks made in a transaction (or savepoint) that rolls back
+are dropped with it, see core.commit_batches.
+
+An explicit occurrence.save(update_fields=[..., 'calculated_cost']) wins over a
+pending recompute of that occurrence, same as it did when it ran last.
+
+Bulk writers that compute costs and the summary themselves can wrap their work
+in recalculation_suppressed() so nothing they touch gets queued.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db.models import Prefetch
+
+from core.commit_batches import CommitBatches
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+@contextmanager
+def recalculation_suppressed():
+    """Ignore dirty marks made inside the block (nestable)"""
+    _state.suppressed = getattr(_state, 'suppressed', 0) + 1
+    try:
+        yield
+    finally:
+        _state.suppressed -= 1
+
+
+def is_recalculation_suppressed():
+    return bool(getattr(_state, 'suppressed', 0))
+
+
+def mark_booking_dirty(booking_id):
+    """Recalculate this booking's summary when the current transaction commits"""
+    if booking_id is None or is_recalculation_suppressed():
+        return
+    _pending.add(booking_ids=booking_id)
+
+
+def mark_occurrence_dirty(occurrence_id, booking_id):
+    """Recompute this occurrence's calculated_cost (and its booking's summary) on commit"""
+    if occurrence_id is None or is_recalculation_suppressed():
+        return
+    _pending.add(occurrence_ids=occurrence_id, booking_ids=booking_id)
+
+
+def discard_occurrence(occurrence_id):
+    """The occurrence's calculated_cost was just written explicitly, don't overwrite it"""
+    _pending.discard('occurrence_ids', occurrence_id)
+
+
+def _recalculate_occurrence_costs(occurrence_ids):
+    from booking_details.models import BookingDetails
+    from booking_occurrences.models import BookingOccurrence
+
+    occurrences = list(
+        BookingOccurrence.objects.filter(occurrence_id__in=occurrence_ids)
+        .select_related('rates')
+        .prefetch_related(Prefetch('booking_details', queryset=BookingDetails.objects.order_by('detail_id')))
+    )
+
+    changed = []
+    for occurrence in occurrences:
+        total = Decimal('0.00')
+        booking_details = occurrence.booking_details.all()
+        if booking_details:
+            total += booking_details[0].calculate_occurrence_cost(multiple=booking_details[0].multiple)
+        if hasattr(occurrence, 'rates'):
+            total += occurrence.rates.get_total()
+
+        total = total.quantize(Decimal('0.01'))
+        if occurrence.calculated_cost != total:
+            occurrence.calculated_cost = total
+            changed.append(occurrence)
+
+    # bulk_update doesn't send post_save, so this doesn't mark anything dirty again
+    if changed:
+        BookingOccurrence.objects.bulk_update(changed, ['calculated_cost'])
+    return len(changed)
+
+
+def _recalculate(booking_ids, occurrence_ids):
+    """Recompute the given occurrences' costs, then the given bookings' summaries"""
+    from bookings.models import Booking
+    from .services import BookingSummaryService
+
+    if occurrence_ids:
+        try:
+            _recalculate_occurrence_costs(occurrence_ids)
+        except Exception as e:
+            logger.error(f"Error recalculating costs for occurrences {sorted(occurrence_ids)}: {str(e)}")
+
+    for booking in Booking.objects.filter(booking_id__in=booking_ids):
+        try:
+            BookingSummaryService.recalculate_from_occurrence_change(booking)
+        except Exception as e:
+            logger.error(f"Error updating booking summary for booking {booking.booking_id}: {str(e)}")
+
+
+_pending = CommitBatches(_recalculate, 'booking_ids', 'occurrence_ids')
+
+
+def recalculate_pending_bookings():
+    """
+    Apply all pending recalculations now. Runs automatically on commit; call it directly
+    before reading costs or writing summary values later in the same transaction.
+    """
+    _pending.flush_now()
@@ -2,6 +2,7 @@ from decimal import Decimal
 from django.conf import settings
 import logging
 from core.tax_utils import calculate_taxes
+from .recalculation import recalculate_pending_bookings
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,9 @@ class BookingSummaryService:
         """
         from .models import BookingSummary
         
+        # Apply pending recalculations now, otherwise they'd run at commit and could overwrite the values set here
+        recalculate_pending_bookings()
+        
         # Set default values
         defaults = {
             'client_platform_fee_percentage': kwargs.get('client_platform_fee_percentage', DEFAULT_CLIENT_PLATFORM_FEE_PERCENTAGE),
@@ -50,31 +54,26 @@ class BookingSummaryService:
         if 'pro_platform_fee' in kwargs:
             defaults['pro_platform_fee'] = Decimal(str(kwargs['pro_platform_fee']))
         
-        # Create or update the summary
-        summary, created = BookingSummary.objects.get_or_create(
-            booking=booking,
-            defaults=defaults
-        )
-        
-        # If updating an existing summary, update the fields
-        if not created:
-            for key, value in defaults.items():
-                setattr(summary, key, value)
-            summary.save()
+        # Create or update the summary; everything is set in memory and written with a single save
+        summary = BookingSummary.objects.filter(booking=booking).first()
+        created = summary is None
+        if created:
+            summary = BookingSummary(booking=booking)
+        for key, value in defaults.items():
+            setattr(summary, key, value)
         
         # Update the subtotal based on occurrences
-        summary.update_subtotal()
+        summary.subtotal = summary.calculate_subtotal()
         
         # Update platform fees if not explicitly set
         if 'client_platform_fee' not in kwargs and summary.client_platform_fee == Decimal('0.00'):
-            client_fee = (summary.subtotal * summary.client_platform_fee_percentage / Decimal('100.00')).quantize(Decimal('0.01'))
-            summary.client_platform_fee = client_fee
-            summary.save(update_fields=['client_platform_fee'])
+            summary.client_platform_fee = summary.calculate_client_fee()
         
         if 'pro_platform_fee' not in kwargs and summary.pro_platform_fee == Decimal('0.00'):
-            pro_fee = (summary.subtotal * summary.pro_platform_fee_percentage / Decimal('100.00')).quantize(Decimal('0.01'))
-            summary.pro_platform_fee = pro_fee
-            summary.save(update_fields=['pro_platform_fee'])
+            summary.pro_platform_fee = summary.calculate_pro_fee()
+        
+        # Taxes are recomputed once here, see BookingSummary.save
+        summary.save()
         
         logger.info(f"{'Created' if created else 'Updated'} BookingSummary for booking {booking.booking_id}")
         
@@ -112,8 +111,8 @@ class BookingSummaryService:
         summary = BookingSummaryService.create_or_update_from_booking(booking, **kwargs)
         
         # Calculate or validate taxes
-        # This is already handled by the taxes property in BookingSummary model
-        # which uses the core.tax_utils.calculate_taxes function
+        # Taxes are stored by BookingSummary.save (compute_taxes, which uses
+        # the core.tax_utils.calculate_taxes function)
         
         return summary
     
@@ -132,26 +131,25 @@ class BookingSummaryService:
         from .models import BookingSummary
         
         # Get or create summary with default values
-        summary, created = BookingSummary.objects.get_or_create(
-            booking=booking,
-            defaults={
-                'client_platform_fee_percentage': DEFAULT_CLIENT_PLATFORM_FEE_PERCENTAGE,
-                'pro_platform_fee_percentage': DEFAULT_PRO_PLATFORM_FEE_PERCENTAGE,
-                'tax_percentage': DEFAULT_TAX_PERCENTAGE,
-            }
-        )
+        summary = BookingSummary.objects.filter(booking=booking).first()
+        created = summary is None
+        if created:
+            summary = BookingSummary(
+                booking=booking,
+                client_platform_fee_percentage=DEFAULT_CLIENT_PLATFORM_FEE_PERCENTAGE,
+                pro_platform_fee_percentage=DEFAULT_PRO_PLATFORM_FEE_PERCENTAGE,
+                tax_percentage=DEFAULT_TAX_PERCENTAGE,
+            )
         
         # Update the subtotal
-        summary.update_subtotal()
+        summary.subtotal = summary.calculate_subtotal()
         
         # Update platform fees based on the new subtotal
         if created or summary.client_platform_fee == Decimal('0.00'):
-            client_fee = (summary.subtotal * summary.client_platform_fee_percentage / Decimal('100.00')).quantize(Decimal('0.01'))
-            summary.client_platform_fee = client_fee
+            summary.client_platform_fee = summary.calculate_client_fee()
         
         if created or summary.pro_platform_fee == Decimal('0.00'):
-            pro_fee = (summary.subtotal * summary.pro_platform_fee_percentage / Decimal('100.00')).quantize(Decimal('0.01'))
-            summary.pro_platform_fee = pro_fee
+            summary.pro_platform_fee = summary.calculate_pro_fee()
         
         summary.save()
         
@@ -1,3 +1,73 @@
-from django.test import TestCase
+from django.db import transaction
+from django.test import TransactionTestCase
 
-# Create your tests here.
+from core.commit_batches import CommitBatches
+
+
+class CommitBatchesTests(TransactionTestCase):
+    def setUp(self):
+        self.flushed = []
+        self.batches = CommitBatches(lambda **sets: self.flushed.append(sets), 'booking_ids', 'occurrence_ids')
+
+    def test_rolled_back_savepoint_marks_are_dropped(self):
+        with transaction.atomic():
+            self.batches.add(booking_ids=1, occurrence_ids=10)
+            self.batches.add(booking_ids=2)
+            try:
+                with transaction.atomic():
+                    self.batches.add(booking_ids=3, occurrence_ids=30)
+                    raise ValueError
+            except ValueError:
+                pass
+            with transaction.atomic():
+                self.batches.add(booking_ids=5)
+            self.batches.add(booking_ids=4, occurrence_ids=None)
+            self.assertEqual(self.flushed, [])
+
+        flushed = {'booking_ids': set(), 'occurrence_ids': set()}
+        for sets in self.flushed:
+            for name, ids in sets.items():
+                flushed[name] |= ids
+        self.assertEqual(flushed, {'booking_ids': {1, 2, 4, 5}, 'occurrence_ids': {10}})
+
+    def test_rolled_back_transaction_flushes_nothing(self):
+        try:
+            with transaction.atomic():
+                self.batches.add(booking_ids=1)
+                raise ValueError
+        except ValueError:
+            pass
+        with transaction.atomic():
+            self.batches.add(booking_ids=2)
+
+        self.assertEqual(self.flushed, [{'booking_ids': {2}, 'occurrence_ids': set()}])
+
+    def test_one_flush_per_transaction(self):
+        with transaction.atomic():
+            for booking_id in (1, 2, 1):
+                self.batches.add(booking_ids=booking_id)
+        with transaction.atomic():
+            self.batches.add(occurrence_ids=7)
+
+        self.assertEqual(self.flushed, [
+            {'booking_ids': {1, 2}, 'occurrence_ids': set()},
+            {'booking_ids': set(), 'occurrence_ids': {7}},
+        ])
+
+    def test_outside_a_transaction_runs_right_away(self):
+        self.batches.add(booking_ids=1)
+        self.assertEqual(self.flushed, [{'booking_ids': {1}, 'occurrence_ids': set()}])
+        self.batches.add(booking_ids=None)
+        self.assertEqual(len(self.flushed), 1)
+
+    def test_discard_and_flush_now(self):
+        with transaction.atomic():
+            self.batches.add(booking_ids=1, occurrence_ids=10)
+            with transaction.atomic():
+                self.batches.add(booking_ids=3, occurrence_ids=10)
+                self.batches.discard('occurrence_ids', 10)
+                self.batches.flush_now()
+            self.assertEqual(self.flushed, [{'booking_ids': {1, 3}, 'occurrence_ids': set()}])
+            self.batches.add(booking_ids=2)
+
+        self.assertEqual(self.flushed[1:], [{'booking_ids': {2}, 'occurrence_ids': set()}])
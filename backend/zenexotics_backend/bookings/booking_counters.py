@@ -0,0 +1,128 @@
+"""
+Maintains MonthlyBookingCount: how many bookings each user created per month,
+once as client and once as professional.
+
+The platform fee rules only need "has this user booked this month", which
+used to be a COUNT over the bookings table per fee calculation. Each booking
+create/delete now bumps its client's and professional's counter for the
+month it was created in, and fee lookups read the counter by key.
+rebuild_monthly_booking_counts() recomputes them from the bookings table for
+backfills, bulk inserts and repairs.
+
+Status changes don't move the counters: the fee rule counts every booking
+created in the month, whatever its status.
+"""
+
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Booking, MonthlyBookingCount
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(moment=None):
+    """First day of the (local) month containing moment, default now"""
+    return timezone.localdate(moment).replace(day=1)
+
+
+def _booking_counter_keys(booking):
+    """(user_id, role) pairs a booking counts toward"""
+    keys = []
+    client = getattr(booking, 'client', None)
+    if client is not None:
+        keys.append((client.user_id, MonthlyBookingCount.CLIENT))
+    professional = getattr(booking, 'professional', None)
+    if professional is not None:
+        keys.append((professional.user_id, MonthlyBookingCount.PROFESSIONAL))
+    return keys
+
+
+def _apply_count_delta(user_id, role, month, delta):
+    counters = MonthlyBookingCount.objects.filter(user_id=user_id, role=role, month=month)
+    if delta < 0:
+        counters.filter(booking_count__gte=-delta).update(booking_count=F('booking_count') + delta)
+        return
+    if counters.update(booking_count=F('booking_count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            MonthlyBookingCount.objects.create(user_id=user_id, role=role, month=month, booking_count=delta)
+    except IntegrityError:
+        # Someone else created this month's row since we looked
+        counters.update(booking_count=F('booking_count') + delta)
+
+
+def apply_booking_created(booking):
+    month = month_start(booking.created_at)
+    for user_id, role in _booking_counter_keys(booking):
+        _apply_count_delta(user_id, role, month, 1)
+
+
+def apply_booking_deleted(booking):
+    month = month_start(booking.created_at)
+    for user_id, role in _booking_counter_keys(booking):
+        _apply_count_delta(user_id, role, month, -1)
+
+
+def get_monthly_booking_counts(user_ids, role, month=None):
+    """
+    Bookings created this month (or in month) by each user in one role, in one query.
+
+    Returns:
+        dict: user_id -> count, 0 for users without bookings
+    """
+    user_ids = list(user_ids)
+    counts = dict.fromkeys(user_ids, 0)
+    if not user_ids:
+        return counts
+    counts.update(
+        MonthlyBookingCount.objects.filter(
+            user_id__in=user_ids, role=role, month=month or month_start()
+        ).values_list('user_id', 'booking_count')
+    )
+    return counts
+
+
+def rebuild_monthly_booking_counts(user_ids=None):
+    """
+    Recompute the counters from the bookings table, one aggregate per role.
+
+    Args:
+        user_ids: Only rebuild these users (default: all)
+
+    Returns:
+        int: Number of counter rows written
+    """
+    counters = []
+    for role, user_field in (
+        (MonthlyBookingCount.CLIENT, 'client__user_id'),
+        (MonthlyBookingCount.PROFESSIONAL, 'professional__user_id'),
+    ):
+        bookings = Booking.objects.order_by()
+        if user_ids is not None:
+            bookings = bookings.filter(**{f'{user_field}__in': user_ids})
+        rows = bookings.annotate(month=TruncMonth('created_at')).values_list(user_field, 'month').annotate(
+            booking_count=Count('booking_id')
+        )
+        for user_id, month, booking_count in rows:
+            counters.append(MonthlyBookingCount(
+                user_id=user_id,
+                role=role,
+                month=timezone.localdate(month),
+                booking_count=booking_count
+            ))
+
+    with transaction.atomic():
+        existing = MonthlyBookingCount.objects.all()
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+        existing.delete()
+        MonthlyBookingCount.objects.bulk_create(counters, batch_size=1000)
+
+    logger.info(f"Rebuilt {len(counters)} monthly booking counters")
+    return len(counters)
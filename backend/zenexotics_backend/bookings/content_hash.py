@@ -0,0 +1,230 @@
+"""
+Canonical content hashes for bookings and booking drafts.
+
+has_changes_from_original used to re-query a booking's pets, occurrences,
+details and rates and compare them with the draft field by field. Both sides
+are now reduced to the same canonical state (service, pets, and per
+occurrence its window and rates, with amounts and times normalized and lists
+sorted) and hashed. The booking's hash is stored on Booking.content_hash and
+recomputed when a transaction that changed the booking commits, so checking a
+draft is one hash of the draft compared with a stored string. diff_states()
+gives the detailed differences when the UI actually needs them.
+
+Writers that bypass signals (bulk_create/bulk_update) call
+mark_booking_content_dirty themselves. Marks made in a transaction that rolls
+back are dropped with it (core.commit_batches). A booking whose hash was never
+stored gets it computed the first time it's asked for.
+"""
+
+import hashlib
+import json
+import logging
+from collections import Counter, OrderedDict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Prefetch
+
+from core.commit_batches import CommitBatches
+
+logger = logging.getLogger(__name__)
+
+# Rate rows that mirror BookingDetails fields rather than being extra charges
+BUILT_IN_RATE_TITLES = ('Base Rate', 'Additional Animal Rate', 'Holiday Rate')
+
+def _money(value):
+    if value is None:
+        return None
+    try:
+        return str(Decimal(str(value).replace('$', '').strip()).quantize(Decimal('0.01')))
+    except (InvalidOperation, ValueError):
+        return str(value)
+
+
+def _int(value):
+    try:
+        return int(str(value))
+    except (TypeError, ValueError):
+        return value
+
+
+def _time(value):
+    if value is None:
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%H:%M')
+    for time_format in ('%H:%M', '%I:%M %p', '%H:%M:%S'):
+        try:
+            return datetime.strptime(value, time_format).strftime('%H:%M')
+        except ValueError:
+            continue
+    return value
+
+
+def _date(value):
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _additional_rates(rates):
+    return sorted(
+        [rate.get('title') or rate.get('name') or '', _money(rate.get('amount'))]
+        for rate in rates or []
+        if rate.get('title') not in BUILT_IN_RATE_TITLES
+    )
+
+
+def _sorted(items):
+    return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+
+
+def _state_dict(service, pets, occurrences):
+    return OrderedDict([
+        ('service', service),
+        ('pets', _sorted(pets)),
+        ('occurrences', _sorted(occurrences)),
+    ])
+
+
+def booking_state(booking):
+    """Canonical state of a saved booking"""
+    from booking_details.models import BookingDetails
+    from booking_occurrences.models import BookingOccurrence
+
+    pets = [
+        [bp.pet.pet_id, bp.pet.name, bp.pet.species, bp.pet.breed]
+        for bp in booking.booking_pets.select_related('pet')
+    ]
+
+    occurrences = []
+    for occurrence in (
+        BookingOccurrence.objects.filter(booking=booking)
+        .select_related('rates')
+        .prefetch_related(Prefetch('booking_details', queryset=BookingDetails.objects.order_by('detail_id')))
+    ):
+        booking_details = occurrence.booking_details.all()
+        details = booking_details[0] if booking_details else None
+        occurrence_rates = occurrence.rates if hasattr(occurrence, 'rates') else None
+        occurrences.append([
+            _date(occurrence.start_date),
+            _date(occurrence.end_date),
+            _time(occurrence.start_time),
+            _time(occurrence.end_time),
+            _money(details.base_rate) if details else None,
+            _money(details.additional_pet_rate) if details else None,
+            _int(details.applies_after) if details else None,
+            _money(details.holiday_rate) if details else None,
+            details.unit_of_time if details else None,
+            _additional_rates(occurrence_rates.rates if occurrence_rates else []),
+        ])
+
+    service = booking.service_id.service_name if booking.service_id else None
+    return _state_dict(service, pets, occurrences)
+
+
+def draft_state(draft_data):
+    """Canonical state of BookingDraft.draft_data, comparable with booking_state"""
+    draft_data = draft_data or {}
+    pets = [
+        [pet.get('pet_id'), pet.get('name'), pet.get('species'), pet.get('breed')]
+        for pet in draft_data.get('pets', [])
+    ]
+
+    occurrences = []
+    for occurrence in draft_data.get('occurrences', []):
+        rates = occurrence.get('rates') or {}
+        occurrences.append([
+            _date(occurrence.get('start_date')),
+            _date(occurrence.get('end_date')),
+            _time(occurrence.get('start_time')),
+            _time(occurrence.get('end_time')),
+            _money(rates.get('base_rate')),
+            _money(rates.get('additional_animal_rate')),
+            _int(rates.get('applies_after')),
+            _money(rates.get('holiday_rate')),
+            rates.get('unit_of_time') or occurrence.get('unit_of_time'),
+            _additional_rates(rates.get('additional_rates')),
+        ])
+
+    service = (draft_data.get('service_details') or {}).get('service_type')
+    return _state_dict(service, pets, occurrences)
+
+
+def state_hash(state):
+    """sha256 hex digest of a canonical state"""
+    canonical = json.dumps(state, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def draft_content_hash(draft_data):
+    return state_hash(draft_state(draft_data))
+
+
+def refresh_booking_content_hash(booking):
+    """Recompute and store a booking's content hash"""
+    from .models import Booking
+
+    content_hash = state_hash(booking_state(booking))
+    Booking.objects.filter(booking_id=booking.booking_id).update(content_hash=content_hash)
+    booking.content_hash = content_hash
+    return content_hash
+
+
+def get_booking_content_hash(booking):
+    """The booking's stored content hash, computing it if it was never stored"""
+    return booking.content_hash or refresh_booking_content_hash(booking)
+
+
+def diff_states(original, changed):
+    """
+    What differs between two canonical states.
+
+    Returns:
+        OrderedDict: Only the parts that differ; 'service' as {'from', 'to'},
+        'pets' and 'occurrences' as {'added': [...], 'removed': [...]}
+    """
+    diff = OrderedDict()
+    if original['service'] != changed['service']:
+        diff['service'] = {'from': original['service'], 'to': changed['service']}
+
+    for key in ('pets', 'occurrences'):
+        before = Counter(json.dumps(item) for item in original[key])
+        after = Counter(json.dumps(item) for item in changed[key])
+        added = [json.loads(item) for item in (after - before).elements()]
+        removed = [json.loads(item) for item in (before - after).elements()]
+        if added or removed:
+            diff[key] = {'added': _sorted(added), 'removed': _sorted(removed)}
+    return diff
+
+
+def _flush(booking_ids, occurrence_ids):
+    from booking_occurrences.models import BookingOccurrence
+    from .models import Booking
+
+    if occurrence_ids:
+        # Occurrences deleted since were marked through their own delete signal
+        booking_ids |= set(
+            BookingOccurrence.objects.filter(occurrence_id__in=occurrence_ids).values_list('booking_id', flat=True)
+        )
+
+    for booking in Booking.objects.filter(booking_id__in=booking_ids).select_related('service_id'):
+        try:
+            refresh_booking_content_hash(booking)
+        except Exception as e:
+            logger.error(f"Error refreshing content hash for booking {booking.booking_id}: {str(e)}")
+
+
+_pending = CommitBatches(_flush, 'booking_ids', 'occurrence_ids')
+
+
+def mark_booking_content_dirty(booking_id):
+    """Recompute this booking's content hash when the current transaction commits"""
+    _pending.add(booking_ids=booking_id)
+
+
+def mark_occurrence_content_dirty(occurrence_id):
+    """Like mark_booking_content_dirty, for the booking the occurrence belongs to"""
+    _pending.add(occurrence_ids=occurrence_id)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from bookings.booking_counters import rebuild_monthly_booking_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-month client/professional booking counters used for platform fees'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='Only rebuild this user (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_monthly_booking_counts(options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} monthly booking counters"))
@@ -0,0 +1,179 @@
+"""
+Bulk materialization of a booking draft into booking rows.
+
+CreateFromDraftView used to create each occurrence, its BookingDetails, its
+BookingOccurrenceRate and each BookingPets row one at a time, and every save
+ran the cost/summary signal cascade. Here every row is built in memory with
+its final values (costs and multiples come from the draft, detail rates are
+priced the way BookingDetails prices them) and written with one bulk_create
+per table. bulk_create sends no post_save, and recalculation_suppressed()
+keeps the remaining deletes from queueing work, so the caller computes the
+summary exactly once.
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from booking_details.models import BookingDetails
+from booking_occurrence_rates.models import BookingOccurrenceRate
+from booking_occurrences.models import BookingOccurrence
+from booking_pets.models import BookingPets
+from booking_summary.recalculation import recalculation_suppressed
+from .content_hash import mark_booking_content_dirty
+from availability.free_busy import mark_booking_availability_dirty
+from pets.models import Pet
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_amount(amount):
+    """'$25.23' / '25.23' / 25.23 -> Decimal, None if it can't be parsed"""
+    try:
+        return Decimal(str(amount).replace('$', '').strip())
+    except Exception:
+        return None
+
+
+def _parse_multiple(multiple):
+    """The draft's multiple as a Decimal (kept exact, e.g. 0.33 not 0.3), None if missing or invalid"""
+    if multiple is None:
+        return None
+    try:
+        multiple = Decimal(str(multiple))
+    except Exception:
+        return None
+    return multiple if multiple.is_finite() else None
+
+
+def _build_rows(booking, occurrence_data, pet_count, nights):
+    """Occurrence, details and rate rows for one draft occurrence, not saved yet"""
+    occurrence = BookingOccurrence(
+        booking=booking,
+        start_date=datetime.strptime(occurrence_data['start_date'], '%Y-%m-%d').date(),
+        end_date=datetime.strptime(occurrence_data['end_date'], '%Y-%m-%d').date(),
+        start_time=datetime.strptime(occurrence_data['start_time'], '%H:%M').time(),
+        end_time=datetime.strptime(occurrence_data['end_time'], '%H:%M').time(),
+        created_by='PROFESSIONAL',
+        last_modified_by='PROFESSIONAL',
+        status='PENDING'
+    )
+
+    rates = occurrence_data.get('rates', {})
+    # Try to get unit_of_time from either occurrence_data directly or from occurrence_data.rates
+    unit_of_time = occurrence_data.get('unit_of_time') or rates.get('unit_of_time') or 'Per Visit'
+
+    details = BookingDetails(
+        booking_occurrence=occurrence,
+        num_pets=pet_count,
+        base_rate=Decimal(str(rates.get('base_rate', 0))),
+        additional_pet_rate=Decimal(str(rates.get('additional_animal_rate', 0))),
+        applies_after=int(rates.get('applies_after', 1)),
+        holiday_rate=Decimal(str(rates.get('holiday_rate', 0))),
+        unit_of_time=unit_of_time,
+        nights=nights
+    )
+    # bulk_create skips BookingDetails.save(), which normally fills multiple and calculated_rate.
+    # Keep the multiple the draft was priced with; the rate follows core.pricing like every other cost.
+    details.refresh_calculated_rate(multiple=_parse_multiple(occurrence_data.get('multiple')))
+
+    occurrence_rate = None
+    additional_rates = rates.get('additional_rates', [])
+    if additional_rates:
+        occurrence_rate = BookingOccurrenceRate(
+            occurrence=occurrence,
+            rates=[
+                {
+                    'title': rate.get('title'),
+                    'amount': str(rate.get('amount')),
+                    'description': rate.get('description', 'Additional rate')
+                }
+                for rate in additional_rates
+            ]
+        )
+
+    # The draft's calculated_cost is what the client was shown, use it when present
+    draft_calculated_cost = occurrence_data.get('calculated_cost')
+    if draft_calculated_cost:
+        total_cost = Decimal(str(draft_calculated_cost))
+    else:
+        total_cost = details.calculated_rate
+        if occurrence_rate:
+            for rate in occurrence_rate.rates:
+                amount = _parse_amount(rate.get('amount', '0'))
+                if amount is None:
+                    logger.error(f"MBA66777 Error parsing amount '{rate.get('amount')}' for booking {booking.booking_id}")
+                    continue
+                total_cost += amount
+    occurrence.calculated_cost = total_cost.quantize(Decimal('0.01'))
+
+    return occurrence, details, occurrence_rate
+
+
+def materialize_draft(booking, draft_data, replaced_occurrences=()):
+    """
+    Write a draft's pets and occurrences (with details and rates) onto a booking.
+
+    Must run inside the caller's transaction. Doesn't touch the BookingSummary;
+    the caller computes it once afterwards (BookingSummaryService.create_or_update_from_draft).
+
+    Args:
+        booking: Saved Booking the draft belongs to
+        draft_data: BookingDraft.draft_data
+        replaced_occurrences: Existing occurrences to delete once the new ones exist
+
+    Returns:
+        list: Created occurrences as dicts for the approval message
+    """
+    pet_ids = [pet_data.get('pet_id') for pet_data in draft_data.get('pets', []) if pet_data.get('pet_id')]
+    nights = int(draft_data.get('nights', 0))
+
+    with recalculation_suppressed():
+        # Rebuild booking pets
+        BookingPets.objects.filter(booking=booking).delete()
+        pets = Pet.objects.in_bulk(pet_ids)
+        missing_pet_ids = [pet_id for pet_id in pet_ids if pet_id not in pets]
+        if missing_pet_ids:
+            raise Pet.DoesNotExist(f"Pets not found: {missing_pet_ids}")
+        BookingPets.objects.bulk_create([BookingPets(booking=booking, pet=pets[pet_id]) for pet_id in pet_ids])
+
+        rows = [
+            _build_rows(booking, occurrence_data, len(pet_ids), nights)
+            for occurrence_data in draft_data.get('occurrences', [])
+        ]
+
+        # Parents first so the children get their foreign keys
+        occurrences = BookingOccurrence.objects.bulk_create([occurrence for occurrence, _, _ in rows])
+        for occurrence, details, occurrence_rate in rows:
+            details.booking_occurrence = occurrence
+            if occurrence_rate:
+                occurrence_rate.occurrence = occurrence
+        BookingDetails.objects.bulk_create([details for _, details, _ in rows])
+        BookingOccurrenceRate.objects.bulk_create([
+            occurrence_rate for _, _, occurrence_rate in rows if occurrence_rate
+        ])
+
+        # Now it's safe to delete old occurrences since new ones are created
+        replaced_ids = [occurrence.occurrence_id for occurrence in replaced_occurrences]
+        if replaced_ids:
+            BookingOccurrence.objects.filter(occurrence_id__in=replaced_ids).delete()
+
+    # bulk_create sent no signals for the rows above
+    mark_booking_content_dirty(booking.booking_id)
+    mark_booking_availability_dirty(booking.booking_id)
+
+    logger.info(
+        f"MBA66777 Materialized {len(occurrences)} occurrences and {len(pet_ids)} pets for booking {booking.booking_id}"
+        f" (replaced {len(replaced_ids)} occurrences)"
+    )
+
+    return [
+        {
+            'occurrence_id': occurrence.occurrence_id,
+            'start_date': occurrence.start_date.strftime('%Y-%m-%d'),
+            'end_date': occurrence.end_date.strftime('%Y-%m-%d'),
+            'start_time': occurrence.start_time.strftime('%H:%M'),
+            'end_time': occurrence.end_time.strftime('%H:%M')
+        }
+        for occurrence in occurrences
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_add_notes_from_pro'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['professional', '-created_at', '-booking_id'], name='bookings_pro_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['client', '-created_at', '-booking_id'], name='bookings_client_created_idx'),
+        ),
+    ]
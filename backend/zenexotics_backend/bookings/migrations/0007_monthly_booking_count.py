@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:59
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill_monthly_booking_counts(apps, schema_editor):
+    Booking = apps.get_model('bookings', 'Booking')
+    MonthlyBookingCount = apps.get_model('bookings', 'MonthlyBookingCount')
+
+    counters = []
+    for role, user_field in (('client', 'client__user_id'), ('professional', 'professional__user_id')):
+        rows = Booking.objects.order_by().annotate(month=TruncMonth('created_at')).values_list(
+            user_field, 'month'
+        ).annotate(booking_count=Count('booking_id'))
+        for user_id, month, booking_count in rows:
+            counters.append(MonthlyBookingCount(
+                user_id=user_id,
+                role=role,
+                month=timezone.localdate(month),
+                booking_count=booking_count
+            ))
+    MonthlyBookingCount.objects.bulk_create(counters, batch_size=1000)
+
+
+def reverse_backfill_monthly_booking_counts(apps, schema_editor):
+    # Table is dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bookings', '0006_booking_list_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyBookingCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('client', 'Client'), ('professional', 'Professional')], max_length=20)),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_booking_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'bookings_monthly_booking_count',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlybookingcount',
+            constraint=models.UniqueConstraint(fields=('user', 'role', 'month'), name='bookings_monthly_count_unique'),
+        ),
+        migrations.RunPython(backfill_monthly_booking_counts, reverse_backfill_monthly_booking_counts),
+    ]
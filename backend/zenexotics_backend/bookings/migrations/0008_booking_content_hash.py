@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_monthly_booking_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text="Hash of the booking's service, pets and occurrences, see bookings.content_hash", max_length=64),
+        ),
+    ]
@@ -26,6 +26,12 @@ class Booking(models.Model):
     pro_agreed_tos = models.BooleanField(default=False)
     client_agreed_tos = models.BooleanField(default=False)
     notes_from_pro = models.TextField(blank=True, null=True, help_text="Notes from the professional to the client for this booking")
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="Hash of the booking's service, pets and occurrences, see bookings.content_hash"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -35,3 +41,35 @@ class Booking(models.Model):
     class Meta:
         db_table = 'bookings'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of each role's booking list
+            models.Index(fields=['professional', '-created_at', '-booking_id'], name='bookings_pro_created_idx'),
+            models.Index(fields=['client', '-created_at', '-booking_id'], name='bookings_client_created_idx'),
+        ]
+
+
+class MonthlyBookingCount(models.Model):
+    """
+    Bookings created per user, role and calendar month (local time), used for the
+    "first booking this month" platform fee rule. Maintained by bookings.booking_counters.
+    """
+    CLIENT = 'client'
+    PROFESSIONAL = 'professional'
+    ROLE_CHOICES = [
+        (CLIENT, 'Client'),
+        (PROFESSIONAL, 'Professional'),
+    ]
+
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='monthly_booking_counts')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    month = models.DateField(help_text="First day of the month")
+    booking_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} {self.role} {self.month:%Y-%m}: {self.booking_count}"
+
+    class Meta:
+        db_table = 'bookings_monthly_booking_count'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'role', 'month'], name='bookings_monthly_count_unique'),
+        ]
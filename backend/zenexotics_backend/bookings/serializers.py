@@ -45,11 +45,16 @@ class BookingListSerializer(serializers.ModelSerializer):
         return obj.service_id.service_name if obj.service_id else None
     
     def get_start_date(self, obj):
+        # Annotated by the booking list query, saves a query per booking
+        if hasattr(obj, 'first_start_date'):
+            return obj.first_start_date
         # Get the first occurrence for this booking
         first_occurrence = obj.occurrences.order_by('start_date', 'start_time').first()
         return first_occurrence.start_date if first_occurrence else None
     
     def get_start_time(self, obj):
+        if hasattr(obj, 'first_start_time'):
+            return obj.first_start_time
         # Get the first occurrence for this booking
         first_occurrence = obj.occurrences.order_by('start_date', 'start_time').first()
         return first_occurrence.start_time if first_occurrence else None
@@ -236,7 +241,7 @@ class BookingDetailSerializer(serializers.ModelSerializer):
             logger.info(f"  End Time: {raw_end_time}")
 
             # Get base_total from booking details calculated cost
-            base_total = booking_details.calculate_occurrence_cost(is_prorated)
+            base_total = booking_details.calculate_occurrence_cost(is_prorated, multiple=booking_details.multiple if is_prorated else None)
             logger.info(f"MBA8765 Base total: ${base_total}")
 
             # Get additional rates and their sum
@@ -324,7 +329,7 @@ class BookingDetailSerializer(serializers.ModelSerializer):
                 continue
 
             # Get base_total from booking details
-            base_total = booking_details.calculate_occurrence_cost(is_prorated)
+            base_total = booking_details.calculate_occurrence_cost(is_prorated, multiple=booking_details.multiple if is_prorated else None)
             logger.info(f"  Occurrence {occ.occurrence_id} base total: ${base_total}")
             subtotal += base_total
 
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Booking
+from .booking_counters import apply_booking_created, apply_booking_deleted
+from .content_hash import mark_booking_content_dirty, mark_occurrence_content_dirty
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Booking)
+def count_booking_on_create(sender, instance, created, **kwargs):
+    """Bump the client's and professional's monthly booking counters"""
+    if created:
+        apply_booking_created(instance)
+
+
+@receiver(post_delete, sender=Booking)
+def uncount_booking_on_delete(sender, instance, **kwargs):
+    apply_booking_deleted(instance)
+
+
+@receiver(post_save, sender=Booking)
+def refresh_content_hash_on_save(sender, instance, update_fields=None, **kwargs):
+    """The service is part of the content hash"""
+    if update_fields is None or 'service_id' in update_fields:
+        mark_booking_content_dirty(instance.booking_id)
+
+
+@receiver([post_save, post_delete], sender='booking_pets.BookingPets')
+def refresh_content_hash_for_pets(sender, instance, **kwargs):
+    mark_booking_content_dirty(instance.booking_id)
+
+
+@receiver([post_save, post_delete], sender='booking_occurrences.BookingOccurrence')
+def refresh_content_hash_for_occurrence(sender, instance, **kwargs):
+    mark_booking_content_dirty(instance.booking_id)
+
+
+@receiver([post_save, post_delete], sender='booking_details.BookingDetails')
+def refresh_content_hash_for_details(sender, instance, **kwargs):
+    mark_occurrence_content_dirty(instance.booking_occurrence_id)
+
+
+@receiver([post_save, post_delete], sender='booking_occurrence_rates.BookingOccurrenceRate')
+def refresh_content_hash_for_rates(sender, instance, **kwargs):
+    mark_occurrence_content_dirty(instance.occurrence_id)
+
+
+@receiver(post_save, sender='pets.Pet')
+def refresh_content_hash_for_pet(sender, instance, created, **kwargs):
+    """Pet names, species and breeds are hashed into every booking the pet is on"""
+    if created:
+        return
+    from booking_pets.models import BookingPets
+    for booking_id in BookingPets.objects.filter(pet=instance).values_list('booking_id', flat=True):
+        mark_booking_content_dirty(booking_id)
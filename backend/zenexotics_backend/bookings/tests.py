@@ -1,3 +1,204 @@
-from django.test import TestCase
+from datetime import date, datetime, time
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from bookings.booking_counters import month_start
+from bookings.content_hash import diff_states, draft_content_hash, draft_state
+from bookings.models import MonthlyBookingCount
+from core.platform_fee_utils import determine_platform_fee_percentages
+from core.pricing import get_unit_multiple, price_occurrences, price_units, price_window
+from users.models import User
+
+
+RATE_CARD = {
+    'base_rate': Decimal('20.00'),
+    'additional_animal_rate': Decimal('5.00'),
+    'applies_after': 1,
+    'holiday_rate': Decimal('10.00'),
+    'unit_of_time': '1 Hour',
+    'additional_rates': [{'title': 'Meds', 'description': '', 'amount': '2.00'}],
+}
+
+
+class UnitMultipleTests(SimpleTestCase):
+    def test_prorated_units(self):
+        self.assertEqual(get_unit_multiple('1 Hour', 3), Decimal('3.00000'))
+        self.assertEqual(get_unit_multiple('30 Min', 1.25), Decimal('2.50000'))
+        self.assertEqual(get_unit_multiple('24 Hour', 36), Decimal('1.50000'))
+        self.assertEqual(get_unit_multiple('Per Day', 8), Decimal('0.33333'))
+
+    def test_per_visit_and_unknown_units_charge_once(self):
+        self.assertEqual(get_unit_multiple('Per Visit', 5), Decimal('1'))
+        self.assertEqual(get_unit_multiple('Fortnight', 5), Decimal('1'))
+
+    def test_per_night_uses_the_night_count(self):
+        self.assertEqual(get_unit_multiple('Per Night', 60, nights=2), Decimal('2'))
+
+
+class PriceWindowTests(SimpleTestCase):
+    def test_line_items(self):
+        line_item = price_window(RATE_CARD, 3, datetime(2026, 3, 3, 9), datetime(2026, 3, 3, 12))
+
+        self.assertEqual(line_item['multiple'], Decimal('3.00000'))
+        self.assertEqual(line_item['base_total'], Decimal('60.00'))
+        # Charged once per extra pet, not per unit
+        self.assertEqual(line_item['additional_animal_rate_total'], Decimal('10.00'))
+        self.assertEqual(line_item['additional_animal_rate_applies'], 2)
+        self.assertEqual(line_item['holiday_total'], Decimal('0'))
+        self.assertEqual(line_item['additional_rates_total'], Decimal('2.00'))
+        self.assertEqual(line_item['total_cost'], Decimal('72.00'))
+
+    def test_no_extra_pets(self):
+        line_item = price_window(RATE_CARD, 1, datetime(2026, 3, 3, 9), datetime(2026, 3, 3, 12))
+
+        self.assertEqual(line_item['additional_animal_rate_total'], Decimal('0'))
+        self.assertEqual(line_item['additional_animal_rate_applies'], 0)
+
+    def test_holiday_rate_is_a_surcharge(self):
+        line_item = price_window(RATE_CARD, 3, datetime(2026, 12, 25, 9), datetime(2026, 12, 25, 12), is_holiday=True)
+
+        self.assertEqual(line_item['base_total'], Decimal('60.00'))
+        self.assertEqual(line_item['holiday_total'], Decimal('10.00'))
+        self.assertEqual(line_item['holiday_days'], 1)
+        self.assertEqual(line_item['total_cost'], Decimal('82.00'))
+
+    def test_price_units_takes_a_known_multiple(self):
+        self.assertEqual(price_units(RATE_CARD, 3, Decimal('2.5'))['total_cost'], Decimal('62.00'))
+
+
+class PriceOccurrencesTests(SimpleTestCase):
+    def test_batch_matches_single_windows(self):
+        occurrences = [
+            {'start_date': date(2026, 3, d), 'end_date': date(2026, 3, d), 'start_time': time(9), 'end_time': time(9 + d)}
+            for d in (1, 2, 3)
+        ]
+        line_items = price_occurrences(occurrences, RATE_CARD, 2)
+
+        self.assertEqual(
+            line_items,
+            [
+                price_window(RATE_CARD, 2, datetime(2026, 3, d, 9), datetime(2026, 3, d, 9 + d))
+                for d in (1, 2, 3)
+            ]
+        )
+
+    def test_holiday_checker_and_explicit_flag(self):
+        christmas = date(2026, 12, 25)
+        occurrences = [
+            {'start_date': christmas, 'end_date': christmas, 'start_time': time(9), 'end_time': time(10)},
+            {'start_date': date(2026, 12, 26), 'end_date': date(2026, 12, 26), 'start_time': time(9), 'end_time': time(10)},
+            {'start_date': christmas, 'end_date': christmas, 'start_time': time(9), 'end_time': time(10), 'is_holiday': False},
+        ]
+        line_items = price_occurrences(occurrences, RATE_CARD, 1, holiday_checker=lambda day: day == christmas)
+
+        self.assertEqual([line_item['holiday_days'] for line_item in line_items], [1, 0, 0])
+
+
+class PlatformFeePercentagesTests(TestCase):
+    def make_user(self, email, subscription_plan, role=None, booking_count=None):
+        user = User.objects.create_user(email=email, name=email, subscription_plan=subscription_plan)
+        if booking_count is not None:
+            MonthlyBookingCount.objects.create(user=user, role=role, month=month_start(), booking_count=booking_count)
+        return user
+
+    def test_one_counter_query_per_role(self):
+        first_booking_client = self.make_user('first@example.com', 0)
+        repeat_client = self.make_user('repeat@example.com', 0, MonthlyBookingCount.CLIENT, 2)
+        subscribed_client = self.make_user('subscribed@example.com', 4)
+        repeat_pro = self.make_user('repeat-pro@example.com', 0, MonthlyBookingCount.PROFESSIONAL, 1)
+        # Counted as a professional only, so still a first booking as a client
+        pro_as_client = self.make_user('pro-client@example.com', 0, MonthlyBookingCount.PROFESSIONAL, 3)
+
+        with self.assertNumQueries(2):
+            percentages = determine_platform_fee_percentages(
+                [first_booking_client, repeat_client, subscribed_client, pro_as_client, None],
+                [repeat_pro]
+            )
+
+        self.assertEqual(percentages['client'], {
+            first_booking_client.id: Decimal('0.0'),
+            repeat_client.id: Decimal('0.15'),
+            subscribed_client.id: Decimal('0.0'),
+            pro_as_client.id: Decimal('0.0'),
+        })
+        self.assertEqual(percentages['professional'], {repeat_pro.id: Decimal('0.15')})
+
+    def test_no_users_no_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(determine_platform_fee_percentages(), {'client': {}, 'professional': {}})
+
+
+def draft_occurrence(start_date, start_time='09:00', base_rate='20.00', additional_rates=()):
+    return {
+        'start_date': start_date,
+        'end_date': start_date,
+        'start_time': start_time,
+        'end_time': '12:00',
+        'calculated_cost': '60.00',
+        'rates': {
+            'base_rate': base_rate,
+            'additional_animal_rate': '5.00',
+            'applies_after': 1,
+            'holiday_rate': '10.00',
+            'unit_of_time': '1 Hour',
+            'additional_rates': list(additional_rates),
+        },
+    }
+
+
+def draft(occurrences, pets=({'pet_id': 1, 'name': 'Rex', 'species': 'Dog', 'breed': 'Lab'},)):
+    return {
+        'service_details': {'service_type': 'Dog Walking'},
+        'pets': list(pets),
+        'occurrences': list(occurrences),
+    }
+
+
+class DraftContentHashTests(SimpleTestCase):
+    def test_formatting_and_order_dont_change_the_hash(self):
+        meds = {'title': 'Meds', 'amount': '2.00'}
+        walk = {'title': 'Walk', 'amount': '3.00'}
+        original = draft([
+            draft_occurrence('2026-03-03', additional_rates=[meds, walk]),
+            draft_occurrence('2026-03-04'),
+        ])
+        reformatted = draft([
+            draft_occurrence('2026-03-04', base_rate='$20'),
+            draft_occurrence('2026-03-03', start_time='09:00 AM', additional_rates=[
+                {'title': 'Walk', 'amount': '$3'}, {'title': 'Meds', 'amount': 2},
+            ]),
+        ])
+
+        self.assertEqual(draft_content_hash(original), draft_content_hash(reformatted))
+
+    def test_costs_and_built_in_rate_rows_are_not_content(self):
+        original = draft([draft_occurrence('2026-03-03')])
+        repriced = draft([dict(draft_occurrence('2026-03-03'), calculated_cost='99.00')])
+        repriced['occurrences'][0]['rates']['additional_rates'] = [{'title': 'Base Rate', 'amount': '20.00'}]
+
+        self.assertEqual(draft_content_hash(original), draft_content_hash(repriced))
+
+    def test_content_changes_change_the_hash(self):
+        original = draft([draft_occurrence('2026-03-03')])
+        for changed in (
+            draft([draft_occurrence('2026-03-03', start_time='10:00')]),
+            draft([draft_occurrence('2026-03-03', base_rate='25.00')]),
+            draft([draft_occurrence('2026-03-03', additional_rates=[{'title': 'Meds', 'amount': '2.00'}])]),
+            draft([draft_occurrence('2026-03-03'), draft_occurrence('2026-03-04')]),
+            draft([draft_occurrence('2026-03-03')], pets=()),
+            dict(original, service_details={'service_type': 'Boarding'}),
+        ):
+            with self.subTest(changed=changed):
+                self.assertNotEqual(draft_content_hash(original), draft_content_hash(changed))
+
+    def test_diff_states(self):
+        original = draft_state(draft([draft_occurrence('2026-03-03'), draft_occurrence('2026-03-04')]))
+        changed = draft_state(draft([draft_occurrence('2026-03-03'), draft_occurrence('2026-03-05')], pets=()))
+
+        diff = diff_states(original, changed)
+        self.assertEqual(list(diff), ['pets', 'occurrences'])
+        self.assertEqual(diff['pets'], {'added': [], 'removed': [[1, 'Rex', 'Dog', 'Lab']]})
+        self.assertEqual([item[0] for item in diff['occurrences']['added']], ['2026-03-05'])
+        self.assertEqual([item[0] for item in diff['occurrences']['removed']], ['2026-03-04'])
+        self.assertEqual(diff_states(original, original), {})
@@ -1,10 +1,11 @@
 from datetime import date, timedelta
 
+from holiday_calendar.holidays import get_holiday_dates, is_holiday as is_calendar_holiday
+
 def is_holiday(check_date: date) -> bool:
     """
-    Check if a given date is a holiday.
-    This is a placeholder implementation - should be replaced with actual holiday checking logic.
-    Could be connected to a holiday API or database table of holidays.
+    Check if a given date is a holiday, using the compiled holiday calendar
+    (see holiday_calendar.holidays).
     
     Args:
         check_date (date): The date to check
@@ -12,13 +13,7 @@ def is_holiday(check_date: date) -> bool:
     Returns:
         bool: True if the date is a holiday, False otherwise
     """
-    # TODO: Implement proper holiday checking logic
-    # This could involve:
-    # 1. Checking against a holidays database table
-    # 2. Using a holiday API service
-    # 3. Maintaining a list of holiday dates
-    
-    return False  # Placeholder return until proper implementation 
+    return is_calendar_holiday(check_date)
 
 def count_holidays(start_date: date, end_date: date = None) -> int:
     """
@@ -32,22 +27,11 @@ def count_holidays(start_date: date, end_date: date = None) -> int:
     Returns:
         int: Number of holidays in the range
     """
-    # TODO: Implement proper holiday checking logic
-    # This could involve:
-    # 1. Checking against a holidays database table
-    # 2. Using a holiday API service
-    # 3. Maintaining a list of holiday dates
-    
     if not end_date:
-        return 0  # For now return 0 until holiday logic is implemented
+        return 1 if is_calendar_holiday(start_date) else 0
         
-    # For demonstration, let's count days that might be holidays
     holiday_count = 0
-    current_date = start_date
-    
-    while current_date <= end_date:
-        # TODO: Replace this with actual holiday checking logic
-        # For now, just return 0
-        current_date += timedelta(days=1)
+    for year in range(start_date.year, end_date.year + 1):
+        holiday_count += sum(1 for holiday in get_holiday_dates(year) if start_date <= holiday <= end_date)
         
-    return holiday_count 
\ No newline at end of file
+    return holiday_count
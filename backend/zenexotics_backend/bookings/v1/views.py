@@ -2,8 +2,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Prefetch, Q, Subquery
+from django.db.models.fields.json import KeyTextTransform
 from django.shortcuts import get_object_or_404
 from clients.models import Client
 from professionals.models import Professional
@@ -13,6 +13,11 @@ from rest_framework import generics
 from booking_pets.models import BookingPets
 from pets.models import Pet
 from ..constants import BookingStates
+from ..materialization import materialize_draft
+from booking_details.pet_counts import sync_booking_num_pets
+from booking_summary.recalculation import recalculation_suppressed
+import base64
+import binascii
 import logging
 from booking_drafts.models import BookingDraft
 from services.models import Service
@@ -34,6 +39,8 @@ from engagement_logs.models import EngagementLog
 import traceback
 import pytz
 from core.time_utils import get_user_time_settings, format_booking_occurrence
+from core.pricing import price_window
+from holiday_calendar.holidays import is_holiday
 from rest_framework.renderers import JSONRenderer
 from collections import OrderedDict
 from django.utils import timezone
@@ -44,22 +51,115 @@ from reviews.models import ProfessionalReview, ClientReview, ReviewRequest
 
 logger = logging.getLogger(__name__)
 
-class BookingPagination(PageNumberPagination):
+class BookingKeysetPagination:
+    """
+    Keyset pagination over (created_at, booking_id), newest first.
+
+    The cursor is the position of the last booking on the previous page, so every
+    page is an index range scan no matter how many bookings come before it.
+    Clients that still send ?page=N without a cursor get that page by offset.
+    """
     page_size = 20
     page_size_query_param = 'page_size'
+    page_query_param = 'page'
     max_page_size = 100
 
-    def get_next_link(self):
-        if not self.page.has_next():
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_page_number(self, request):
+        """The legacy ?page= number, 1 when missing. Raises ValueError if malformed."""
+        page = request.query_params.get(self.page_query_param)
+        if not page:
+            return 1
+        try:
+            page = int(page)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid page: {page}") from e
+        if page < 1:
+            raise ValueError(f"Invalid page: {page}")
+        return page
+
+    def encode_cursor(self, booking):
+        position = f"{booking.created_at.isoformat()}|{booking.booking_id}"
+        return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        """Returns (created_at, booking_id), or None for the first page. Raises ValueError if malformed."""
+        if not cursor:
             return None
-        return f"/api/bookings/v1/?page={self.page.next_page_number()}"
+        try:
+            created_at, booking_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            return datetime.fromisoformat(created_at), int(booking_id)
+        except (binascii.Error, UnicodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    def paginate_queryset(self, queryset, cursor, page_size, page=1):
+        """Returns (bookings on this page, cursor for the next page or None)"""
+        position = self.decode_cursor(cursor)
+        offset = 0
+        if position:
+            created_at, booking_id = position
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, booking_id__lt=booking_id)
+            )
+        else:
+            offset = (page - 1) * page_size
+        # One extra row tells us whether there is a next page without a COUNT
+        bookings = list(queryset.order_by('-created_at', '-booking_id')[offset:offset + page_size + 1])
+        if len(bookings) <= page_size:
+            return bookings, None
+        bookings = bookings[:page_size]
+        return bookings, self.encode_cursor(bookings[-1])
+
+
+def get_booking_list_queryset():
+    """Bookings with everything BookingListSerializer reads loaded up front"""
+    first_occurrences = BookingOccurrence.objects.filter(
+        booking=OuterRef('pk')
+    ).order_by('start_date', 'start_time')
+    latest_draft = BookingDraft.objects.filter(
+        booking=OuterRef('booking')
+    ).order_by('-updated_at').values('draft_id')[:1]
+
+    return Booking.objects.select_related(
+        'client__user',
+        'professional__user',
+        'service_id',
+        'bookingsummary'
+    ).annotate(
+        first_start_date=Subquery(first_occurrences.values('start_date')[:1]),
+        first_start_time=Subquery(first_occurrences.values('start_time')[:1])
+    ).prefetch_related(
+        # Only the latest draft's status, not every draft's full draft_data
+        Prefetch(
+            'drafts',
+            queryset=BookingDraft.objects.filter(
+                draft_id=Subquery(latest_draft)
+            ).annotate(
+                draft_status=KeyTextTransform('status', 'draft_data')
+            ).only('draft_id', 'booking'),
+            to_attr='latest_drafts'
+        )
+    )
+
 
 class BookingListView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = BookingPagination
+    pagination_class = BookingKeysetPagination
 
     def get(self, request):
         user = request.user
+        paginator = self.pagination_class()
+        page_size = paginator.get_page_size(request)
+        try:
+            page = paginator.get_page_number(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         # Try to get client and professional profiles for the user
         try:
@@ -76,46 +176,50 @@ class BookingListView(APIView):
             is_professional = False
             professional = None
 
-        # Get professional bookings
-        professional_bookings = []
-        if is_professional:
-            prof_bookings = Booking.objects.filter(professional=professional).select_related(
-                'client__user',
-                'professional__user',
-                'bookingsummary'
-            ).prefetch_related(
-                'occurrences',
-                'drafts'  # Add prefetch for drafts
-            ).order_by('-created_at')
-            
-            # Serialize bookings and check for drafts
-            for booking in prof_bookings:
-                booking_data = BookingListSerializer(booking).data
-                # Check if there's a draft for this booking
-                draft = booking.drafts.first()  # Using related_name from BookingDraft model
-                if draft and draft.draft_data and 'status' in draft.draft_data:
-                    booking_data['status'] = draft.draft_data['status']
-                professional_bookings.append(booking_data)
-
-        # Get client bookings
-        client_bookings = []
-        if is_client:
-            cli_bookings = Booking.objects.filter(client=client).select_related(
-                'client__user',
-                'professional__user',
-                'bookingsummary'
-            ).prefetch_related(
-                'occurrences'
-            ).order_by('-created_at')
-            client_bookings = BookingListSerializer(cli_bookings, many=True).data
-
-        # Return response with separated bookings
+        try:
+            # Get professional bookings
+            professional_bookings = []
+            professional_next_cursor = None
+            if is_professional:
+                prof_bookings, professional_next_cursor = paginator.paginate_queryset(
+                    get_booking_list_queryset().filter(professional=professional),
+                    request.query_params.get('professional_cursor'),
+                    page_size,
+                    page
+                )
+                
+                # Serialize bookings, showing the draft's status when the professional has unsent changes
+                for booking in prof_bookings:
+                    booking_data = BookingListSerializer(booking).data
+                    draft = booking.latest_drafts[0] if booking.latest_drafts else None
+                    if draft and draft.draft_status is not None:
+                        booking_data['status'] = draft.draft_status
+                    professional_bookings.append(booking_data)
+
+            # Get client bookings
+            client_bookings = []
+            client_next_cursor = None
+            if is_client:
+                cli_bookings, client_next_cursor = paginator.paginate_queryset(
+                    get_booking_list_queryset().filter(client=client),
+                    request.query_params.get('client_cursor'),
+                    page_size,
+                    page
+                )
+                client_bookings = BookingListSerializer(cli_bookings, many=True).data
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Return response with separated bookings, each list paged independently
         return Response({
             'bookings': {
                 'professional_bookings': professional_bookings,
                 'client_bookings': client_bookings
             },
-            'next_page': None  # Since we're not paginating the separated lists
+            'next_page': {
+                'professional_cursor': professional_next_cursor,
+                'client_cursor': client_next_cursor
+            }
         })
     
 class BookingUpdatePetsView(APIView):
@@ -171,8 +275,8 @@ class BookingUpdatePetsView(APIView):
                 })
 
             # Validate that all pets belong to the client
-            client_pets = Pet.objects.filter(owner=booking.client.user)
-            invalid_pets = [pid for pid in new_pet_ids if pid not in client_pets.values_list('pet_id', flat=True)]
+            client_pet_ids = set(Pet.objects.filter(owner=booking.client.user).values_list('pet_id', flat=True))
+            invalid_pets = [pid for pid in new_pet_ids if pid not in client_pet_ids]
             if invalid_pets:
                 return Response(
                     {"error": f"Pets {invalid_pets} do not belong to the client"},
@@ -188,16 +292,18 @@ class BookingUpdatePetsView(APIView):
             ]:
                 booking.status = BookingStates.PENDING_PROFESSIONAL_CHANGES
 
-            # Save the booking first to update its status
-            booking.save()
+            with transaction.atomic():
+                # Save the booking first to update its status
+                booking.save()
 
-            # Clear existing pets and add new ones
-            BookingPets.objects.filter(booking=booking).delete()
-            for pet_id in new_pet_ids:
-                BookingPets.objects.create(
-                    booking=booking,
-                    pet_id=pet_id
-                )
+                # Apply the whole pet change as one batch, then update num_pets and costs once
+                with recalculation_suppressed():
+                    BookingPets.objects.filter(booking=booking).exclude(pet_id__in=new_pet_ids).delete()
+                    BookingPets.objects.bulk_create([
+                        BookingPets(booking=booking, pet_id=pet_id)
+                        for pet_id in set(new_pet_ids) - set(current_pet_ids)
+                    ])
+                sync_booking_num_pets(booking.booking_id)
 
             return Response({
                 "status": BookingStates.get_display_state(booking.status),
@@ -661,75 +767,23 @@ def calculate_cost(base_rate, additional_animal_rate, applies_after, holiday_rat
     All rate parameters should be Decimal objects.
     start_dt and end_dt should be timezone-aware datetime objects.
     """
-    from core.constants import UnitOfTime
-    logger.info(f"MBA7777 Starting cost calculation with params: base_rate={base_rate}, unit_of_time={unit_of_time}, num_pets={num_pets}, applies_after={applies_after}")
-
-    # Calculate duration in hours
-    duration_hours = (end_dt - start_dt).total_seconds() / 3600
-    logger.info(f"MBA7777 Duration in hours: {duration_hours}")
-
-    # Get the unit multiplier based on unit_of_time
-    unit_mapping = {
-        UnitOfTime.FIFTEEN_MINUTES: 0.25,
-        UnitOfTime.THIRTY_MINUTES: 0.5,
-        UnitOfTime.FORTY_FIVE_MINUTES: 0.75,
-        UnitOfTime.ONE_HOUR: 1,
-        UnitOfTime.TWO_HOURS: 2,
-        UnitOfTime.THREE_HOURS: 3,
-        UnitOfTime.FOUR_HOURS: 4,
-        UnitOfTime.FIVE_HOURS: 5,
-        UnitOfTime.SIX_HOURS: 6,
-        UnitOfTime.SEVEN_HOURS: 7,
-        UnitOfTime.EIGHT_HOURS: 8,
-        UnitOfTime.TWENTY_FOUR_HOURS: 24,
-        UnitOfTime.PER_DAY: 24,
-        UnitOfTime.PER_VISIT: None,  # Special case - no proration
-        UnitOfTime.WEEK: 168  # 24 * 7
+    rate_card = {
+        'base_rate': base_rate,
+        'additional_animal_rate': additional_animal_rate,
+        'applies_after': applies_after,
+        'holiday_rate': holiday_rate,
+        'unit_of_time': unit_of_time,
+        'additional_rates': additional_rates or []
     }
-
-    unit_hours = unit_mapping.get(unit_of_time)
-    logger.info(f"MBA7777 Unit hours for {unit_of_time}: {unit_hours}")
-    
-    # Calculate base cost
-    if unit_hours is None:  # PER_VISIT case
-        multiplier = Decimal('1')
-        base_total = base_rate
-    else:
-        # Calculate how many units are needed
-        multiplier = Decimal(str(duration_hours / unit_hours)).quantize(Decimal('0.00001'))
-        base_total = base_rate * multiplier
-
-    logger.info(f"MBA7777 Calculated multiplier: {multiplier}")
-    logger.info(f"MBA7777 Base total: {base_total}")
-
-    # Calculate additional animal cost
-    additional_animal_rate_total = Decimal('0')
-    if num_pets > applies_after:
-        additional_pets = num_pets - applies_after
-        additional_animal_rate_total = additional_animal_rate * additional_pets * multiplier
-    logger.info(f"MBA7777 Additional animal rate total: {additional_animal_rate_total}")
-
-    # Add holiday rate if applicable (currently not implemented)
-    holiday_rate_total = Decimal('0')
-    logger.info(f"MBA7777 Holiday rate total: {holiday_rate_total}")
-
-    # Calculate additional rates total
-    additional_rates_total = Decimal('0')
-    if additional_rates:
-        additional_rates_total = sum(Decimal(str(rate['amount'])) for rate in additional_rates)
-    logger.info(f"MBA7777 Additional rates total: {additional_rates_total}")
-
-    # Calculate total
-    total_cost = base_total + additional_animal_rate_total + holiday_rate_total + additional_rates_total
-    logger.info(f"MBA7777 Final total cost: {total_cost}")
+    line_item = price_window(rate_card, num_pets, start_dt, end_dt, is_holiday=is_holiday(start_dt.date()))
 
     return {
-        'base_total': base_total,
-        'multiplier': multiplier,
-        'additional_animal_rate_total': additional_animal_rate_total,
-        'holiday_rate_total': holiday_rate_total,
-        'additional_rates_total': additional_rates_total,
-        'total_cost': total_cost
+        'base_total': line_item['base_total'],
+        'multiplier': line_item['multiple'],
+        'additional_animal_rate_total': line_item['additional_animal_rate_total'],
+        'holiday_rate_total': line_item['holiday_total'],
+        'additional_rates_total': line_item['additional_rates_total'],
+        'total_cost': line_item['total_cost']
     }
 
 class GetServiceRatesView(APIView):
@@ -1622,9 +1676,6 @@ class CreateFromDraftView(APIView):
                 booking.save()
                 logger.info(f"MBA66777 Updated existing booking {booking.booking_id}")
                 
-                # Delete existing booking pets and occurrences to rebuild them
-                BookingPets.objects.filter(booking=booking).delete()
-                
                 # Store existing occurrences to delete after creating new ones
                 # This prevents foreign key constraint issues when deleting occurrences
                 existing_occurrences = list(BookingOccurrence.objects.filter(booking=booking))
@@ -1647,166 +1698,8 @@ class CreateFromDraftView(APIView):
                 logger.info(f"MBA66777 Created new booking {booking.booking_id}")
                 existing_occurrences = []
             
-            # Add pets to booking
-            pet_count = 0
-            for pet_data in draft_data.get('pets', []):
-                pet_id = pet_data.get('pet_id')
-                if pet_id:
-                    pet = get_object_or_404(Pet, pet_id=pet_id)
-                    BookingPets.objects.create(booking=booking, pet=pet)
-                    pet_count += 1
-            
-            logger.info(f"MBA66777 Added {pet_count} pets to booking {booking.booking_id}")
-            
-            # Process occurrences
-            occurrences = []
-            new_booking_occurrences = []
-            
-            for occurrence_data in draft_data.get('occurrences', []):
-                # Parse dates and times
-                start_date = datetime.strptime(occurrence_data['start_date'], '%Y-%m-%d').date()
-                end_date = datetime.strptime(occurrence_data['end_date'], '%Y-%m-%d').date()
-                start_time = datetime.strptime(occurrence_data['start_time'], '%H:%M').time()
-                end_time = datetime.strptime(occurrence_data['end_time'], '%H:%M').time()
-                
-                # Create occurrence
-                occurrence = BookingOccurrence.objects.create(
-                    booking=booking,
-                    start_date=start_date,
-                    end_date=end_date,
-                    start_time=start_time,
-                    end_time=end_time,
-                    created_by='PROFESSIONAL',
-                    last_modified_by='PROFESSIONAL',
-                    status='PENDING',
-                    calculated_cost=Decimal(str(occurrence_data.get('calculated_cost', 0)))
-                )
-                
-                new_booking_occurrences.append(occurrence)
-                logger.info(f"MBA66777 Created occurrence {occurrence.occurrence_id} for booking {booking.booking_id}")
-                
-                # Get or create booking details
-                # Try to get unit_of_time from either occurrence_data directly or from occurrence_data.rates
-                unit_of_time = occurrence_data.get('unit_of_time')
-                if not unit_of_time and 'rates' in occurrence_data:
-                    unit_of_time = occurrence_data['rates'].get('unit_of_time')
-                if not unit_of_time:
-                    unit_of_time = 'Per Visit'  # Default if not found in either place
-                
-                logger.info(f"MBAio3htg5uohg: Unit of time: {unit_of_time}")
-                
-                multiple = occurrence_data.get('multiple', 1)
-                # Ensure multiple is a string to preserve precision (e.g., 0.33 vs 0.3)
-                if not isinstance(multiple, str):
-                    multiple = str(multiple)
-                logger.info(f"MBAio3htg5uohg: Multiple from draft: {multiple}")
-                
-                rates = occurrence_data.get('rates', {})
-                logger.info(f"MBAio3htg5uohg: Rates: {rates}")
-                
-                booking_details = BookingDetails.objects.filter(booking_occurrence=occurrence).first()
-                if booking_details:
-                    booking_details.num_pets = pet_count
-                    booking_details.base_rate = Decimal(str(rates.get('base_rate', 0)))
-                    booking_details.additional_pet_rate = Decimal(str(rates.get('additional_animal_rate', 0)))
-                    booking_details.applies_after = int(rates.get('applies_after', 1))
-                    booking_details.holiday_rate = Decimal(str(rates.get('holiday_rate', 0)))
-                    booking_details.unit_of_time = unit_of_time
-                    # Store the exact multiple value from the draft without rounding
-                    booking_details.multiple = Decimal(multiple)
-                    booking_details.nights = int(draft_data.get('nights', 0))
-                    booking_details.save()
-                    
-                    # Force update the calculated rate based on the supplied multiple
-                    base_rate = booking_details.base_rate
-                    calculated_rate = base_rate * Decimal(multiple)
-                    
-                    # Add additional pet costs if applicable
-                    if booking_details.additional_pet_rate and pet_count > booking_details.applies_after:
-                        additional_pets = pet_count - booking_details.applies_after
-                        additional_pet_cost = booking_details.additional_pet_rate * additional_pets * Decimal(multiple)
-                        calculated_rate += additional_pet_cost
-                        logger.info(f"MBA66777 Added {additional_pets} additional pets cost: ${additional_pet_cost}")
-                    
-                    # Update calculated_rate directly
-                    booking_details.calculated_rate = calculated_rate.quantize(Decimal('0.01'))
-                    booking_details.save(update_fields=['calculated_rate'])
-                    
-                    logger.info(f"MBAio3htg5uohg: Updated booking details with multiple={multiple} for occurrence {occurrence.occurrence_id}")
-                    logger.info(f"MBA66777 Forced calculated_rate to: ${booking_details.calculated_rate}")
-                
-                # Create additional rates if any
-                additional_rates = rates.get('additional_rates', [])
-                if additional_rates:
-                    occurrence_rate, created = BookingOccurrenceRate.objects.get_or_create(
-                        occurrence=occurrence,
-                        defaults={'rates': []}
-                    )
-                    
-                    rate_objects = []
-                    for rate in additional_rates:
-                        rate_objects.append({
-                            'title': rate.get('title'),
-                            'amount': str(rate.get('amount')),
-                            'description': rate.get('description', 'Additional rate')
-                        })
-                    
-                    occurrence_rate.rates = rate_objects
-                    occurrence_rate.save()
-                    
-                    logger.info(f"MBA66777 Added {len(rate_objects)} additional rates for occurrence {occurrence.occurrence_id}")
-                
-                # Force update the occurrence's calculated_cost
-                total_cost = Decimal('0.00')
-                
-                # Get the calculated_cost directly from the draft data if available
-                draft_calculated_cost = occurrence_data.get('calculated_cost')
-                if draft_calculated_cost:
-                    total_cost = Decimal(str(draft_calculated_cost))
-                    logger.info(f"MBA66777 Using draft calculated_cost: ${total_cost}")
-                else:
-                    # Add booking details calculated rate
-                    if booking_details:
-                        total_cost += booking_details.calculated_rate
-                    
-                    # Add additional rates totals
-                    additional_rates_total = Decimal('0.00')
-                    occurrence_rate = getattr(occurrence, 'rates', None)
-                    if occurrence_rate and occurrence_rate.rates:
-                        for rate in occurrence_rate.rates:
-                            amount_str = str(rate.get('amount', '0'))
-                            # Clean the amount string - remove any non-numeric characters except decimal point
-                            try:
-                                # First try to handle currency format (e.g., "$25.23")
-                                amount_str = amount_str.replace('$', '').strip()
-                                amount_value = Decimal(amount_str)
-                                additional_rates_total += amount_value
-                                logger.info(f"MBA66777 Added additional rate amount: ${amount_value}")
-                            except Exception as e:
-                                logger.error(f"MBA66777 Error parsing amount '{amount_str}': {str(e)}")
-                                # Skip this rate if we can't parse it
-                    
-                    total_cost += additional_rates_total
-                    logger.info(f"MBA66777 Calculated total cost: ${total_cost}")
-                
-                occurrence.calculated_cost = total_cost.quantize(Decimal('0.01'))
-                occurrence.save(update_fields=['calculated_cost'])
-                
-                logger.info(f"MBA66777 Updated occurrence calculated_cost to ${occurrence.calculated_cost}")
-                
-                # Add to occurrences list for message
-                occurrences.append({
-                    'occurrence_id': occurrence.occurrence_id,
-                    'start_date': start_date.strftime('%Y-%m-%d'),
-                    'end_date': end_date.strftime('%Y-%m-%d'),
-                    'start_time': start_time.strftime('%H:%M'),
-                    'end_time': end_time.strftime('%H:%M')
-                })
-            
-            # Now it's safe to delete old occurrences since new ones are created
-            for old_occurrence in existing_occurrences:
-                old_occurrence.delete()
-                logger.info(f"MBA66777 Deleted old occurrence {old_occurrence.occurrence_id}")
+            # Pets, occurrences, details and rates are written in bulk, then the summary is computed once below
+            occurrences = materialize_draft(booking, draft_data, replaced_occurrences=existing_occurrences)
 
             # Get cost summary from draft data
             cost_summary = draft_data.get('cost_summary', {})
@@ -1888,6 +1781,34 @@ class CreateFromDraftView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+def get_professional_conversation_ids(professional_user, client_user_ids):
+    """
+    Map each client user id to the conversation where professional_user is the professional,
+    for all clients in one query.
+    """
+    conversation_ids = {}
+    if not client_user_ids:
+        return conversation_ids
+
+    conversations = Conversation.objects.filter(
+        (Q(participant1=professional_user) & Q(participant2__in=client_user_ids)) |
+        (Q(participant1__in=client_user_ids) & Q(participant2=professional_user))
+    ).only('conversation_id', 'participant1_id', 'participant2_id', 'role_map')
+
+    for conversation in conversations:
+        # Check the role map to ensure the requesting user is the professional
+        role_map = conversation.role_map or {}
+        is_professional = any(
+            role == "professional" and (key.startswith('user_') or key == str(professional_user.id))
+            for key, role in role_map.items()
+        )
+        if is_professional:
+            other_user_id = conversation.participant2_id if conversation.participant1_id == professional_user.id else conversation.participant1_id
+            conversation_ids[other_user_id] = conversation.conversation_id
+
+    return conversation_ids
+
+
 class ConnectionsView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -1920,117 +1841,57 @@ class ConnectionsView(APIView):
                 logger.info(f"MBA9452: Current date in user timezone: {current_date}")
                 
                 # Get all clients for this professional (both invited and with bookings)
-                # Exclude deleted users
+                # Exclude deleted users. Everything per client is computed in SQL and only for the requested page.
+                client_bookings = Booking.objects.filter(client=OuterRef('pk'), professional=professional)
                 clients = Client.objects.filter(
-                    Q(booking__professional=professional) |  # Clients who have bookings with this professional
+                    Exists(client_bookings) |  # Clients who have bookings with this professional
                     Q(invited_by=professional)  # Clients who were invited by this professional
                 ).filter(
                     user__is_deleted=False,  # Exclude deleted users
                     user__is_active=True  # Exclude inactive users
-                ).distinct().select_related('user')
+                ).annotate(
+                    # Active bookings: any confirmed booking
+                    has_active_booking=Exists(client_bookings.filter(status=BookingStates.CONFIRMED)),
+                    # Past bookings: a completed booking with at least one occurrence ending before today
+                    has_past_booking=Exists(BookingOccurrence.objects.filter(
+                        booking__client=OuterRef('pk'),
+                        booking__professional=professional,
+                        booking__status=BookingStates.COMPLETED,
+                        end_date__lt=current_date
+                    ))
+                ).select_related('user').prefetch_related(
+                    Prefetch('user__owned_pets', queryset=Pet.objects.only('pet_id', 'name', 'species', 'owner'))
+                ).order_by('-created_at', 'id')
                 
-                logger.info(f"MBA9452: Found {clients.count()} active clients for professional {professional.professional_id}")
+                # Paginate results
+                paginator = Paginator(clients, 20)
+                try:
+                    page_obj = paginator.page(page)
+                except EmptyPage:
+                    page_obj = paginator.page(paginator.num_pages)
+                page_clients = list(page_obj.object_list)
+                
+                logger.info(f"MBA9452: Found {paginator.count} active clients for professional {professional.professional_id}")
+                
+                conversation_ids = get_professional_conversation_ids(user, [client.user_id for client in page_clients])
                 
                 connections = []
-                for client in clients:
-                    # Skip if client user is deleted (double-check)
-                    if client.user.is_deleted or not client.user.is_active:
-                        logger.info(f"MBA9452: Skipping deleted/inactive client user: {client.user.id}")
-                        continue
-                        
-                    # Find all conversations between these users
-                    conversations = Conversation.objects.filter(
-                        (Q(participant1=request.user) & Q(participant2=client.user)) |
-                        (Q(participant1=client.user) & Q(participant2=request.user))
-                    ).order_by('last_message_time')
-                    
-                    logger.info(f"MBA9452: Found {conversations.count()} conversations between user {request.user.id} and client {client.user.id}")
-                    
-                    # Find the conversation where the requesting user is the professional
-                    conversations = Conversation.objects.filter(
-                        (Q(participant1=request.user) & Q(participant2=client.user)) |
-                        (Q(participant1=client.user) & Q(participant2=request.user))
-                    )
-                    
-                    conversation_id = None
-                    for conversation in conversations:
-                        # Check the role map to ensure the requesting user is the professional
-                        role_map = conversation.role_map
-                        logger.info(f"MBA9452: Checking conversation role map: {role_map}")
-                        
-                        # Check if any key in the role map has "professional" as its value
-                        for key, role in role_map.items():
-                            if role == "professional":
-                                # If we found a professional role, check if this is our user
-                                if key.startswith('user_') or key == str(request.user.id):
-                                    conversation_id = conversation.conversation_id
-                                    logger.info(f"MBA9452: Found conversation where user is professional: conversation_id={conversation_id}, role_map={role_map}")
-                                    break
-                        else:
-                            logger.info(f"MBA9452: Skipping conversation - user is not professional: conversation_id={conversation.conversation_id}, role_map={role_map}")
-                        
-                        if not conversation_id:
-                            logger.info(f"MBA9452: No conversation found where user is professional for client: user_id={request.user.id}, client_id={client.id}, conversations_checked={list(conversations.values_list('conversation_id', flat=True))}")
-                    
-                    # Check for active bookings (any booking that isn't completed or cancelled)
-                    has_active_booking = Booking.objects.filter(
-                        client=client,
-                        professional=professional,
-                        status__in=[
-                            BookingStates.CONFIRMED
-                        ]
-                    ).exists()
-                    
-                    # Check for past bookings - bookings with status COMPLETED and at least one occurrence with end_date < current_date
-                    has_past_booking = 0
-                    completed_bookings = Booking.objects.filter(
-                        client=client,
-                        professional=professional,
-                        status=BookingStates.COMPLETED
-                    )
-                    
-                    if completed_bookings.exists():
-                        # For each completed booking, check if any occurrence has end_date earlier than current date
-                        for booking in completed_bookings:
-                            past_occurrences = BookingOccurrence.objects.filter(
-                                booking=booking,
-                                end_date__lt=current_date
-                            )
-                            if past_occurrences.exists():
-                                has_past_booking = 1
-                                break
-                    
-                    logger.info(f"MBA9452: Client {client.id} has_active_booking={has_active_booking}, has_past_booking={has_past_booking}")
-                    
-                    # Get the client's pets
-                    pets = Pet.objects.filter(owner=client.user)
-                    
+                for client in page_clients:
                     # Build the connection data
-                    connection_data = {
+                    connections.append({
                         'id': client.user.id,
                         'client_id': client.id,
                         'name': client.user.name,
                         'profile_image': client.user.profile_image_url if hasattr(client.user, 'profile_image_url') else None,
                         'about_me': client.about_me,
-                        'has_past_booking': has_past_booking,
-                        'pets': [{'id': pet.pet_id, 'name': pet.name, 'species': pet.species} for pet in pets],
-                        'active_bookings_count': 1 if has_active_booking else 0,
-                        'conversation_id': conversation_id if conversation_id else None
-                    }
-                    
-                    logger.info(f"MBA9452: Built connection data for client {client.user.id}: {connection_data}")
-                    
-                    connections.append(connection_data)
-                
-                # Paginate results
-                paginator = Paginator(connections, 20)
-                try:
-                    page_obj = paginator.page(page)
-                except EmptyPage:
-                    page_obj = paginator.page(paginator.num_pages)
+                        'has_past_booking': 1 if client.has_past_booking else 0,
+                        'pets': [{'id': pet.pet_id, 'name': pet.name, 'species': pet.species} for pet in client.user.owned_pets.all()],
+                        'active_bookings_count': 1 if client.has_active_booking else 0,
+                        'conversation_id': conversation_ids.get(client.user_id)
+                    })
                 
                 return Response({
-                    'connections': page_obj.object_list,
+                    'connections': connections,
                     'total_count': paginator.count,
                     'has_next': page_obj.has_next(),
                     'has_previous': page_obj.has_previous(),
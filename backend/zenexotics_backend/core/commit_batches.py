@@ -0,0 +1,95 @@
+"""
+Per-transaction batches of work to run once the transaction commits.
+
+Signal handlers that coalesce work (recalculate this booking, rehash that one)
+collect ids during a transaction and process them all in one on_commit
+callback. Keeping the ids in thread-locals meant a rolled-back transaction
+left them behind for the next, unrelated commit on the same thread to pick
+up. Here the ids live on the callback object itself. Django drops on_commit
+callbacks when the transaction (or the savepoint they were registered in)
+rolls back, so the ids go with them, and the next mark starts a new batch.
+Marks made inside a savepoint go to a batch registered in that savepoint, so
+rolling it back drops only those; a released savepoint's batch still runs, as
+its own flush, at commit.
+
+Outside a transaction the batch runs as soon as something is added to it,
+like on_commit itself.
+"""
+
+from django.db import transaction
+
+
+class CommitBatch:
+    """Sets of ids collected in one transaction (or savepoint), handed to flush on commit"""
+
+    def __init__(self, owner, names):
+        self.owner = owner
+        self.names = names
+        self.sets = {name: set() for name in names}
+
+    def take(self):
+        """Empty the batch, returning what it held as {name: set}"""
+        sets = self.sets
+        self.sets = {name: set() for name in self.names}
+        return sets
+
+    def __call__(self):
+        sets = self.take()
+        if any(sets.values()):
+            self.owner._flush(**sets)
+
+
+class CommitBatches:
+    """
+    The open CommitBatches of the current transaction, one per savepoint level.
+
+    Args:
+        flush: Called with one keyword argument per name, each a set of ids
+        names: Names of the id sets a batch holds
+    """
+
+    def __init__(self, flush, *names):
+        self._flush = flush
+        self._names = names
+
+    def _open_batches(self):
+        """[(savepoint ids, batch)] registered with the current transaction and not yet run or rolled back"""
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            return []
+        return [
+            (sids, callback) for sids, callback, *_ in connection.run_on_commit
+            if isinstance(callback, CommitBatch) and callback.owner is self
+        ]
+
+    def add(self, **ids):
+        """Add ids (name=id, None is ignored) to the current savepoint's batch"""
+        ids = {name: value for name, value in ids.items() if value is not None}
+        if not ids:
+            return
+        savepoint_ids = set(transaction.get_connection().savepoint_ids)
+        batch = next(
+            (batch for sids, batch in reversed(self._open_batches()) if sids == savepoint_ids),
+            None
+        )
+        is_new = batch is None
+        if is_new:
+            batch = CommitBatch(self, self._names)
+        for name, value in ids.items():
+            batch.sets[name].add(value)
+        if is_new:
+            # Runs right away when not in a transaction, so register after adding
+            transaction.on_commit(batch)
+
+    def discard(self, name, value):
+        for _, batch in self._open_batches():
+            batch.sets[name].discard(value)
+
+    def flush_now(self):
+        """Run the current transaction's pending work now instead of at commit, in one flush"""
+        sets = {name: set() for name in self._names}
+        for _, batch in self._open_batches():
+            for name, ids in batch.take().items():
+                sets[name] |= ids
+        if any(sets.values()):
+            self._flush(**sets)
@@ -71,6 +71,16 @@ STATE_TAX_RATES = {
   "DC": {"taxable": "service_fee_only", "state_rate": 0.06}
 }
 
+class RecurrenceFrequency:
+    WEEKLY = 'weekly'
+    BI_WEEKLY = 'bi-weekly'
+
+# Weeks between repeats, for every supported frequency
+RECURRENCE_WEEK_INTERVALS = {
+    RecurrenceFrequency.WEEKLY: 1,
+    RecurrenceFrequency.BI_WEEKLY: 2,
+}
+
 
 
 
@@ -0,0 +1,159 @@
+"""
+Geographic helpers shared by search and address code.
+All coordinates are (latitude, longitude) tuples in decimal degrees.
+"""
+
+import math
+
+# Miles per degree of latitude (roughly constant everywhere)
+MILES_PER_DEGREE_LATITUDE = 69.0
+
+# Miles per degree of longitude at the equator (shrinks with cos(latitude))
+MILES_PER_DEGREE_LONGITUDE_AT_EQUATOR = 69.172
+
+
+def extract_lat_lng(coordinates):
+    """
+    Pull a (latitude, longitude) pair out of an Address.coordinates JSON blob.
+
+    Args:
+        coordinates: Dict like {'latitude': 38.8, 'longitude': -104.8, ...} or None
+
+    Returns:
+        tuple: (latitude, longitude) as floats, or (None, None) if missing/invalid
+    """
+    if not coordinates or not isinstance(coordinates, dict):
+        return None, None
+
+    try:
+        latitude = coordinates.get('latitude')
+        longitude = coordinates.get('longitude')
+        if latitude is None or longitude is None or latitude == '' or longitude == '':
+            return None, None
+        return float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None, None
+
+
+def get_bounding_box(center, radius_miles):
+    """
+    Get a lat/lng box that fully contains the circle of radius_miles around center.
+    Used as a cheap indexed prefilter before computing exact distances.
+
+    Args:
+        center: (latitude, longitude) tuple
+        radius_miles: Search radius in miles
+
+    Returns:
+        tuple: (min_lat, max_lat, min_lng, max_lng)
+    """
+    latitude, longitude = center
+    radius_miles = float(radius_miles)
+
+    lat_delta = radius_miles / MILES_PER_DEGREE_LATITUDE
+
+    # Use the latitude edge closest to a pole so the box never undershoots
+    widest_latitude = min(abs(latitude) + lat_delta, 89.9)
+    miles_per_degree_longitude = MILES_PER_DEGREE_LONGITUDE_AT_EQUATOR * math.cos(math.radians(widest_latitude))
+    lng_delta = radius_miles / miles_per_degree_longitude
+
+    return (
+        latitude - lat_delta,
+        latitude + lat_delta,
+        longitude - lng_delta,
+        longitude + lng_delta,
+    )
+
+
+# Mean Earth radius in miles, used by the haversine approximation
+EARTH_RADIUS_MILES = 3958.7613
+
+# Haversine (sphere) and geodesic (WGS-84 ellipsoid) distances differ by at most ~0.55%.
+# Points whose haversine distance is within this fraction of the radius get an exact geodesic check.
+HAVERSINE_BOUNDARY_TOLERANCE = 0.006
+
+
+def haversine_distances(center, points):
+    """
+    Great-circle distance in miles from center to every point, in one pass.
+    The center's trig terms are computed once instead of once per point.
+
+    Args:
+        center: (latitude, longitude) tuple
+        points: Sequence of (latitude, longitude) tuples
+
+    Returns:
+        list: Distances in miles, in the same order as points
+    """
+    center_lat = math.radians(center[0])
+    center_lng = math.radians(center[1])
+    cos_center_lat = math.cos(center_lat)
+    radians = math.radians
+    sin = math.sin
+    cos = math.cos
+    asin = math.asin
+    sqrt = math.sqrt
+    diameter = 2 * EARTH_RADIUS_MILES
+
+    distances = []
+    for latitude, longitude in points:
+        lat = radians(latitude)
+        half_dlat = sin((lat - center_lat) / 2)
+        half_dlng = sin((radians(longitude) - center_lng) / 2)
+        a = half_dlat * half_dlat + cos_center_lat * cos(lat) * half_dlng * half_dlng
+        distances.append(diameter * asin(min(1.0, sqrt(a))))
+    return distances
+
+
+def geodesic_distance(center, point):
+    """Exact WGS-84 distance in miles (slow - use for the few points where precision matters)"""
+    from geopy.distance import geodesic
+
+    try:
+        return geodesic(center, point).miles
+    except Exception:
+        return float('inf')
+
+
+def filter_within_radius(center, points, radius_miles):
+    """
+    Find which points lie within radius_miles of center.
+
+    Works in three stages so the expensive math only runs where it matters:
+    1. Bounding-box cut (plain comparisons)
+    2. Batched haversine for everything inside the box
+    3. Exact geodesic only for points close enough to the radius that the
+       haversine approximation could put them on the wrong side
+
+    Args:
+        center: (latitude, longitude) tuple
+        points: Sequence of (latitude, longitude) tuples
+        radius_miles: Search radius in miles
+
+    Returns:
+        list: (index, distance_miles) pairs for points inside the radius, in input order
+    """
+    radius_miles = float(radius_miles)
+    min_lat, max_lat, min_lng, max_lng = get_bounding_box(center, radius_miles)
+
+    boxed_indexes = [
+        index for index, (latitude, longitude) in enumerate(points)
+        if min_lat <= latitude <= max_lat and min_lng <= longitude <= max_lng
+    ]
+    if not boxed_indexes:
+        return []
+
+    distances = haversine_distances(center, [points[index] for index in boxed_indexes])
+
+    inner_limit = radius_miles * (1 - HAVERSINE_BOUNDARY_TOLERANCE)
+    outer_limit = radius_miles * (1 + HAVERSINE_BOUNDARY_TOLERANCE)
+
+    matches = []
+    for index, distance in zip(boxed_indexes, distances):
+        if distance <= inner_limit:
+            matches.append((index, distance))
+        elif distance <= outer_limit:
+            exact_distance = geodesic_distance(center, points[index])
+            if exact_distance <= radius_miles:
+                matches.append((index, exact_distance))
+    return matches
@@ -1,11 +1,11 @@
 import logging
 from decimal import Decimal
-from django.utils import timezone
-from bookings.models import Booking
+from bookings.booking_counters import get_monthly_booking_counts
+from bookings.models import MonthlyBookingCount
 
 logger = logging.getLogger(__name__)
 
-def determine_client_platform_fee_percentage(client_user):
+def determine_client_platform_fee_percentage(client_user, bookings_this_month=None):
     """
     Determine the platform fee percentage for the client based on their subscription plan.
     
@@ -19,6 +19,8 @@ def determine_client_platform_fee_percentage(client_user):
     
     Args:
         client_user: The User object for the client
+        bookings_this_month: The client's booking count this month, if already known
+            (otherwise read from MonthlyBookingCount when the plan needs it)
         
     Returns:
         Decimal value of platform fee percentage (0.15 or 0.0)
@@ -61,15 +63,12 @@ def determine_client_platform_fee_percentage(client_user):
         return Decimal('0.0')
         
     if client_plan == 0:  # Free tier - check if first booking this month
-        # Get current month start
-        today = timezone.now().date()
-        month_start = today.replace(day=1)
-        
         # Count client's bookings this month
-        client_bookings_this_month = Booking.objects.filter(
-            client__user=client_user,
-            created_at__date__gte=month_start
-        ).count()
+        client_bookings_this_month = bookings_this_month
+        if client_bookings_this_month is None:
+            client_bookings_this_month = get_monthly_booking_counts(
+                [client_user.id], MonthlyBookingCount.CLIENT
+            )[client_user.id]
         
         logger.info(f"MBA-DEBUG: Client bookings this month: {client_bookings_this_month}")
         
@@ -83,7 +82,7 @@ def determine_client_platform_fee_percentage(client_user):
     return platform_fee
 
 
-def determine_professional_platform_fee_percentage(professional_user):
+def determine_professional_platform_fee_percentage(professional_user, bookings_this_month=None):
     """
     Determine the platform fee percentage for the professional based on their subscription plan.
     
@@ -97,6 +96,8 @@ def determine_professional_platform_fee_percentage(professional_user):
     
     Args:
         professional_user: The User object for the professional
+        bookings_this_month: The professional's booking count this month, if already known
+            (otherwise read from MonthlyBookingCount when the plan needs it)
         
     Returns:
         Decimal value of platform fee percentage (0.15 or 0.0)
@@ -139,15 +140,12 @@ def determine_professional_platform_fee_percentage(professional_user):
         return Decimal('0.0')
         
     if pro_plan == 0:  # Free tier - check if first booking this month
-        # Get current month start
-        today = timezone.now().date()
-        month_start = today.replace(day=1)
-        
         # Count professional's bookings this month
-        pro_bookings_this_month = Booking.objects.filter(
-            professional__user=professional_user,
-            created_at__date__gte=month_start
-        ).count()
+        pro_bookings_this_month = bookings_this_month
+        if pro_bookings_this_month is None:
+            pro_bookings_this_month = get_monthly_booking_counts(
+                [professional_user.id], MonthlyBookingCount.PROFESSIONAL
+            )[professional_user.id]
         
         logger.info(f"MBA-DEBUG: Professional bookings this month: {pro_bookings_this_month}")
         
@@ -161,6 +159,42 @@ def determine_professional_platform_fee_percentage(professional_user):
     return platform_fee
 
 
+def determine_platform_fee_percentages(client_users=(), professional_users=()):
+    """
+    Resolve platform fee percentages for many users at once, with at most one
+    monthly counter query per role.
+    
+    Args:
+        client_users: User objects to price as clients
+        professional_users: User objects to price as professionals
+        
+    Returns:
+        Dictionary containing:
+        - client: user id -> client fee percentage (as decimal)
+        - professional: user id -> professional fee percentage (as decimal)
+    """
+    client_users = [user for user in client_users if user]
+    professional_users = [user for user in professional_users if user]
+    
+    client_counts = get_monthly_booking_counts(
+        [user.id for user in client_users], MonthlyBookingCount.CLIENT
+    )
+    pro_counts = get_monthly_booking_counts(
+        [user.id for user in professional_users], MonthlyBookingCount.PROFESSIONAL
+    )
+    
+    return {
+        'client': {
+            user.id: determine_client_platform_fee_percentage(user, client_counts[user.id])
+            for user in client_users
+        },
+        'professional': {
+            user.id: determine_professional_platform_fee_percentage(user, pro_counts[user.id])
+            for user in professional_users
+        },
+    }
+
+
 def calculate_platform_fees(subtotal, client_user=None, professional_user=None):
     """
     Calculate platform fees for a booking based on client and professional users.
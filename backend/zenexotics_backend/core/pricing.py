@@ -0,0 +1,193 @@
+"""
+Pure occurrence pricing.
+
+Everything here works on plain values: a rate card (dict snapshot of a
+service's rates, see build_rate_card) and occurrence windows. Nothing touches
+the database or logs, so a whole booking's occurrences can be priced in one
+call and the same numbers come out of drafts, recurring generation,
+CalculateOccurrenceCostView and BookingDetails.
+
+One rule for every caller: the base rate is charged per unit, the additional
+animal rate once per extra pet, and a holiday occurrence adds the holiday rate
+once on top (see price_units).
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+
+from .constants import UnitOfTime
+
+# Hours covered by one unit. Units missing here (Per Visit, unknown values) are
+# charged once per occurrence; Per Night is charged per night when the night count is known.
+UNIT_HOURS = {
+    UnitOfTime.FIFTEEN_MINUTES: 0.25,
+    UnitOfTime.THIRTY_MINUTES: 0.5,
+    UnitOfTime.FORTY_FIVE_MINUTES: 0.75,
+    UnitOfTime.ONE_HOUR: 1,
+    UnitOfTime.TWO_HOURS: 2,
+    UnitOfTime.THREE_HOURS: 3,
+    UnitOfTime.FOUR_HOURS: 4,
+    UnitOfTime.FIVE_HOURS: 5,
+    UnitOfTime.SIX_HOURS: 6,
+    UnitOfTime.SEVEN_HOURS: 7,
+    UnitOfTime.EIGHT_HOURS: 8,
+    UnitOfTime.TWENTY_FOUR_HOURS: 24,
+    UnitOfTime.PER_DAY: 24,
+    UnitOfTime.WEEK: 168,  # 24 * 7
+}
+
+MULTIPLE_PRECISION = Decimal('0.00001')
+
+
+def get_unit_multiple(unit_of_time, duration_hours, nights=None):
+    """
+    Number of billable units for an occurrence lasting duration_hours.
+
+    Args:
+        unit_of_time: Service unit ('1 Hour', 'Per Day', 'Per Visit', ...)
+        duration_hours: Length of the occurrence in hours
+        nights: Night count, only used for 'Per Night'
+
+    Returns:
+        Decimal: Prorated unit count (1 for per-visit pricing)
+    """
+    if unit_of_time == UnitOfTime.PER_NIGHT and nights is not None:
+        return Decimal(str(nights))
+
+    unit_hours = UNIT_HOURS.get(unit_of_time)
+    if unit_hours is None:
+        return Decimal('1')
+    return Decimal(str(duration_hours / unit_hours)).quantize(MULTIPLE_PRECISION)
+
+
+def build_rate_card(service):
+    """
+    Snapshot a Service's rates into a plain dict. Build it once per service and
+    reuse it for every occurrence (prefetch additional_rates when building many).
+    """
+    return {
+        'base_rate': Decimal(str(service.base_rate)),
+        'additional_animal_rate': Decimal(str(service.additional_animal_rate)),
+        'applies_after': int(str(service.applies_after)),
+        'holiday_rate': Decimal(str(service.holiday_rate)),
+        'unit_of_time': service.unit_of_time,
+        'additional_rates': [
+            OrderedDict([
+                ('title', rate.title),
+                ('description', rate.description or ''),
+                ('amount', str(Decimal(str(rate.rate))))
+            ])
+            for rate in service.additional_rates.all()
+        ],
+    }
+
+
+def occurrence_window(occurrence):
+    """
+    (start, end) naive datetimes for anything with start_date/start_time/end_date/end_time,
+    either as attributes (BookingOccurrence, temp occurrences) or dict keys.
+    """
+    if isinstance(occurrence, dict):
+        fields = occurrence
+    else:
+        fields = {
+            name: getattr(occurrence, name)
+            for name in ('start_date', 'start_time', 'end_date', 'end_time')
+        }
+    return (
+        datetime.combine(fields['start_date'], fields['start_time']),
+        datetime.combine(fields['end_date'], fields['end_time'])
+    )
+
+
+def price_units(rate_card, num_pets, multiple, is_holiday=False):
+    """
+    Price an occurrence whose unit count is already known.
+
+    Args:
+        rate_card: Dict from build_rate_card (or the same keys from request data)
+        num_pets: Number of pets on the booking
+        multiple: Billable units (get_unit_multiple, or the multiple stored on a draft)
+        is_holiday: Whether the holiday surcharge applies
+
+    Returns:
+        dict: Decimal line items (multiple, base_total, additional_animal_rate_total,
+              additional_animal_rate_applies, holiday_total, holiday_days,
+              additional_rates_total, total_cost)
+    """
+    base_total = rate_card['base_rate'] * multiple
+
+    # Charged once per extra pet, not per unit
+    additional_animal_rate_total = Decimal('0')
+    additional_pets = 0
+    if num_pets > rate_card['applies_after']:
+        additional_pets = num_pets - rate_card['applies_after']
+        additional_animal_rate_total = rate_card['additional_animal_rate'] * additional_pets
+
+    # A surcharge on top of the base rate, not a replacement for it
+    holiday_total = rate_card['holiday_rate'] if is_holiday else Decimal('0')
+
+    additional_rates_total = sum(
+        (Decimal(str(rate['amount'])) for rate in rate_card.get('additional_rates') or []),
+        Decimal('0')
+    )
+
+    return {
+        'multiple': multiple,
+        'base_total': base_total,
+        'additional_animal_rate_total': additional_animal_rate_total,
+        'additional_animal_rate_applies': additional_pets,
+        'holiday_total': holiday_total,
+        'holiday_days': 1 if is_holiday else 0,
+        'additional_rates_total': additional_rates_total,
+        'total_cost': base_total + additional_animal_rate_total + holiday_total + additional_rates_total,
+    }
+
+
+def price_window(rate_card, num_pets, start, end, nights=None, is_holiday=False):
+    """
+    Price one occurrence window against a rate card.
+
+    Args:
+        rate_card: Dict from build_rate_card (or the same keys from request data)
+        num_pets: Number of pets on the booking
+        start, end: Datetimes bounding the occurrence
+        nights: Night count for 'Per Night' services
+        is_holiday: Whether the holiday surcharge applies
+
+    Returns:
+        dict: Line items as price_units returns them
+    """
+    duration_hours = (end - start).total_seconds() / 3600
+    multiple = get_unit_multiple(rate_card['unit_of_time'], duration_hours, nights)
+    return price_units(rate_card, num_pets, multiple, is_holiday=is_holiday)
+
+
+def price_occurrences(occurrences, rate_card, num_pets, holiday_checker=None):
+    """
+    Price a batch of occurrences in one pass.
+
+    Args:
+        occurrences: Iterable of occurrence objects or dicts (see occurrence_window).
+            Dicts may also carry 'nights' and 'is_holiday'.
+        rate_card: Dict from build_rate_card
+        num_pets: Number of pets on the booking
+        holiday_checker: Callable date -> bool (e.g. holiday_calendar.holidays.is_holiday),
+            applied to each occurrence's start date unless it carries 'is_holiday'
+
+    Returns:
+        list: One line item dict per occurrence, in input order
+    """
+    line_items = []
+    for occurrence in occurrences:
+        start, end = occurrence_window(occurrence)
+        extras = occurrence if isinstance(occurrence, dict) else {}
+        holiday = extras.get('is_holiday')
+        if holiday is None:
+            holiday = bool(holiday_checker and holiday_checker(start.date()))
+        line_items.append(price_window(
+            rate_card, num_pets, start, end,
+            nights=extras.get('nights'), is_holiday=holiday
+        ))
+    return line_items
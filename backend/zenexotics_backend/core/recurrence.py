@@ -0,0 +1,63 @@
+"""
+Recurring occurrence dates.
+
+UpdateBookingDraftRecurringView used to walk every calendar day between the
+start and end date, counting Mondays to work out which week it was in. Here
+dates are generated rrule-style: jump straight to each selected weekday of a
+repeating week and skip the weeks in between, so the work is proportional to
+the number of occurrences rather than the length of the range. Dates are
+yielded one at a time, so callers can price or stop early without building
+the whole series first.
+"""
+
+from datetime import timedelta
+
+from .constants import RECURRENCE_WEEK_INTERVALS, RecurrenceFrequency
+
+
+def iter_recurring_dates(start_date, end_date, days_of_week, frequency=None, max_occurrences=None):
+    """
+    Yield every date in [start_date, end_date] that falls on one of days_of_week.
+
+    Weeks run Monday to Sunday and are counted from the week containing
+    start_date; bi-weekly keeps that week and every other one after it.
+
+    Args:
+        start_date, end_date: Inclusive date bounds
+        days_of_week: Weekday numbers, Monday=0 ... Sunday=6
+        frequency: RecurrenceFrequency value (None repeats weekly)
+        max_occurrences: Stop after this many dates (None for no cap)
+
+    Yields:
+        datetime.date: Matching dates in ascending order
+
+    Raises:
+        ValueError: frequency isn't in RECURRENCE_WEEK_INTERVALS
+    """
+    if frequency is None:
+        frequency = RecurrenceFrequency.WEEKLY
+    if frequency not in RECURRENCE_WEEK_INTERVALS:
+        raise ValueError(f"Unsupported frequency {frequency!r}")
+
+    weekdays = sorted({day for day in days_of_week if day in range(7)})
+    if not weekdays or start_date > end_date:
+        return
+    if max_occurrences is not None and max_occurrences <= 0:
+        return
+
+    step = timedelta(weeks=RECURRENCE_WEEK_INTERVALS[frequency])
+    week_start = start_date - timedelta(days=start_date.weekday())
+    count = 0
+
+    while week_start <= end_date:
+        for weekday in weekdays:
+            current_date = week_start + timedelta(days=weekday)
+            if current_date < start_date:
+                continue
+            if current_date > end_date:
+                return
+            yield current_date
+            count += 1
+            if max_occurrences is not None and count >= max_occurrences:
+                return
+        week_start += step
@@ -144,7 +144,8 @@ def format_datetime_for_user(
 def format_booking_occurrence(
     start_dt: datetime,
     end_dt: datetime,
-    user_id: int
+    user_id: int,
+    time_settings: Optional[Dict] = None
 ) -> Dict:
     """
     Format a booking occurrence with start and end times according to user preferences.
@@ -153,11 +154,12 @@ def format_booking_occurrence(
         start_dt: Start datetime in UTC
         end_dt: End datetime in UTC
         user_id: The user's ID to get their preferences
+        time_settings: The user's get_user_time_settings() result, when already loaded
         
     Returns:
         Dictionary containing formatted strings and duration
     """
-    settings = get_user_time_settings(user_id)
+    settings = time_settings if time_settings is not None else get_user_time_settings(user_id)
     
     # Convert to user's timezone
     local_start = convert_from_utc(start_dt, settings['timezone'])
@@ -193,13 +195,15 @@ def format_booking_occurrence(
         'end_datetime': local_end.isoformat()
     }
 
-def get_formatted_times(occurrence, user_id: int) -> Dict:
+def get_formatted_times(occurrence, user_id: int, time_settings: Optional[Dict] = None) -> Dict:
     """
     Get formatted times for a booking occurrence.
     
     Args:
         occurrence: The BookingOccurrence instance
         user_id: The user's ID to get their preferences
+        time_settings: The user's get_user_time_settings() result; pass it when
+            formatting many occurrences so the settings are only read once
         
     Returns:
         Dictionary with formatted times and duration
@@ -211,7 +215,7 @@ def get_formatted_times(occurrence, user_id: int) -> Dict:
     start_dt = pytz.UTC.localize(start_dt)
     end_dt = pytz.UTC.localize(end_dt)
     
-    return format_booking_occurrence(start_dt, end_dt, user_id)
+    return format_booking_occurrence(start_dt, end_dt, user_id, time_settings)
 
 def set_times_from_local(occurrence, start_dt: datetime, end_dt: datetime, user_timezone: str):
     """
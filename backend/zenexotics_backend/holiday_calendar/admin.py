@@ -0,0 +1,22 @@
+from django.contrib import admin
+from .models import Holiday
+
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ('holiday_id', 'name', 'rule', 'month', 'day', 'week', 'weekday', 'is_active')
+    list_filter = ('rule', 'is_active')
+    search_fields = ('name',)
+    readonly_fields = ('created_at', 'updated_at')
+    fieldsets = (
+        ('Basic Information', {
+            'fields': ('name', 'is_active')
+        }),
+        ('Date Rule', {
+            'fields': ('rule', 'month', 'day', 'week', 'weekday'),
+            'description': 'Fixed date uses month and day; nth weekday uses month, week and weekday'
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
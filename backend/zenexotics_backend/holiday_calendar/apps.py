@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class HolidayCalendarConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "holiday_calendar"
+
+    def ready(self):
+        import holiday_calendar.signals  # noqa
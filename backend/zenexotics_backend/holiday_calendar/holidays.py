@@ -0,0 +1,78 @@
+"""
+Compiled holiday calendar.
+
+The Holiday table holds rules, not dates. Pricing asks "is this date a
+holiday" once per occurrence, so the active rules are loaded once and each
+year is compiled into a frozenset of dates the first time it's asked for;
+every lookup after that is a set membership test without touching the
+database, however long the recurring series being priced.
+
+Saving or deleting a Holiday clears the compiled calendar in this process.
+Other worker processes pick up changes when their copy is older than
+HOLIDAY_CALENDAR_MAX_AGE_SECONDS.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+HOLIDAY_CALENDAR_MAX_AGE_SECONDS = 300
+
+_lock = threading.Lock()
+_rules = None
+_loaded_at = 0.0
+_years = {}
+
+
+def invalidate_holiday_calendar():
+    """Drop the compiled calendar; the next lookup reloads the rules"""
+    global _rules
+    with _lock:
+        _rules = None
+        _years.clear()
+
+
+def _load_rules():
+    from .models import Holiday
+
+    global _rules, _loaded_at
+    _rules = list(Holiday.objects.filter(is_active=True))
+    _loaded_at = time.monotonic()
+    _years.clear()
+    logger.info(f"Loaded {len(_rules)} active holiday rules")
+
+
+def get_holiday_dates(year):
+    """
+    All holiday dates in year.
+
+    Returns:
+        frozenset: datetime.date objects
+    """
+    dates = _years.get(year)
+    if dates is not None and time.monotonic() - _loaded_at < HOLIDAY_CALENDAR_MAX_AGE_SECONDS:
+        return dates
+
+    with _lock:
+        if _rules is None or time.monotonic() - _loaded_at >= HOLIDAY_CALENDAR_MAX_AGE_SECONDS:
+            _load_rules()
+        dates = _years.get(year)
+        if dates is None:
+            dates = frozenset(
+                holiday_date
+                for holiday_date in (rule.date_for_year(year) for rule in _rules)
+                if holiday_date is not None
+            )
+            _years[year] = dates
+    return dates
+
+
+def is_holiday(day):
+    """Whether a date (or datetime) falls on a holiday"""
+    if day is None:
+        return False
+    if hasattr(day, 'date'):
+        day = day.date()
+    return day in get_holiday_dates(day.year)
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('holiday_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('rule', models.CharField(choices=[('FIXED_DATE', 'Fixed date'), ('NTH_WEEKDAY', 'Nth weekday of the month')], default='FIXED_DATE', max_length=20)),
+                ('month', models.PositiveSmallIntegerField(help_text='1-12')),
+                ('day', models.PositiveSmallIntegerField(blank=True, help_text='Day of the month, for fixed dates', null=True)),
+                ('weekday', models.PositiveSmallIntegerField(blank=True, choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')], help_text='For nth weekday rules', null=True)),
+                ('week', models.SmallIntegerField(blank=True, choices=[(1, 'First'), (2, 'Second'), (3, 'Third'), (4, 'Fourth'), (-1, 'Last')], help_text='Which occurrence of the weekday, for nth weekday rules', null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'holidays',
+                'ordering': ['month', 'day', 'week'],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+import calendar
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+
+class Holiday(models.Model):
+    """
+    A holiday that turns on the holiday rate. Either a fixed date every year
+    (Christmas: month 12, day 25) or the nth weekday of a month
+    (Thanksgiving: 4th Thursday of November, Memorial Day: last Monday of May).
+    """
+    FIXED_DATE = 'FIXED_DATE'
+    NTH_WEEKDAY = 'NTH_WEEKDAY'
+    RULE_CHOICES = [
+        (FIXED_DATE, 'Fixed date'),
+        (NTH_WEEKDAY, 'Nth weekday of the month'),
+    ]
+
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+
+    LAST_WEEK = -1
+    WEEK_CHOICES = [
+        (1, 'First'),
+        (2, 'Second'),
+        (3, 'Third'),
+        (4, 'Fourth'),
+        (LAST_WEEK, 'Last'),
+    ]
+
+    holiday_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    rule = models.CharField(max_length=20, choices=RULE_CHOICES, default=FIXED_DATE)
+    month = models.PositiveSmallIntegerField(help_text="1-12")
+    day = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Day of the month, for fixed dates")
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES, null=True, blank=True, help_text="For nth weekday rules")
+    week = models.SmallIntegerField(choices=WEEK_CHOICES, null=True, blank=True, help_text="Which occurrence of the weekday, for nth weekday rules")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'holidays'
+        ordering = ['month', 'day', 'week']
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if not 1 <= (self.month or 0) <= 12:
+            raise ValidationError({'month': 'Month must be between 1 and 12'})
+        if self.rule == self.FIXED_DATE:
+            # Feb 29 is allowed, it just doesn't fall in non-leap years
+            if not self.day or self.day > calendar.monthrange(2000, self.month)[1]:
+                raise ValidationError({'day': 'Enter a valid day for this month'})
+        elif self.weekday is None or self.week is None:
+            raise ValidationError('Nth weekday holidays need a weekday and a week')
+
+    def date_for_year(self, year):
+        """The holiday's date in year, or None if it doesn't fall that year"""
+        if self.rule == self.FIXED_DATE:
+            try:
+                return date(year, self.month, self.day)
+            except (TypeError, ValueError):
+                return None
+
+        if self.weekday is None or not self.week:
+            return None
+        days_in_month = calendar.monthrange(year, self.month)[1]
+        if self.week == self.LAST_WEEK:
+            last = date(year, self.month, days_in_month)
+            return date(year, self.month, days_in_month - (last.weekday() - self.weekday) % 7)
+        first_offset = (self.weekday - date(year, self.month, 1).weekday()) % 7
+        day = 1 + first_offset + (self.week - 1) * 7
+        return date(year, self.month, day) if day <= days_in_month else None
@@ -0,0 +1,11 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Holiday
+from .holidays import invalidate_holiday_calendar
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def reset_holiday_calendar(sender, instance, **kwargs):
+    # After commit, so no other thread reloads the old rules in between
+    transaction.on_commit(invalidate_holiday_calendar)
@@ -0,0 +1,77 @@
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from holiday_calendar.models import Holiday
+
+
+def nth_weekday(month, weekday, week):
+    return Holiday(name='Test', rule=Holiday.NTH_WEEKDAY, month=month, weekday=weekday, week=week)
+
+
+class HolidayDateForYearTests(SimpleTestCase):
+    def test_fixed_date(self):
+        christmas = Holiday(name='Christmas', rule=Holiday.FIXED_DATE, month=12, day=25)
+
+        self.assertEqual(christmas.date_for_year(2026), date(2026, 12, 25))
+
+    def test_feb_29_only_in_leap_years(self):
+        leap_day = Holiday(name='Leap day', rule=Holiday.FIXED_DATE, month=2, day=29)
+
+        self.assertEqual(leap_day.date_for_year(2028), date(2028, 2, 29))
+        self.assertIsNone(leap_day.date_for_year(2026))
+
+    def test_nth_weekday(self):
+        # Thanksgiving: 4th Thursday of November
+        thanksgiving = nth_weekday(11, 3, 4)
+
+        self.assertEqual(thanksgiving.date_for_year(2025), date(2025, 11, 27))
+        self.assertEqual(thanksgiving.date_for_year(2026), date(2026, 11, 26))
+
+    def test_first_weekday_on_the_first_of_the_month(self):
+        # Labor Day 2025: September 1st is itself a Monday
+        labor_day = nth_weekday(9, 0, 1)
+
+        self.assertEqual(labor_day.date_for_year(2025), date(2025, 9, 1))
+        self.assertEqual(labor_day.date_for_year(2026), date(2026, 9, 7))
+
+    def test_fifth_week_that_doesnt_exist_in_the_month(self):
+        # 4th is the highest choice, but a 5th Monday only exists in some months
+        fifth_monday = nth_weekday(2, 0, 5)
+
+        self.assertIsNone(fifth_monday.date_for_year(2026))
+        self.assertEqual(fifth_monday.date_for_year(2044), date(2044, 2, 29))
+
+    def test_last_weekday(self):
+        # Memorial Day: last Monday of May
+        memorial_day = nth_weekday(5, 0, Holiday.LAST_WEEK)
+
+        self.assertEqual(memorial_day.date_for_year(2025), date(2025, 5, 26))
+        self.assertEqual(memorial_day.date_for_year(2026), date(2026, 5, 25))
+
+    def test_last_weekday_on_the_last_day_of_the_month(self):
+        # May 31st 2027 is a Monday
+        memorial_day = nth_weekday(5, 0, Holiday.LAST_WEEK)
+
+        self.assertEqual(memorial_day.date_for_year(2027), date(2027, 5, 31))
+
+    def test_incomplete_nth_weekday_rule_has_no_date(self):
+        self.assertIsNone(Holiday(name='Test', rule=Holiday.NTH_WEEKDAY, month=5, weekday=0).date_for_year(2026))
+        self.assertIsNone(Holiday(name='Test', rule=Holiday.NTH_WEEKDAY, month=5, week=1).date_for_year(2026))
+
+
+class HolidayCleanTests(SimpleTestCase):
+    def test_fixed_date_needs_a_valid_day(self):
+        with self.assertRaises(ValidationError):
+            Holiday(name='Test', rule=Holiday.FIXED_DATE, month=4, day=31).clean()
+        Holiday(name='Test', rule=Holiday.FIXED_DATE, month=2, day=29).clean()
+
+    def test_nth_weekday_needs_weekday_and_week(self):
+        with self.assertRaises(ValidationError):
+            Holiday(name='Test', rule=Holiday.NTH_WEEKDAY, month=5, weekday=0).clean()
+        nth_weekday(5, 0, Holiday.LAST_WEEK).clean()
+
+    def test_month_range(self):
+        with self.assertRaises(ValidationError):
+            Holiday(name='Test', rule=Holiday.FIXED_DATE, month=13, day=1).clean()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Location
+from .models import Location, GeocodeCacheEntry
 
 
 @admin.register(Location)
@@ -23,3 +23,12 @@ class LocationAdmin(admin.ModelAdmin):
         """Mark selected locations as unsupported (coming soon)"""
         queryset.update(supported=False)
     make_unsupported.short_description = "Mark selected locations as unsupported"
+
+
+@admin.register(GeocodeCacheEntry)
+class GeocodeCacheEntryAdmin(admin.ModelAdmin):
+    """Admin configuration for the GeocodeCacheEntry model"""
+    list_display = ('normalized_query', 'is_found', 'latitude', 'longitude', 'hit_count', 'expires_at')
+    list_filter = ('is_found',)
+    search_fields = ('normalized_query',)
+    ordering = ('normalized_query',)
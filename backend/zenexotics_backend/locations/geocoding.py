@@ -0,0 +1,219 @@
+"""
+Cached geocoding for search locations.
+
+Lookups go through three layers, cheapest first:
+1. An in-process LRU (per worker, short TTL)
+2. The GeocodeCacheEntry table (shared across workers, long TTL)
+3. The Nominatim API (only on a miss in both caches)
+
+Failed lookups are cached too (negative results) with a shorter TTL, but
+network/HTTP errors are never cached so a Nominatim outage doesn't stick.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import requests
+from django.db.models import F
+from django.utils import timezone
+
+from .models import GeocodeCacheEntry
+
+logger = logging.getLogger(__name__)
+
+NOMINATIM_SEARCH_URL = 'https://nominatim.openstreetmap.org/search'
+NOMINATIM_USER_AGENT = 'CrittrCove/1.0 (contact@crittrcove.com)'
+NOMINATIM_TIMEOUT_SECONDS = 5
+
+# Colorado bounds - anything outside is treated as "not found"
+COLORADO_LAT_RANGE = (37.0, 41.0)
+COLORADO_LNG_RANGE = (-109.0, -102.0)
+
+# How long results live in the database cache
+GEOCODE_CACHE_TTL = timedelta(days=90)
+GEOCODE_NEGATIVE_CACHE_TTL = timedelta(days=1)
+
+# How long results live in the per-process LRU, and how many it holds
+GEOCODE_MEMORY_CACHE_TTL_SECONDS = 60 * 60
+GEOCODE_MEMORY_CACHE_SIZE = 512
+
+# Suffixes we already append when querying, so "Denver, CO" and "Denver" share a key
+_REDUNDANT_SUFFIXES = (', colorado, usa', ', colorado', ', co, usa', ', co', ', usa')
+
+
+class _ExpiringLRUCache:
+    """Small thread-safe LRU where every entry also expires after a fixed number of seconds."""
+
+    _MISSING = object()
+
+    def __init__(self, max_size, ttl_seconds):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or _ExpiringLRUCache._MISSING if absent/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._MISSING
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return self._MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_memory_cache = _ExpiringLRUCache(GEOCODE_MEMORY_CACHE_SIZE, GEOCODE_MEMORY_CACHE_TTL_SECONDS)
+
+
+def normalize_location_query(location_string):
+    """
+    Build the cache key for a location string.
+    Lowercases, collapses whitespace and comma spacing, and strips the
+    Colorado/USA suffix we always add when querying.
+    """
+    if not location_string:
+        return ''
+
+    normalized = location_string.strip().lower()
+    normalized = re.sub(r'\s*,\s*', ', ', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = normalized.strip(' ,.')
+
+    for suffix in _REDUNDANT_SUFFIXES:
+        if normalized.endswith(suffix):
+            normalized = normalized[:-len(suffix)]
+            break
+
+    return normalized[:255]
+
+
+def fetch_from_nominatim(location_string):
+    """
+    Geocode a location string using the Nominatim API (no caching).
+
+    Returns:
+        tuple: (coordinates, is_definitive)
+            coordinates: (latitude, longitude) or None
+            is_definitive: False when the lookup failed for a transient reason
+                           (timeout, HTTP error) and must not be cached
+    """
+    try:
+        params = {
+            'q': f"{location_string}, Colorado, USA",
+            'format': 'json',
+            'limit': '1',
+            'countrycodes': 'us',
+            'addressdetails': '1'
+        }
+        headers = {
+            'User-Agent': NOMINATIM_USER_AGENT
+        }
+
+        response = requests.get(NOMINATIM_SEARCH_URL, params=params, headers=headers, timeout=NOMINATIM_TIMEOUT_SECONDS)
+
+        if response.status_code != 200:
+            logger.warning(f"Geocoding returned HTTP {response.status_code} for '{location_string}'")
+            return None, False
+
+        data = response.json()
+        if data and len(data) > 0:
+            result = data[0]
+            lat = float(result['lat'])
+            lng = float(result['lon'])
+
+            # Validate coordinates are within Colorado bounds
+            if COLORADO_LAT_RANGE[0] <= lat <= COLORADO_LAT_RANGE[1] and COLORADO_LNG_RANGE[0] <= lng <= COLORADO_LNG_RANGE[1]:
+                return (lat, lng), True
+
+        return None, True
+    except Exception as e:
+        logger.error(f"Geocoding failed for '{location_string}': {str(e)}")
+        return None, False
+
+
+def _store_result(normalized_query, coordinates):
+    """Write a positive or negative result to the database cache"""
+    ttl = GEOCODE_CACHE_TTL if coordinates else GEOCODE_NEGATIVE_CACHE_TTL
+    latitude, longitude = coordinates if coordinates else (None, None)
+
+    GeocodeCacheEntry.objects.update_or_create(
+        normalized_query=normalized_query,
+        defaults={
+            'latitude': latitude,
+            'longitude': longitude,
+            'is_found': coordinates is not None,
+            'expires_at': timezone.now() + ttl,
+        }
+    )
+
+
+def geocode_location(location_string, refresh=False):
+    """
+    Geocode a location string, going through the memory and database caches first.
+
+    Args:
+        location_string: Free-form city/ZIP string from the search box
+        refresh: Skip both caches and re-query Nominatim (used by the warm-up command)
+
+    Returns:
+        (latitude, longitude) tuple or None if the location can't be resolved
+    """
+    if not location_string or location_string.strip() == '':
+        return None
+
+    normalized_query = normalize_location_query(location_string)
+    if not normalized_query:
+        return None
+
+    if not refresh:
+        cached = _memory_cache.get(normalized_query)
+        if cached is not _ExpiringLRUCache._MISSING:
+            return cached
+
+        try:
+            entry = GeocodeCacheEntry.objects.filter(
+                normalized_query=normalized_query,
+                expires_at__gt=timezone.now()
+            ).first()
+            if entry:
+                GeocodeCacheEntry.objects.filter(pk=entry.pk).update(hit_count=F('hit_count') + 1)
+                _memory_cache.set(normalized_query, entry.coordinates)
+                return entry.coordinates
+        except Exception as e:
+            # A broken cache table should never break search - fall through to the API
+            logger.error(f"Geocode cache read failed for '{normalized_query}': {str(e)}")
+
+    coordinates, is_definitive = fetch_from_nominatim(normalized_query)
+
+    if is_definitive:
+        _memory_cache.set(normalized_query, coordinates)
+        try:
+            _store_result(normalized_query, coordinates)
+        except Exception as e:
+            logger.error(f"Geocode cache write failed for '{normalized_query}': {str(e)}")
+
+    return coordinates
+
+
+def clear_memory_cache():
+    """Drop everything in this process's LRU (the database cache is untouched)"""
+    _memory_cache.clear()
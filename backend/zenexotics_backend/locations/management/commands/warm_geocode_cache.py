@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from locations.geocoding import geocode_location, normalize_location_query
+from locations.models import GeocodeCacheEntry
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Most common search locations - Colorado cities plus the Colorado Springs / Denver metro ZIPs
+COMMON_COLORADO_CITIES = [
+    'Colorado Springs', 'Denver', 'Aurora', 'Fort Collins', 'Lakewood', 'Thornton',
+    'Arvada', 'Westminster', 'Pueblo', 'Centennial', 'Boulder', 'Greeley', 'Longmont',
+    'Loveland', 'Broomfield', 'Castle Rock', 'Parker', 'Littleton', 'Englewood',
+    'Monument', 'Fountain', 'Security-Widefield', 'Manitou Springs', 'Woodland Park',
+    'Black Forest', 'Falcon', 'Peyton', 'Canon City', 'Grand Junction', 'Durango',
+]
+
+COMMON_COLORADO_ZIPS = [
+    # Colorado Springs area
+    '80903', '80904', '80905', '80906', '80907', '80909', '80910', '80911', '80915',
+    '80916', '80917', '80918', '80919', '80920', '80921', '80922', '80923', '80924',
+    '80925', '80927', '80938', '80939', '80951', '80817', '80829', '80831', '80132',
+    '80133', '80106', '80808', '80863',
+    # Denver metro
+    '80202', '80203', '80204', '80205', '80206', '80209', '80210', '80211', '80218',
+    '80220', '80222', '80224', '80230', '80231', '80237', '80238', '80246', '80247',
+    '80012', '80013', '80014', '80015', '80016', '80104', '80108', '80109', '80111',
+    '80112', '80120', '80121', '80122', '80123', '80124', '80126', '80130', '80134',
+]
+
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_REQUEST_INTERVAL_SECONDS = 1.1
+
+
+class Command(BaseCommand):
+    help = 'Pre-warm the geocoding cache with common Colorado cities and ZIP codes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Re-geocode locations even if they already have a valid cache entry'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show which locations would be geocoded without calling the API'
+        )
+
+    def handle(self, *args, **options):
+        refresh = options['refresh']
+        dry_run = options['dry_run']
+
+        locations = COMMON_COLORADO_CITIES + COMMON_COLORADO_ZIPS
+        now = timezone.now()
+
+        # Skip anything that already has a live cache entry unless we're refreshing
+        cached_queries = set()
+        if not refresh:
+            cached_queries = set(GeocodeCacheEntry.objects.filter(
+                normalized_query__in=[normalize_location_query(loc) for loc in locations],
+                expires_at__gt=now
+            ).values_list('normalized_query', flat=True))
+
+        to_geocode = [loc for loc in locations if normalize_location_query(loc) not in cached_queries]
+
+        self.stdout.write(f"{len(locations)} common locations, {len(cached_queries)} already cached, {len(to_geocode)} to geocode")
+
+        if dry_run:
+            for location in to_geocode:
+                self.stdout.write(self.style.WARNING(f"  [DRY RUN] Would geocode '{location}'"))
+            return
+
+        found = 0
+        for index, location in enumerate(to_geocode):
+            if index > 0:
+                time.sleep(NOMINATIM_REQUEST_INTERVAL_SECONDS)
+
+            coordinates = geocode_location(location, refresh=True)
+            if coordinates:
+                found += 1
+                self.stdout.write(self.style.SUCCESS(f"  ✓ {location}: {coordinates}"))
+            else:
+                self.stdout.write(self.style.WARNING(f"  ✗ {location}: not found"))
+
+        self.stdout.write(self.style.SUCCESS(f"Completed warming geocode cache: {found}/{len(to_geocode)} locations resolved"))
@@ -22,3 +22,36 @@ class Location(models.Model):
     def __str__(self):
         status = "Supported" if self.supported else "Coming Soon"
         return f"{self.name} ({status})"
+
+
+class GeocodeCacheEntry(models.Model):
+    """
+    Persistent cache of geocoding results keyed on a normalized location query
+    (e.g. "colorado springs", "80903"). Entries with is_found=False are negative
+    results so we don't keep asking the geocoder about locations it can't resolve.
+    """
+    normalized_query = models.CharField(max_length=255, unique=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    is_found = models.BooleanField(default=True)
+    hit_count = models.IntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['normalized_query']
+        verbose_name = 'Geocode Cache Entry'
+        verbose_name_plural = 'Geocode Cache Entries'
+
+    def __str__(self):
+        if not self.is_found:
+            return f"{self.normalized_query} (not found)"
+        return f"{self.normalized_query} ({self.latitude}, {self.longitude})"
+
+    @property
+    def coordinates(self):
+        """(latitude, longitude) tuple, or None for negative entries"""
+        if not self.is_found:
+            return None
+        return (self.latitude, self.longitude)
@@ -0,0 +1,71 @@
+# Generated manually: SearchLog lives in the shared search_logs_searchlog table, so columns are added with SQL
+
+from django.db import migrations
+
+from logs.search_log_buffer import build_dedup_key
+
+
+def backfill_dedup_keys(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT search_id, user_id, ip_address, service_query, location, animal_types,
+                   overnight_service, filter_background_checked, filter_insured, filter_elite_pro
+            FROM search_logs_searchlog
+            ORDER BY last_searched DESC NULLS LAST, search_id DESC
+            """
+        )
+        rows = cursor.fetchall()
+
+    # Only the most recent row of each duplicate group gets the key, older duplicates stay NULL
+    seen_keys = set()
+    updates = []
+    for (search_id, user_id, ip_address, service_query, location, animal_types,
+         overnight_service, filter_background_checked, filter_insured, filter_elite_pro) in rows:
+        dedup_key = build_dedup_key(user_id, str(ip_address) if ip_address else None, {
+            'service_query': service_query,
+            'location': location,
+            'animal_types': animal_types,
+            'overnight_service': overnight_service,
+            'filter_background_checked': filter_background_checked,
+            'filter_insured': filter_insured,
+            'filter_elite_pro': filter_elite_pro,
+        })
+        if dedup_key in seen_keys:
+            continue
+        seen_keys.add(dedup_key)
+        updates.append((dedup_key, search_id))
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            "UPDATE search_logs_searchlog SET dedup_key = %s WHERE search_id = %s",
+            updates
+        )
+
+
+def reverse_backfill_dedup_keys(apps, schema_editor):
+    # Column is dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0002_add_search_counter_fields'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """
+            ALTER TABLE search_logs_searchlog
+            ADD COLUMN IF NOT EXISTS dedup_key VARCHAR(64) NULL;
+            """,
+            reverse_sql="ALTER TABLE search_logs_searchlog DROP COLUMN IF EXISTS dedup_key;"
+        ),
+        migrations.RunPython(backfill_dedup_keys, reverse_backfill_dedup_keys),
+        # Unique so the buffered writer can upsert on it
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX IF NOT EXISTS search_logs_dedup_key_uniq ON search_logs_searchlog (dedup_key);",
+            reverse_sql="DROP INDEX IF EXISTS search_logs_dedup_key_uniq;"
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 import json
 
+from .search_log_buffer import build_dedup_key
+
 User = get_user_model()
 
 class SearchLog(models.Model):
@@ -61,6 +63,7 @@ class SearchLog(models.Model):
     search_count = models.IntegerField(default=1, help_text="Number of times this exact search has been performed")
     first_searched = models.DateTimeField(default=timezone.now, help_text="When this search combination was first performed")
     last_searched = models.DateTimeField(default=timezone.now, help_text="When this search combination was most recently performed")
+    dedup_key = models.CharField(max_length=64, unique=True, null=True, blank=True, help_text="Hash of the search combination, see search_log_buffer.build_dedup_key")
     
     # Timestamps
     timestamp = models.DateTimeField(auto_now_add=True)  # Keep for compatibility
@@ -106,30 +109,9 @@ class SearchLog(models.Model):
         
         search_query_summary = f"{service_query or 'All Services'} for {', '.join(animal_types) if animal_types else 'any pets'} in {location or 'Colorado Springs'}"
         
-        # Format location for duplicate check
-        location_for_check = search_params.get('location', '')
-        if isinstance(location_for_check, str):
-            location_for_check = {'address': location_for_check} if location_for_check else {}
-        
-        # Check for identical search combinations (regardless of time)
-        # This creates a unique signature based on IP + search parameters
-        duplicate_check_fields = {
-            'ip_address': ip_address,
-            'service_query': search_params.get('service_query', ''),
-            'location': location_for_check,
-            'animal_types': search_params.get('animal_types', []),
-            'overnight_service': search_params.get('overnight_service', False),
-            'filter_background_checked': search_params.get('filter_background_checked', False),
-            'filter_insured': search_params.get('filter_insured', False),
-            'filter_elite_pro': search_params.get('filter_elite_pro', False),
-        }
-        
-        # If user is authenticated, also check by user to separate anonymous from authenticated searches
-        if user_id:
-            duplicate_check_fields['user_id'] = user_id
-        
-        # Check if identical search combination exists
-        existing_entry = cls.objects.filter(**duplicate_check_fields).first()
+        # Identical search combinations (regardless of time) share one row, see build_dedup_key
+        dedup_key = build_dedup_key(user_id, ip_address, search_params)
+        existing_entry = cls.objects.filter(dedup_key=dedup_key).first()
         
         if existing_entry:
             # Increment counter and update timestamps + latest results
@@ -152,6 +134,7 @@ class SearchLog(models.Model):
         current_time = timezone.now()
         
         search_log = cls.objects.create(
+            dedup_key=dedup_key,
             user_id=user_id,
             user_type=user_type,
             animal_types=search_params.get('animal_types', []),
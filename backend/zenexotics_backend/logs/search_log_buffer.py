@@ -0,0 +1,262 @@
+"""
+Buffered, off-request-path writer for SearchLog.
+
+search_professionals only builds a small dict and drops it on an in-process
+queue. A daemon thread drains the queue and writes batches: identical searches
+within a batch are merged, existing rows (matched by dedup_key) get their
+search_count bumped, and new rows are inserted. dedup_key is unique, so if
+another worker inserts the same new search first the batch is rolled back and
+written again, this time counting it as a repeat of that worker's row.
+
+Logging is best effort: if the queue is full, entries are dropped with a
+warning rather than slowing searches down.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SEARCH_LOG_QUEUE_MAX_SIZE = 10000
+SEARCH_LOG_BATCH_SIZE = 200
+SEARCH_LOG_FLUSH_INTERVAL_SECONDS = 5
+# Times a batch is retried after losing an insert race to another worker
+SEARCH_LOG_WRITE_ATTEMPTS = 3
+
+_queue = queue.Queue(maxsize=SEARCH_LOG_QUEUE_MAX_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+
+# Fields refreshed from the latest search when an entry is merged into an existing row
+_LATEST_RESULT_FIELDS = [
+    'last_searched', 'results_found', 'result_count', 'has_fallback', 'search_successful',
+    'original_query_successful', 'user_agent', 'updated_at',
+]
+
+
+def _normalize_location(location):
+    """SearchLog.location is stored as {'address': ...}; accept either form"""
+    if isinstance(location, dict):
+        return location.get('address', '') or ''
+    return location or ''
+
+
+def build_dedup_key(user_id, ip_address, search_params):
+    """
+    Hash identifying "the same search by the same person": who searched (user/IP)
+    plus the query, location, animals and filters. Price and radius are not part of it.
+    """
+    signature = [
+        user_id,
+        ip_address,
+        search_params.get('service_query') or '',
+        _normalize_location(search_params.get('location')),
+        search_params.get('animal_types') or [],
+        bool(search_params.get('overnight_service')),
+        bool(search_params.get('filter_background_checked')),
+        bool(search_params.get('filter_insured')),
+        bool(search_params.get('filter_elite_pro')),
+    ]
+    return hashlib.sha256(json.dumps(signature, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def build_search_log_entry(request, search_params, results_data):
+    """Capture everything the log needs from the request while we still have it"""
+    user_id = request.user.id if request.user.is_authenticated else None
+    ip_address = request.META.get('REMOTE_ADDR')
+    return {
+        'dedup_key': build_dedup_key(user_id, ip_address, search_params),
+        'user_id': user_id,
+        'user_type': 'authenticated' if user_id else 'anonymous',
+        'ip_address': ip_address,
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+        'search_params': dict(search_params),
+        'results_data': dict(results_data),
+        'searched_at': timezone.now(),
+    }
+
+
+def _build_search_log(entry, search_count):
+    from .models import SearchLog
+
+    search_params = entry['search_params']
+    results_data = entry['results_data']
+    animal_types = search_params.get('animal_types', [])
+    service_query = search_params.get('service_query', '')
+    location = _normalize_location(search_params.get('location'))
+
+    return SearchLog(
+        dedup_key=entry['dedup_key'],
+        user_id=entry['user_id'],
+        user_type=entry['user_type'],
+        animal_types=animal_types,
+        location={'address': location} if location else {},
+        service_query=service_query,
+        overnight_service=search_params.get('overnight_service', False),
+        price_range={
+            'min': search_params.get('price_min', 0),
+            'max': search_params.get('price_max', 999999)
+        },
+        radius_miles=search_params.get('radius_miles', 30),
+        filter_background_checked=search_params.get('filter_background_checked', False),
+        filter_insured=search_params.get('filter_insured', False),
+        filter_elite_pro=search_params.get('filter_elite_pro', False),
+        results_found=results_data.get('results_found', 0),
+        has_fallback=results_data.get('has_fallback', False),
+        search_successful=results_data.get('search_successful', False),
+        original_query_successful=results_data.get('original_query_successful', False),
+        search_query_summary=f"{service_query or 'All Services'} for {', '.join(animal_types) if animal_types else 'any pets'} in {location or 'Colorado Springs'}",
+        ip_address=entry['ip_address'],
+        user_agent=entry['user_agent'],
+        search_count=search_count,
+        first_searched=entry['first_searched'],
+        last_searched=entry['searched_at'],
+        created_at=entry['first_searched'],
+        updated_at=entry['searched_at'],
+        # Also populate legacy fields for compatibility
+        service_name=service_query,
+        result_count=results_data.get('results_found', 0)
+    )
+
+
+def _write_merged(merged):
+    """Update the rows of searches already logged and insert the rest"""
+    from .models import SearchLog
+
+    existing_logs = {
+        log.dedup_key: log
+        for log in SearchLog.objects.filter(dedup_key__in=list(merged.keys())).only('search_id', 'dedup_key')
+    }
+
+    to_update = []
+    to_create = []
+    for dedup_key, entry in merged.items():
+        log = existing_logs.get(dedup_key)
+        if log is None:
+            to_create.append(_build_search_log(entry, entry['count']))
+            continue
+        results_data = entry['results_data']
+        log.search_count = F('search_count') + entry['count']
+        log.last_searched = entry['searched_at']
+        log.results_found = results_data.get('results_found', 0)
+        log.result_count = results_data.get('results_found', 0)
+        log.has_fallback = results_data.get('has_fallback', False)
+        log.search_successful = results_data.get('search_successful', False)
+        log.original_query_successful = results_data.get('original_query_successful', False)
+        log.user_agent = entry['user_agent']
+        log.updated_at = entry['searched_at']
+        to_update.append(log)
+
+    if to_update:
+        SearchLog.objects.bulk_update(to_update, ['search_count'] + _LATEST_RESULT_FIELDS)
+    if to_create:
+        SearchLog.objects.bulk_create(to_create)
+
+
+def flush_search_logs(entries):
+    """
+    Write a batch of entries from build_search_log_entry in a fixed number of queries.
+
+    Returns:
+        int: Number of distinct searches written
+    """
+    if not entries:
+        return 0
+
+    # Merge repeats of the same search within the batch, keeping the latest results
+    merged = {}
+    for entry in sorted(entries, key=lambda e: e['searched_at']):
+        existing = merged.get(entry['dedup_key'])
+        if existing:
+            entry['first_searched'] = existing['first_searched']
+            entry['count'] = existing['count'] + 1
+        else:
+            entry['first_searched'] = entry['searched_at']
+            entry['count'] = 1
+        merged[entry['dedup_key']] = entry
+
+    for attempt in range(1, SEARCH_LOG_WRITE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                _write_merged(merged)
+            break
+        except IntegrityError:
+            # Another worker created one of these searches since we looked; the
+            # next attempt finds its row and adds this batch's count to it
+            if attempt == SEARCH_LOG_WRITE_ATTEMPTS:
+                raise
+            logger.info(f"Search log batch lost an insert race, retrying (attempt {attempt})")
+
+    return len(merged)
+
+
+def _drain(max_items):
+    entries = []
+    while len(entries) < max_items:
+        try:
+            entries.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return entries
+
+
+def _flush_pending(first_entry=None):
+    entries = ([first_entry] if first_entry is not None else []) + _drain(SEARCH_LOG_QUEUE_MAX_SIZE)
+    if not entries:
+        return
+    close_old_connections()
+    try:
+        for start in range(0, len(entries), SEARCH_LOG_BATCH_SIZE):
+            batch = entries[start:start + SEARCH_LOG_BATCH_SIZE]
+            try:
+                flush_search_logs(batch)
+            except Exception as e:
+                # Keep going, the other batches can still be written
+                logger.error(f"Failed to write {len(batch)} search logs: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def _worker_loop():
+    while True:
+        # Block until something arrives, then give the batch a moment to fill up
+        try:
+            first_entry = _queue.get(timeout=SEARCH_LOG_FLUSH_INTERVAL_SECONDS)
+        except queue.Empty:
+            continue
+        if _queue.qsize() + 1 < SEARCH_LOG_BATCH_SIZE:
+            time.sleep(SEARCH_LOG_FLUSH_INTERVAL_SECONDS)
+        _flush_pending(first_entry)
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name='search-log-writer', daemon=True)
+            _worker.start()
+
+
+def enqueue_search_log(entry):
+    """Queue a search log entry for the background writer. Never blocks."""
+    try:
+        _queue.put_nowait(entry)
+    except queue.Full:
+        logger.warning("Search log queue is full, dropping entry")
+        return
+    _ensure_worker()
+
+
+# Don't lose the last few seconds of searches on a graceful worker shutdown
+atexit.register(_flush_pending)
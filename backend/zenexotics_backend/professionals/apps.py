@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ProfessionalsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "professionals" 
\ No newline at end of file
+    name = "professionals"
+
+    def ready(self):
+        import professionals.signals  # noqa
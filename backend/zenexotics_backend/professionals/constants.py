@@ -0,0 +1,4 @@
+# Where search falls back to when no location is given, geocoding fails,
+# or a service query returns nothing
+DEFAULT_SEARCH_COORDINATES = (38.8339, -104.8214)  # Colorado Springs coordinates
+DEFAULT_SEARCH_LOCATION = "Colorado Springs, Colorado"
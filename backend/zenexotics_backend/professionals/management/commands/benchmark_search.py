@@ -0,0 +1,102 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from professionals.v1.views import search_professionals
+
+SEARCH_PATH = '/api/professionals/v1/search/'
+
+# Fixed mix of payloads replayed by every run, so numbers are comparable between runs.
+# No 'location' on purpose: geocoding would make the benchmark depend on the network.
+SEARCH_SCENARIOS = [
+    ('default', {}),
+    ('service_query', {'service_query': 'dog walking'}),
+    ('animal_filter', {'animal_types': ['lizards']}),
+    ('price_range', {'animal_types': ['cats'], 'price_min': 30, 'price_max': 60}),
+    ('overnight', {'service_query': 'overnight', 'overnight_service': True}),
+    ('badges', {'filter_insured': True, 'filter_background_checked': True}),
+    ('wide_radius', {'radius_miles': 150}),
+    ('fallback', {'service_query': 'zebra grooming'}),
+    ('next_page', {'page_size': 10}),  # Replays page 2 of a cached search session
+]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = 'Replay a fixed mix of search payloads against search_professionals and report latency and query counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed requests per scenario (default: 20)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Untimed requests per scenario before measuring (default: 2)'
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            help='Only run this scenario (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        scenarios = [
+            (name, payload) for name, payload in SEARCH_SCENARIOS
+            if not options['scenarios'] or name in options['scenarios']
+        ]
+
+        self.stdout.write(f"{'scenario':<16}{'results':>9}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'queries':>10}")
+        for name, payload in scenarios:
+            payload = {**payload, 'skip_logging': True}
+
+            if name == 'next_page':
+                first_page = self._search(factory, payload)[0]
+                payload = {**payload, 'search_token': first_page['search_token'], 'cursor': first_page['next_cursor']}
+
+            for _ in range(options['warmup']):
+                self._search(factory, payload)
+
+            timings = []
+            query_counts = []
+            data = {}
+            for _ in range(options['iterations']):
+                data, elapsed, query_count = self._search(factory, payload)
+                timings.append(elapsed * 1000)
+                query_counts.append(query_count)
+
+            if 'error' in data:
+                self.stdout.write(self.style.ERROR(f"{name:<16}failed: {data['error']}"))
+                continue
+
+            timings.sort()
+            self.stdout.write(
+                f"{name:<16}{data.get('total_count', 0):>9}"
+                f"{percentile(timings, 0.50):>10.1f}{percentile(timings, 0.95):>10.1f}{timings[-1]:>10.1f}"
+                f"{max(query_counts):>10}"
+            )
+
+    def _search(self, factory, payload):
+        """Run one search; returns (response data, seconds, query count)"""
+        request = factory.post(SEARCH_PATH, payload, format='json')
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = search_professionals(request)
+            elapsed = time.perf_counter() - start
+        return response.data, elapsed, len(queries.captured_queries)
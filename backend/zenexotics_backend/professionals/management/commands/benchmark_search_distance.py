@@ -0,0 +1,70 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from core.geo_utils import filter_within_radius, geodesic_distance
+from professionals.constants import DEFAULT_SEARCH_COORDINATES
+
+# Roughly the Colorado state bounds, where generated professionals are placed
+COLORADO_LAT_RANGE = (37.0, 41.0)
+COLORADO_LNG_RANGE = (-109.0, -102.0)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-professional geodesic distance filtering against the batched radius filter'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 100000],
+            help='Number of synthetic professionals to filter (default: 1000 10000 100000)'
+        )
+        parser.add_argument(
+            '--radius',
+            type=float,
+            default=30.0,
+            help='Search radius in miles (default: 30)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the generated coordinates'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        radius = options['radius']
+
+        for size in options['sizes']:
+            points = [
+                (rng.uniform(*COLORADO_LAT_RANGE), rng.uniform(*COLORADO_LNG_RANGE))
+                for _ in range(size)
+            ]
+
+            start = time.perf_counter()
+            geodesic_matches = {
+                index for index, point in enumerate(points)
+                if geodesic_distance(DEFAULT_SEARCH_COORDINATES, point) <= radius
+            }
+            geodesic_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batched_matches = {index for index, _ in filter_within_radius(DEFAULT_SEARCH_COORDINATES, points, radius)}
+            batched_seconds = time.perf_counter() - start
+
+            if batched_matches != geodesic_matches:
+                self.stdout.write(self.style.ERROR(
+                    f"{size} professionals: result mismatch "
+                    f"({len(batched_matches)} batched vs {len(geodesic_matches)} geodesic)"
+                ))
+                continue
+
+            speedup = geodesic_seconds / batched_seconds if batched_seconds else float('inf')
+            self.stdout.write(self.style.SUCCESS(
+                f"{size} professionals, {len(batched_matches)} within {radius} mi: "
+                f"geodesic {geodesic_seconds * 1000:.1f} ms, batched {batched_seconds * 1000:.1f} ms "
+                f"({speedup:.0f}x)"
+            ))
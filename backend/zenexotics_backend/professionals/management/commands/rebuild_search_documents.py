@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from professionals.models import ProfessionalSearchDocument
+from professionals.search_documents import rebuild_all_search_documents, refresh_search_documents, REFRESH_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Rebuild ProfessionalSearchDocument rows used by professional search'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--professional-id',
+            type=int,
+            action='append',
+            dest='professional_ids',
+            help='Only rebuild the document for this professional (can be repeated)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=REFRESH_BATCH_SIZE,
+            help=f'Professionals refreshed per batch (default: {REFRESH_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        professional_ids = options['professional_ids']
+
+        if professional_ids:
+            refreshed = refresh_search_documents(professional_ids)
+        else:
+            refreshed = rebuild_all_search_documents(batch_size=options['batch_size'])
+
+        searchable = ProfessionalSearchDocument.objects.filter(is_searchable=True).count()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {refreshed} search documents ({searchable} searchable)"))
@@ -0,0 +1,249 @@
+import random
+import secrets
+import string
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.booking_counters import rebuild_monthly_booking_counts
+from bookings.models import Booking
+from clients.models import Client
+from professionals.models import Professional
+from professionals.search_documents import refresh_search_documents, REFRESH_BATCH_SIZE
+from reviews.models import ClientReview
+from reviews.rating_aggregates import rebuild_rating_aggregates
+from services.animal_tokens import get_service_animal_tokens
+from services.models import Service
+from services.text_search import SERVICE_SEARCH_VECTOR, supports_full_text_search
+from user_addresses.models import Address, AddressType
+from users.models import User
+
+# Every generated user gets an address on this domain so the data can be found and removed again
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.crittrcove.invalid'
+
+# (city, zip, latitude, longitude) - professionals are scattered around these
+COLORADO_CITIES = [
+    ('Colorado Springs', '80903', 38.8339, -104.8214),
+    ('Denver', '80202', 39.7392, -104.9903),
+    ('Aurora', '80012', 39.7294, -104.8319),
+    ('Fort Collins', '80521', 40.5853, -105.0844),
+    ('Boulder', '80302', 40.0150, -105.2705),
+    ('Pueblo', '81003', 38.2544, -104.6091),
+    ('Grand Junction', '81501', 39.0639, -108.5506),
+    ('Castle Rock', '80104', 39.3722, -104.8561),
+]
+
+# Roughly a 15 mile spread around each city center
+COORDINATE_JITTER_DEGREES = 0.2
+
+ANIMAL_MENU = [
+    {'Dogs': 'Domestic'},
+    {'Cats': 'Domestic'},
+    {'Dogs': 'Domestic', 'Cats': 'Domestic'},
+    {'Bearded Dragons': 'Reptiles', 'Leopard Geckos': 'Reptiles'},
+    {'Snakes': 'Reptiles'},
+    {'Chickens': 'Farm Animals', 'Goats': 'Farm Animals'},
+    {'Horses': 'Farm Animals'},
+    {'Fish': 'Aquatic'},
+    {'Tarantulas': 'Invertebrates'},
+    {'Rabbits': 'Other', 'Guinea Pigs': 'Other'},
+    {'Parrots': 'Other'},
+]
+
+SERVICE_MENU = [
+    ('Dog Walking', 'Neighborhood walks with plenty of sniff time', '30 Min', False),
+    ('Drop-In Visit', 'Feeding, fresh water and a quick check on your pets', '30 Min', False),
+    ('Overnight Sitting', 'I stay at your home overnight with your pets', 'Per Night', True),
+    ('Boarding', 'Boarding at my house with a fenced yard', 'Per Day', True),
+    ('Reptile Care', 'Feeding, misting and enclosure temperature checks', 'Per Visit', False),
+    ('Farm Chores', 'Feeding, mucking out and egg collection', 'Per Visit', False),
+    ('Grooming', 'Bathing, brushing and nail trims', 'Per Visit', False),
+    ('Aquarium Maintenance', 'Water changes and filter cleaning for fish tanks', 'Per Visit', False),
+]
+
+REVIEW_TEXTS = [
+    'Took great care of our pets, would book again.',
+    'Very reliable and sent lots of photos.',
+    'Good communication, pets were happy.',
+    'Arrived late once but otherwise fine.',
+    'Absolutely wonderful with our animals!',
+]
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic marketplace (users, professionals, services, addresses, reviews) for search benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--professionals', type=int, default=1000, help='Professionals to create (default: 1000)')
+        parser.add_argument('--clients', type=int, default=100, help='Clients that write the reviews (default: 100)')
+        parser.add_argument('--max-services', type=int, default=3, help='Services per professional, 1 to N (default: 3)')
+        parser.add_argument('--max-reviews', type=int, default=4, help='Reviews per professional, 0 to N (default: 4)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, so runs are reproducible (default: 42)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert (default: 1000)')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated synthetic data first'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Allow running when DEBUG is off'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Refusing to seed synthetic data with DEBUG off (pass --force if you really mean it)')
+
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+
+        if options['clear']:
+            synthetic_emails = f"@{SYNTHETIC_EMAIL_DOMAIN}"
+            with transaction.atomic():
+                # Bookings protect their services, so they have to go before the users
+                deleted_bookings, _ = Booking.objects.filter(professional__user__email__endswith=synthetic_emails).delete()
+                deleted_users, _ = User.objects.filter(email__endswith=synthetic_emails).delete()
+            self.stdout.write(f"Deleted {deleted_bookings + deleted_users} synthetic rows")
+
+        # Not derived from --seed, so repeated runs never collide on email
+        run_id = ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(6))
+        # Bulk inserts skip the user post_save signals (welcome emails, default Client/Address rows),
+        # so everything those would create is built here explicitly
+        password = make_password(None)
+
+        with transaction.atomic():
+            client_users = User.objects.bulk_create([
+                self._build_user(f"client-{run_id}-{i}", f"Synthetic Client {i}", password)
+                for i in range(options['clients'])
+            ], batch_size=batch_size)
+            clients = Client.objects.bulk_create([
+                Client(user=user, about_me='', emergency_contact={}, authorized_household_members=[])
+                for user in client_users
+            ], batch_size=batch_size)
+
+            pro_users = User.objects.bulk_create([
+                self._build_user(f"pro-{run_id}-{i}", f"Synthetic Pro {i}", password)
+                for i in range(options['professionals'])
+            ], batch_size=batch_size)
+            professionals = Professional.objects.bulk_create([
+                Professional(
+                    user=user,
+                    bio='Synthetic professional for search benchmarks',
+                    is_background_checked=rng.random() < 0.3,
+                    is_insured=rng.random() < 0.25,
+                    is_elite_pro=rng.random() < 0.1
+                )
+                for user in pro_users
+            ], batch_size=batch_size)
+
+            Address.objects.bulk_create(
+                [self._build_address(user, rng) for user in pro_users],
+                batch_size=batch_size
+            )
+
+            services = Service.objects.bulk_create([
+                self._build_service(professional, rng)
+                for professional in professionals
+                for _ in range(rng.randint(1, max(options['max_services'], 1)))
+            ], batch_size=batch_size)
+            if supports_full_text_search():
+                Service.objects.filter(service_id__in=[s.service_id for s in services]).update(
+                    search_vector=SERVICE_SEARCH_VECTOR
+                )
+
+            services_by_professional = {}
+            for service in services:
+                services_by_professional.setdefault(service.professional_id, []).append(service)
+
+            review_specs = []
+            if clients:
+                for professional in professionals:
+                    for _ in range(rng.randint(0, max(options['max_reviews'], 0))):
+                        review_specs.append((
+                            professional,
+                            rng.choice(clients),
+                            rng.choice(services_by_professional[professional.professional_id])
+                        ))
+
+            bookings = Booking.objects.bulk_create([
+                Booking(client=client, professional=professional, service_id=service, status='Completed')
+                for professional, client, service in review_specs
+            ], batch_size=batch_size)
+            now = timezone.now()
+            ClientReview.objects.bulk_create([
+                ClientReview(
+                    booking=booking,
+                    client=booking.client,
+                    professional=booking.professional,
+                    rating=rng.choices([5, 4, 3, 2, 1], weights=[50, 30, 12, 5, 3])[0],
+                    review_text=rng.choice(REVIEW_TEXTS),
+                    status='APPROVED',
+                    review_visible=rng.random() < 0.9,
+                    review_posted=True,
+                    post_deadline=now - timedelta(days=rng.randint(0, 365))
+                )
+                for booking in bookings
+            ], batch_size=batch_size)
+
+            # Bulk inserts skip the booking/review/service signals, so rebuild the derived data in batches
+            rebuild_monthly_booking_counts([user.id for user in client_users + pro_users])
+            professional_ids = [p.professional_id for p in professionals]
+            rebuild_rating_aggregates(professional_ids)
+            for start in range(0, len(professional_ids), REFRESH_BATCH_SIZE):
+                refresh_search_documents(professional_ids[start:start + REFRESH_BATCH_SIZE])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(professionals)} professionals, {len(services)} services, "
+            f"{len(clients)} clients and {len(bookings)} reviews (run {run_id})"
+        ))
+
+    def _build_user(self, local_part, name, password):
+        return User(
+            user_id='user_' + ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(9)),
+            email=f"{local_part}@{SYNTHETIC_EMAIL_DOMAIN}",
+            name=name,
+            password=password,
+            email_is_verified=True
+        )
+
+    def _build_address(self, user, rng):
+        city, zip_code, center_lat, center_lng = rng.choice(COLORADO_CITIES)
+        latitude = center_lat + rng.uniform(-COORDINATE_JITTER_DEGREES, COORDINATE_JITTER_DEGREES)
+        longitude = center_lng + rng.uniform(-COORDINATE_JITTER_DEGREES, COORDINATE_JITTER_DEGREES)
+        address = Address(
+            user=user,
+            address_type=AddressType.SERVICE,
+            address_line_1=f"{rng.randint(100, 9999)} Main St",
+            city=city,
+            state='CO',
+            zip=zip_code,
+            country='USA',
+            coordinates={'latitude': latitude, 'longitude': longitude}
+        )
+        # bulk_create skips Address.save(), which normally fills the indexed columns
+        address.sync_coordinate_columns()
+        return address
+
+    def _build_service(self, professional, rng):
+        service_name, description, unit_of_time, is_overnight = rng.choice(SERVICE_MENU)
+        animal_types = dict(rng.choice(ANIMAL_MENU))
+        return Service(
+            professional=professional,
+            service_name=service_name,
+            description=description,
+            animal_types=animal_types,
+            # bulk_create skips Service.save(), which normally fills the tokens
+            animal_tokens=get_service_animal_tokens(animal_types),
+            base_rate=Decimal(rng.randint(15, 120)),
+            additional_animal_rate=Decimal(rng.randint(0, 15)),
+            holiday_rate=Decimal(10),
+            unit_of_time=unit_of_time,
+            is_overnight=is_overnight,
+            moderation_status='APPROVED' if rng.random() < 0.95 else 'PENDING'
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:14
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_alter_clientreview_status_and_more'),
+        ('professionals', '0004_add_badge_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfessionalSearchDocument',
+            fields=[
+                ('professional', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='professionals.professional')),
+                ('is_searchable', models.BooleanField(default=False)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('is_background_checked', models.BooleanField(default=False)),
+                ('is_insured', models.BooleanField(default=False)),
+                ('is_elite_pro', models.BooleanField(default=False)),
+                ('services', models.JSONField(blank=True, default=list, help_text='Summaries of every searchable service')),
+                ('best_services_by_category', models.JSONField(blank=True, default=dict, help_text='Animal category -> service_id of the best service to display')),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('animal_tokens', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, size=None)),
+                ('average_rating', models.FloatField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('latest_highlight_review', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reviews.clientreview')),
+            ],
+            options={
+                'verbose_name': 'Professional Search Document',
+                'verbose_name_plural': 'Professional Search Documents',
+                'db_table': 'professional_search_documents',
+                'indexes': [models.Index(fields=['is_searchable', 'latitude', 'longitude'], name='search_doc_location_idx'), models.Index(fields=['is_searchable', 'min_price', 'max_price'], name='search_doc_price_idx'), django.contrib.postgres.indexes.GinIndex(fields=['animal_tokens'], name='search_doc_animal_tokens_gin')],
+            },
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:20
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Professional = apps.get_model('professionals', 'Professional')
+    ClientReview = apps.get_model('reviews', 'ClientReview')
+
+    counted_reviews = ClientReview.objects.filter(status='APPROVED', review_visible=True)
+    stats = {
+        row['professional_id']: row
+        for row in counted_reviews.values('professional_id').annotate(
+            review_count=Count('review_id'),
+            rating_total=Sum('rating')
+        )
+    }
+    highlights = {}
+    for professional_id, review_id in counted_reviews.filter(rating=5).order_by(
+        'professional_id', 'created_at', 'review_id'
+    ).values_list('professional_id', 'review_id'):
+        highlights[professional_id] = review_id  # Ordered ascending, so the latest wins
+
+    professionals = list(Professional.objects.filter(professional_id__in=set(stats) | set(highlights)))
+    for professional in professionals:
+        row = stats.get(professional.professional_id)
+        professional.review_count = row['review_count'] if row else 0
+        professional.review_rating_total = row['rating_total'] if row else 0
+        professional.average_rating = (
+            professional.review_rating_total / professional.review_count if professional.review_count else 0
+        )
+        professional.latest_highlight_review_id = highlights.get(professional.professional_id)
+    Professional.objects.bulk_update(
+        professionals,
+        ['review_count', 'review_rating_total', 'average_rating', 'latest_highlight_review'],
+        batch_size=500
+    )
+
+
+def reverse_backfill_rating_aggregates(apps, schema_editor):
+    # Columns are dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_alter_clientreview_status_and_more'),
+        ('professionals', '0005_professionalsearchdocument'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='professionalsearchdocument',
+            name='average_rating',
+        ),
+        migrations.RemoveField(
+            model_name='professionalsearchdocument',
+            name='latest_highlight_review',
+        ),
+        migrations.RemoveField(
+            model_name='professionalsearchdocument',
+            name='review_count',
+        ),
+        migrations.AddField(
+            model_name='professional',
+            name='average_rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='professional',
+            name='latest_highlight_review',
+            field=models.ForeignKey(blank=True, help_text='Latest 5-star review, shown as the highlight in search results', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reviews.clientreview'),
+        ),
+        migrations.AddField(
+            model_name='professional',
+            name='review_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='professional',
+            name='review_rating_total',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, reverse_backfill_rating_aggregates),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 import logging
 
 class Professional(models.Model):
@@ -13,6 +15,19 @@ class Professional(models.Model):
     is_insured = models.BooleanField(default=False)
     is_background_checked = models.BooleanField(default=False)
     is_elite_pro = models.BooleanField(default=False)
+    # Aggregates over APPROVED, visible ClientReviews, maintained by reviews.rating_aggregates.
+    # Never set these directly - run rebuild_rating_aggregates if they drift.
+    average_rating = models.FloatField(default=0)
+    review_count = models.IntegerField(default=0)
+    review_rating_total = models.IntegerField(default=0)
+    latest_highlight_review = models.ForeignKey(
+        'reviews.ClientReview',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Latest 5-star review, shown as the highlight in search results'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -47,4 +62,54 @@ class Professional(models.Model):
         verbose_name_plural = 'Professionals'
 
     def __str__(self):
-        return f"Professional: {self.user.name}" 
\ No newline at end of file
+        return f"Professional: {self.user.name}" 
+
+
+class ProfessionalSearchDocument(models.Model):
+    """
+    Denormalized, precomputed view of a professional used by search_professionals.
+    Rebuilt by professionals.search_documents whenever the underlying Service, Address,
+    User or Professional rows change, so a search only needs to scan this table
+    instead of joining all of them on every request.
+    """
+    professional = models.OneToOneField(
+        Professional,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    # True when the user is active/visible/not deleted and has at least one searchable service
+    is_searchable = models.BooleanField(default=False)
+
+    # Service address (copied from the SERVICE Address)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+
+    # Badges (copied from Professional)
+    is_background_checked = models.BooleanField(default=False)
+    is_insured = models.BooleanField(default=False)
+    is_elite_pro = models.BooleanField(default=False)
+
+    # Searchable services (APPROVED, active, searchable, not archived)
+    services = models.JSONField(default=list, blank=True, help_text='Summaries of every searchable service')
+    best_services_by_category = models.JSONField(default=dict, blank=True, help_text='Animal category -> service_id of the best service to display')
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    animal_tokens = ArrayField(models.CharField(max_length=100), default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'professional_search_documents'
+        verbose_name = 'Professional Search Document'
+        verbose_name_plural = 'Professional Search Documents'
+        indexes = [
+            models.Index(fields=['is_searchable', 'latitude', 'longitude'], name='search_doc_location_idx'),
+            models.Index(fields=['is_searchable', 'min_price', 'max_price'], name='search_doc_price_idx'),
+            GinIndex(fields=['animal_tokens'], name='search_doc_animal_tokens_gin'),
+        ]
+
+    def __str__(self):
+        return f"Search document for professional {self.professional_id}"
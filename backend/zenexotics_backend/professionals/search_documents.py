@@ -0,0 +1,193 @@
+"""
+Builds and maintains ProfessionalSearchDocument rows.
+
+Each document is recomputed from scratch for a professional (it's cheap and
+keeps the logic in one place), batched so a backfill or a burst of signal
+refreshes costs a fixed number of queries per batch instead of per professional.
+"""
+
+import logging
+from decimal import Decimal
+
+from core.commit_batches import CommitBatches
+from .models import Professional, ProfessionalSearchDocument
+
+logger = logging.getLogger(__name__)
+
+# Filters a Service must match to show up in search
+SEARCHABLE_SERVICE_FILTERS = {
+    'moderation_status': 'APPROVED',
+    'is_active': True,
+    'searchable': True,
+    'is_archived': False,
+}
+
+# Fields copied into ProfessionalSearchDocument on refresh
+SEARCH_DOCUMENT_FIELDS = [
+    'is_searchable', 'latitude', 'longitude', 'city', 'state',
+    'is_background_checked', 'is_insured', 'is_elite_pro',
+    'services', 'best_services_by_category', 'min_price', 'max_price', 'animal_tokens',
+]
+
+# User fields that affect search visibility or the data shown in results
+SEARCH_RELEVANT_USER_FIELDS = {'is_active', 'is_deleted', 'is_profile_visible', 'name', 'profile_picture'}
+
+REFRESH_BATCH_SIZE = 500
+
+
+def serialize_service_for_search(service):
+    """Snapshot of the Service fields search needs to filter, rank and display a service"""
+    return {
+        'service_id': service.service_id,
+        'service_name': service.service_name,
+        'animal_types': service.animal_types if isinstance(service.animal_types, dict) else {},
+        'animal_tokens': list(service.animal_tokens or []),
+        'base_rate': str(service.base_rate),
+        'unit_of_time': service.unit_of_time,
+        'is_overnight': service.is_overnight,
+    }
+
+
+def select_best_service_summary(service_summaries):
+    """
+    Pick the service to display for a professional from serialized services:
+    highest base_rate first, then service_name (descending) as the tie-break.
+    """
+    if not service_summaries:
+        return None
+    return max(service_summaries, key=lambda s: (Decimal(s['base_rate']), s['service_name']))
+
+
+def _best_services_by_category(service_summaries):
+    """Map each animal category offered to the service_id of the best service covering it"""
+    by_category = {}
+    for summary in service_summaries:
+        for category in set(summary['animal_types'].values()):
+            if category:
+                by_category.setdefault(category, []).append(summary)
+    return {
+        category: select_best_service_summary(summaries)['service_id']
+        for category, summaries in by_category.items()
+    }
+
+
+def _animal_tokens(service_summaries):
+    """Union of the animal tokens of all searchable services"""
+    tokens = set()
+    for summary in service_summaries:
+        tokens.update(summary['animal_tokens'])
+    return sorted(tokens)
+
+
+def _build_document(professional, address, service_summaries):
+    """Build an unsaved ProfessionalSearchDocument for one professional"""
+    from core.geo_utils import extract_lat_lng
+
+    user = professional.user
+    latitude, longitude = (address.latitude, address.longitude) if address else (None, None)
+    if address and latitude is None:
+        latitude, longitude = extract_lat_lng(address.coordinates)
+
+    prices = [Decimal(summary['base_rate']) for summary in service_summaries]
+
+    is_searchable = bool(
+        service_summaries
+        and latitude is not None
+        and longitude is not None
+        and user.is_active
+        and not user.is_deleted
+        and user.is_profile_visible
+    )
+
+    return ProfessionalSearchDocument(
+        professional=professional,
+        is_searchable=is_searchable,
+        latitude=latitude,
+        longitude=longitude,
+        city=address.city if address else '',
+        state=address.state if address else '',
+        is_background_checked=professional.is_background_checked,
+        is_insured=professional.is_insured,
+        is_elite_pro=professional.is_elite_pro,
+        services=service_summaries,
+        best_services_by_category=_best_services_by_category(service_summaries),
+        min_price=min(prices) if prices else None,
+        max_price=max(prices) if prices else None,
+        animal_tokens=_animal_tokens(service_summaries),
+    )
+
+
+def refresh_search_documents(professional_ids):
+    """
+    Recompute the search documents for the given professionals in one batch.
+    Uses a fixed number of queries regardless of how many professionals are passed.
+    """
+    from services.models import Service
+    from user_addresses.models import Address, AddressType
+
+    professional_ids = {pid for pid in professional_ids if pid is not None}
+    if not professional_ids:
+        return 0
+
+    professionals = list(Professional.objects.filter(professional_id__in=professional_ids).select_related('user'))
+    if not professionals:
+        return 0
+    professional_ids = [p.professional_id for p in professionals]
+
+    addresses_by_user = {}
+    for address in Address.objects.filter(
+        user__professional_profile__professional_id__in=professional_ids,
+        address_type=AddressType.SERVICE
+    ).order_by('address_id'):
+        addresses_by_user[address.user_id] = address
+
+    services_by_professional = {}
+    for service in Service.objects.filter(
+        professional_id__in=professional_ids,
+        **SEARCHABLE_SERVICE_FILTERS
+    ).order_by('service_id'):
+        services_by_professional.setdefault(service.professional_id, []).append(serialize_service_for_search(service))
+
+    documents = [
+        _build_document(
+            professional,
+            addresses_by_user.get(professional.user_id),
+            services_by_professional.get(professional.professional_id, []),
+        )
+        for professional in professionals
+    ]
+
+    ProfessionalSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['professional'],
+        update_fields=SEARCH_DOCUMENT_FIELDS,
+    )
+    return len(documents)
+
+
+def rebuild_all_search_documents(batch_size=REFRESH_BATCH_SIZE):
+    """Recompute every professional's search document (backfills / repairs)"""
+    all_ids = list(Professional.objects.order_by('professional_id').values_list('professional_id', flat=True))
+    refreshed = 0
+    for start in range(0, len(all_ids), batch_size):
+        refreshed += refresh_search_documents(all_ids[start:start + batch_size])
+    return refreshed
+
+
+def _flush_pending_refreshes(professional_ids):
+    try:
+        refresh_search_documents(professional_ids)
+    except Exception as e:
+        logger.error(f"Failed to refresh search documents for professionals {sorted(professional_ids)}: {str(e)}")
+
+
+_pending = CommitBatches(_flush_pending_refreshes, 'professional_ids')
+
+
+def schedule_search_document_refresh(professional_id):
+    """
+    Queue a professional's search document for refresh once the current transaction commits.
+    Several changes to the same professional inside one transaction result in a single refresh.
+    """
+    _pending.add(professional_ids=professional_id)
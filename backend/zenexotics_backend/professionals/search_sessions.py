@@ -0,0 +1,107 @@
+"""
+Search sessions for search_professionals.
+
+The first request of a search computes the full filtered and ranked result
+list once, orders it with a seed derived from the search token, and caches
+the ordered (professional, service) pairs under that token. Later pages pass
+the token and a cursor and are served by slicing the cached list, so filters
+and distances are not recomputed and pages never overlap or skip anyone.
+
+If the cache entry is gone (expired, or another worker served the first
+page), the search is recomputed with the same token and therefore the same
+seed, so the ordering stays stable as long as the underlying data hasn't changed.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SESSION_TTL_SECONDS = 10 * 60
+SEARCH_SESSION_CACHE_PREFIX = 'professional_search_session'
+MAX_SEARCH_PAGE_SIZE = 100
+
+
+def new_search_token():
+    return uuid.uuid4().hex
+
+
+def is_valid_search_token(search_token):
+    if not isinstance(search_token, str) or len(search_token) != 32:
+        return False
+    try:
+        int(search_token, 16)
+    except ValueError:
+        return False
+    return True
+
+
+def get_search_rng(search_token):
+    """Random generator seeded from the token, so the same search orders results the same way"""
+    return random.Random(int(search_token, 16))
+
+
+def get_search_params_key(search_params):
+    """Stable hash of the parameters that affect the result set (page/cursor excluded)"""
+    serialized = json.dumps(search_params, sort_keys=True, default=str)
+    return hashlib.md5(serialized.encode('utf-8')).hexdigest()
+
+
+def _cache_key(search_token):
+    return f"{SEARCH_SESSION_CACHE_PREFIX}_{search_token}"
+
+
+def save_search_session(search_token, params_key, entries, fallback_message, search_location):
+    """
+    Cache an ordered result set.
+
+    Args:
+        entries: Ordered list of (professional_id, service_id, match_type, distance)
+    """
+    cache.set(_cache_key(search_token), {
+        'params_key': params_key,
+        'entries': entries,
+        'fallback_message': fallback_message,
+        'search_location': search_location,
+    }, SEARCH_SESSION_TTL_SECONDS)
+
+
+def get_search_session(search_token, params_key):
+    """Return the cached session for this token, or None if it's missing or was made for other parameters"""
+    session = cache.get(_cache_key(search_token))
+    if session is None:
+        return None
+    if session['params_key'] != params_key:
+        logger.debug(f"Search token {search_token} was issued for different parameters, recomputing")
+        return None
+    return session
+
+
+def parse_page(page, page_size, default_page_size=20):
+    """page and page_size from the request as ints, page >= 1 and 1 <= page_size <= MAX_SEARCH_PAGE_SIZE"""
+    try:
+        page = max(int(page), 1)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid search page: {page}")
+        page = 1
+    try:
+        page_size = min(max(int(page_size), 1), MAX_SEARCH_PAGE_SIZE)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid search page_size: {page_size}")
+        page_size = default_page_size
+    return page, page_size
+
+
+def parse_cursor(cursor, page, page_size):
+    """Offset into the ordered result list from a cursor, falling back to page/page_size"""
+    if cursor not in (None, ''):
+        try:
+            return max(int(cursor), 0)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid search cursor: {cursor}")
+    return max(page - 1, 0) * page_size
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from services.models import Service
+from user_addresses.models import Address
+from .models import Professional
+from .search_documents import schedule_search_document_refresh, SEARCH_RELEVANT_USER_FIELDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _schedule_refresh_for_user(user_id):
+    """Refresh the search document of the professional owned by user_id, if there is one"""
+    professional_id = Professional.objects.filter(user_id=user_id).values_list('professional_id', flat=True).first()
+    if professional_id:
+        schedule_search_document_refresh(professional_id)
+
+
+@receiver(post_save, sender=Professional)
+def refresh_search_document_on_professional_change(sender, instance, **kwargs):
+    """Badges live on Professional, and a new professional needs its first document"""
+    schedule_search_document_refresh(instance.professional_id)
+
+
+@receiver([post_save, post_delete], sender=Service)
+def refresh_search_document_on_service_change(sender, instance, **kwargs):
+    """Services drive prices, animal tokens and which services are searchable"""
+    schedule_search_document_refresh(instance.professional_id)
+
+
+@receiver([post_save, post_delete], sender=Address)
+def refresh_search_document_on_address_change(sender, instance, **kwargs):
+    """The SERVICE address provides the document's coordinates and city/state"""
+    _schedule_refresh_for_user(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_search_document_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    """User visibility flags decide whether the professional is searchable at all"""
+    if created:
+        return
+    # Skip saves that only touch unrelated fields (e.g. last_login)
+    if update_fields is not None and not (set(update_fields) & SEARCH_RELEVANT_USER_FIELDS):
+        return
+    _schedule_refresh_for_user(instance.pk)
+
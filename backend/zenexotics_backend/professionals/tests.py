@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase
+
+from professionals.search_sessions import MAX_SEARCH_PAGE_SIZE, parse_cursor, parse_page
+
+
+class SearchPaginationTests(SimpleTestCase):
+    def test_page_and_page_size_are_clamped(self):
+        self.assertEqual(parse_page(3, 10), (3, 10))
+        self.assertEqual(parse_page('2', '5'), (2, 5))
+        self.assertEqual(parse_page(0, 0), (1, 1))
+        self.assertEqual(parse_page(-4, -10), (1, 1))
+        self.assertEqual(parse_page(1, 10000), (1, MAX_SEARCH_PAGE_SIZE))
+
+    def test_invalid_values_fall_back_to_defaults(self):
+        self.assertEqual(parse_page('x', None), (1, 20))
+        self.assertEqual(parse_page([2], 'ten'), (1, 20))
+
+    def test_cursor_overrides_the_page(self):
+        self.assertEqual(parse_cursor(None, 3, 20), 40)
+        self.assertEqual(parse_cursor('15', 3, 20), 15)
+        self.assertEqual(parse_cursor('-5', 3, 20), 0)
+        self.assertEqual(parse_cursor('abc', 2, 20), 20)
@@ -4,7 +4,8 @@ from rest_framework.response import Response
 from rest_framework import status, serializers
 from django.utils import timezone
 from datetime import date
-from ..models import Professional
+from decimal import Decimal
+from ..models import Professional, ProfessionalSearchDocument
 from ..serializers import ProfessionalDashboardSerializer, BookingOccurrenceSerializer, ClientProfessionalProfileSerializer
 from bookings.models import Booking
 from booking_occurrences.models import BookingOccurrence
@@ -14,15 +15,18 @@ from bookings.constants import BookingStates
 from services.models import Service
 from django.shortcuts import get_object_or_404
 from payment_methods.models import PaymentMethod
-from django.db.models import Q, Count
-from user_addresses.models import Address, AddressType
-from geopy.distance import geodesic
-import requests
-import random
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Case, When, Value, IntegerField, Avg
-from reviews.models import ClientReview
-from logs.models import SearchLog, GetMatchedLog
+from logs.models import GetMatchedLog
+from logs.search_log_buffer import build_search_log_entry, enqueue_search_log
+from core.geo_utils import get_bounding_box, filter_within_radius
+from services.animal_tokens import get_requested_animal_tokens
+from services.text_search import get_relevance_by_service
+from locations.geocoding import geocode_location
+from ..search_documents import select_best_service_summary, SEARCHABLE_SERVICE_FILTERS
+from ..constants import DEFAULT_SEARCH_COORDINATES, DEFAULT_SEARCH_LOCATION
+from ..search_sessions import (
+    new_search_token, is_valid_search_token, get_search_rng, get_search_params_key,
+    get_search_session, save_search_session, parse_cursor, parse_page
+)
 
 # Configure logging to print to console
 logger = logging.getLogger(__name__)
@@ -38,69 +42,177 @@ class SimplePetSerializer(serializers.ModelSerializer):
         model = Pet
         fields = ['pet_id', 'name', 'species', 'breed']
 
-def geocode_location(location_string):
+def find_search_candidates(center, radius_miles, price_min, price_max, animal_tokens=None,
+                           filter_background_checked=False, filter_insured=False, filter_elite_pro=False):
     """
-    Geocode a location string using Nominatim API
-    Returns (latitude, longitude) tuple or None if failed
+    Load the searchable professionals within radius_miles of center, in one query.
+
+    The bounding box around the search radius hits the (is_searchable, latitude, longitude)
+    index on the search documents, then distances for everything inside the box are
+    computed in one batch (see filter_within_radius).
+
+    Returns:
+        list: Dicts with 'professional', 'document', 'distance' and 'coordinates'
     """
-    if not location_string or location_string.strip() == '':
-        return None
-        
-    try:
-        url = 'https://nominatim.openstreetmap.org/search'
-        params = {
-            'q': f"{location_string}, Colorado, USA",
-            'format': 'json',
-            'limit': '1',
-            'countrycodes': 'us',
-            'addressdetails': '1'
-        }
-        
-        headers = {
-            'User-Agent': 'CrittrCove/1.0 (contact@crittrcove.com)'
-        }
-        
-        response = requests.get(url, params=params, headers=headers, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data and len(data) > 0:
-                result = data[0]
-                lat = float(result['lat'])
-                lng = float(result['lon'])
-                
-                # Validate coordinates are within Colorado bounds
-                if 37.0 <= lat <= 41.0 and -109.0 <= lng <= -102.0:
-                    return (lat, lng)
-                    
-        return None
-    except Exception as e:
-        logger.error(f"Geocoding failed for '{location_string}': {str(e)}")
-        return None
+    min_lat, max_lat, min_lng, max_lng = get_bounding_box(center, radius_miles)
+    documents = ProfessionalSearchDocument.objects.filter(
+        is_searchable=True,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng)
+    ).select_related('professional__user', 'professional__latest_highlight_review__client__user')
+
+    # Apply badge filters
+    if filter_background_checked:
+        documents = documents.filter(is_background_checked=True)
+    if filter_insured:
+        documents = documents.filter(is_insured=True)
+    if filter_elite_pro:
+        documents = documents.filter(is_elite_pro=True)
+
+    # Only professionals offering at least one requested animal (GIN index on animal_tokens)
+    if animal_tokens:
+        documents = documents.filter(animal_tokens__overlap=animal_tokens)
+
+    # Skip professionals whose whole price range falls outside the requested range
+    # Ordered so a seeded shuffle of the results is reproducible (see professionals.search_sessions)
+    documents = list(documents.filter(max_price__gte=price_min, min_price__lte=price_max).order_by('professional_id'))
+
+    document_coords = [(document.latitude, document.longitude) for document in documents]
+    candidates = []
+    for index, distance in filter_within_radius(center, document_coords, radius_miles):
+        document = documents[index]
+        candidates.append({
+            'professional': document.professional,
+            'document': document,
+            'distance': distance,
+            'coordinates': document_coords[index]
+        })
+    return candidates
 
-def calculate_distance(coord1, coord2):
+def filter_services_by_animal_tokens(services, animal_tokens):
     """
-    Calculate distance between two coordinate pairs using geopy
-    Returns distance in miles
+    Keep the serialized services that cover at least one of the requested animals.
+    Both sides are normalized tokens (see services.animal_tokens), so this is a set intersection.
     """
-    try:
-        return geodesic(coord1, coord2).miles
-    except Exception:
-        return float('inf')
+    requested = set(animal_tokens)
+    return [service for service in services if requested.intersection(service.get('animal_tokens', []))]
+
+def build_search_result(candidate, best_service, match_type):
+    """Format one search result from a candidate (see find_search_candidates) and its chosen service"""
+    professional = candidate['professional']
+    document = candidate['document']
+
+    # Format location string
+    location_parts = []
+    if document.city:
+        location_parts.append(document.city)
+    if document.state:
+        location_parts.append(document.state)
+    location_str = ', '.join(location_parts)
+
+    # Get profile picture URL
+    profile_picture_url = None
+    if professional.user.profile_picture:
+        profile_picture_url = professional.user.profile_picture.url
+
+    # Format the average rating (5.0 if >= 4.995, otherwise round to 2 decimal places)
+    avg_rating = professional.average_rating
+    formatted_avg_rating = 5.0 if avg_rating >= 4.995 else round(avg_rating, 2)
+
+    # The latest 5-star review is maintained on the professional
+    latest_review_text = None
+    latest_review_author_profile_pic = None
+    review = professional.latest_highlight_review
+    if review:
+        latest_review_text = review.review_text
+        if (review.client and
+                review.client.user and
+                hasattr(review.client.user, 'profile_picture') and
+                review.client.user.profile_picture):
+            latest_review_author_profile_pic = review.client.user.profile_picture.url
+
+    return {
+        'professional_id': professional.professional_id,
+        'name': professional.user.name,
+        'profile_picture_url': profile_picture_url,
+        'location': location_str,
+        'coordinates': {
+            'latitude': document.latitude,
+            'longitude': document.longitude
+        },
+        'primary_service': {
+            'service_id': best_service['service_id'],
+            'service_name': best_service['service_name'],
+            'price_per_visit': float(best_service['base_rate']),
+            'unit_of_time': best_service['unit_of_time'],
+            'is_overnight': best_service['is_overnight']
+        },
+        'match_type': match_type,
+        'distance': candidate['distance'],
+        'reviews': {
+            'average_rating': formatted_avg_rating,
+            'review_count': professional.review_count,
+            'latest_highest_review_text': latest_review_text,
+            'latest_review_author_profile_pic': latest_review_author_profile_pic
+        },
+        'badges': {
+            'is_background_checked': document.is_background_checked,
+            'is_insured': document.is_insured,
+            'is_elite_pro': document.is_elite_pro
+        }
+    }
 
-def select_best_service_for_display(services):
+def load_search_session_results(entries):
     """
-    Select the best service to display for a professional.
-    Prioritizes by base_rate (highest first), then alphabetically by service_name.
+    Rebuild the result dicts for a slice of a cached search session in one query.
+    Professionals or services that stopped being searchable since the search ran are dropped.
+
+    Args:
+        entries: (professional_id, service_id, match_type, distance) tuples, in display order
     """
-    if not services:
-        return None
-    
-    # Sort by base_rate descending, then by service_name ascending
-    sorted_services = sorted(services, 
-                           key=lambda s: (float(s.base_rate), s.service_name), 
-                           reverse=True)
-    return sorted_services[0]
+    documents = ProfessionalSearchDocument.objects.filter(
+        professional_id__in=[entry[0] for entry in entries],
+        is_searchable=True
+    ).select_related('professional__user', 'professional__latest_highlight_review__client__user')
+    documents_by_professional = {document.professional_id: document for document in documents}
+
+    results = []
+    for professional_id, service_id, match_type, distance in entries:
+        document = documents_by_professional.get(professional_id)
+        if not document:
+            continue
+        best_service = next((service for service in document.services if service['service_id'] == service_id), None)
+        if not best_service:
+            continue
+        candidate = {
+            'professional': document.professional,
+            'document': document,
+            'distance': distance,
+            'coordinates': (document.latitude, document.longitude)
+        }
+        results.append(build_search_result(candidate, best_service, match_type))
+    return results
+
+def build_search_page_response(page_results, total_count, offset, page_size, fallback_message, search_location, search_token):
+    """Response body for one page of search results"""
+    # Remove match_type from final response (internal use only)
+    for result in page_results:
+        del result['match_type']
+        del result['distance']  # Remove distance for now as requested
+
+    end_idx = offset + page_size
+    has_more = end_idx < total_count
+    return {
+        'professionals': page_results,
+        'total_count': total_count,
+        'has_more': has_more,
+        'page': offset // page_size + 1,
+        'page_size': page_size,
+        'fallback_message': fallback_message,
+        'search_location': search_location,
+        'search_token': search_token,
+        'next_cursor': str(end_idx) if has_more else None
+    }
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -225,7 +337,10 @@ def get_professional_dashboard(request):
 
 #   Within each of the 6 groups above, results are completely
 #   randomized to ensure fairness and prevent any particular
-#   professional from always appearing first.
+#   professional from always appearing first. The shuffle is seeded
+#   from the search token, and the ordered list is cached for the
+#   token (see professionals.search_sessions), so paging through one
+#   search never repeats or skips a professional.
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def search_professionals(request):
@@ -233,15 +348,9 @@ def search_professionals(request):
     Search for professionals based on various criteria
     
     Performance optimizations:
-    - Uses select_related and prefetch_related to minimize database queries
-    - Batch fetches services, addresses, and reviews to avoid N+1 queries
-    - Pre-aggregates review data to avoid individual calculations
-    
-    Recommended database indexes for optimal performance:
-    - (professional_id, moderation_status, is_active, searchable, is_archived) on services table
-    - (user_id, address_type) on addresses table
-    - (professional_id, status, review_visible, rating) on reviews table
-    - Coordinates field should be indexed for geospatial queries
+    - Reads precomputed ProfessionalSearchDocument rows (location, services, badges) joined to the
+      rating aggregates stored on Professional, so each candidate pass is a single query
+    - Bounding-box prefilter on the (is_searchable, latitude, longitude) index, then batched distances
     """
     try:
         # Get search parameters
@@ -261,37 +370,49 @@ def search_professionals(request):
         # Logging control
         skip_logging = data.get('skip_logging', False)
         filter_elite_pro = data.get('filter_elite_pro', False)
+        # Search session: token from the first page, cursor for the following ones
+        search_token = data.get('search_token')
+        cursor = data.get('cursor')
         
         logger.debug(f"Search parameters: {data}")
         logger.debug(f"Current user: {request.user if request.user.is_authenticated else 'Anonymous'}")
         
+        search_params = {
+            'animal_types': animal_types,
+            'location': location,
+            'service_query': service_query,
+            'overnight_service': overnight_service,
+            'price_min': price_min,
+            'price_max': price_max,
+            'radius_miles': radius_miles,
+            'filter_background_checked': filter_background_checked,
+            'filter_insured': filter_insured,
+            'filter_elite_pro': filter_elite_pro
+        }
+        params_key = get_search_params_key(search_params)
+        page, page_size = parse_page(page, page_size)
+        offset = parse_cursor(cursor, page, page_size)
+        
+        # Later pages of a search are sliced from the cached, already ordered result set
+        if search_token and is_valid_search_token(search_token):
+            session = get_search_session(search_token, params_key)
+            if session:
+                entries = session['entries']
+                page_results = load_search_session_results(entries[offset:offset + page_size])
+                return Response(build_search_page_response(
+                    page_results, len(entries), offset, page_size,
+                    session['fallback_message'], session['search_location'], search_token
+                ))
+        else:
+            search_token = new_search_token()
+        
         # Check if service_query is "All Services" or similar
         is_all_services = service_query.lower() in ['all services', 'all', '']
         original_service_query = service_query  # Store original for fallback messaging
         
-        # Start with all professionals who have approved services - optimized with select_related
-        # Exclude deleted and inactive users
-        professionals_query = Professional.objects.select_related('user').prefetch_related(
-            'service_set'
-        ).filter(
-            service__moderation_status='APPROVED',
-            service__is_active=True,
-            service__searchable=True,
-            service__is_archived=False,
-            user__is_deleted=False,  # Exclude deleted users
-            user__is_active=True,  # Exclude inactive users
-            user__is_profile_visible=True  # Exclude users with profile visibility off
-        ).distinct()
-        
-        # Apply badge filters
-        if filter_background_checked:
-            professionals_query = professionals_query.filter(is_background_checked=True)
-        if filter_insured:
-            professionals_query = professionals_query.filter(is_insured=True)
-        if filter_elite_pro:
-            professionals_query = professionals_query.filter(is_elite_pro=True)
-        
-        logger.debug(f"Found {professionals_query.count()} professionals with approved services")
+        # Normalize requested animals (plurals, synonyms like lizard -> bearded dragon) once up front
+        requested_animal_tokens = get_requested_animal_tokens(animal_types) if animal_types else []
+        logger.debug(f"Requested animal tokens: {requested_animal_tokens}")
         
         # Get user coordinates if location is provided and not empty
         user_coords = None
@@ -305,167 +426,44 @@ def search_professionals(request):
         
         # If no location provided or geocoding failed, default to Colorado Springs
         if not user_coords:
-            user_coords = (38.8339, -104.8214)  # Colorado Springs coordinates
-            used_location = "Colorado Springs, Colorado"
-        
-        # Filter professionals by location (must have coordinates) - optimized batch query
-        professionals_with_location = []
-        
-        # Pre-fetch all addresses in a single query
-        addresses_dict = {}
-        addresses = Address.objects.filter(
-            user__in=[p.user for p in professionals_query],
-            address_type=AddressType.SERVICE
-        ).select_related('user')
-        
-        for address in addresses:
-            addresses_dict[address.user.id] = address
-        
-        for professional in professionals_query:
-            address = addresses_dict.get(professional.user.id)
-            if not address:
-                continue
-                
-            if address.coordinates and isinstance(address.coordinates, dict):
-                prof_lat = address.coordinates.get('latitude')
-                prof_lng = address.coordinates.get('longitude')
-                
-                if prof_lat and prof_lng:
-                    prof_coords = (float(prof_lat), float(prof_lng))
-                    distance = calculate_distance(user_coords, prof_coords)
-                    
-                    if distance <= radius_miles:
-                        professionals_with_location.append({
-                            'professional': professional,
-                            'address': address,
-                            'distance': distance,
-                            'coordinates': prof_coords
-                        })
+            user_coords = DEFAULT_SEARCH_COORDINATES
+            used_location = DEFAULT_SEARCH_LOCATION
+        
+        # Filter professionals by location (must have coordinates) and badges using the precomputed
+        # search documents. Services, review aggregates and the highlighted review all come with them.
+        professionals_with_location = find_search_candidates(
+            user_coords, radius_miles, price_min, price_max, requested_animal_tokens,
+            filter_background_checked, filter_insured, filter_elite_pro
+        )
         
         logger.debug(f"Found {len(professionals_with_location)} professionals within {radius_miles} miles")
         
-        # Pre-fetch all services and reviews in batch queries to avoid N+1 queries
-        professional_ids = [prof_data['professional'].professional_id for prof_data in professionals_with_location]
-        
-        # Batch fetch all services
-        all_services = Service.objects.filter(
-            professional__professional_id__in=professional_ids,
-            moderation_status='APPROVED',
-            is_active=True,
-            searchable=True,
-            is_archived=False
-        ).select_related('professional')
-        
-        # Group services by professional
-        services_by_professional = {}
-        for service in all_services:
-            prof_id = service.professional.professional_id
-            if prof_id not in services_by_professional:
-                services_by_professional[prof_id] = []
-            services_by_professional[prof_id].append(service)
-        
-        # Batch fetch all reviews with aggregation
-        reviews_data = ClientReview.objects.filter(
-            professional__professional_id__in=professional_ids,
-            status='APPROVED',
-            review_visible=True
-        ).values('professional__professional_id').annotate(
-            avg_rating=Avg('rating'),
-            review_count=Count('review_id')
-        )
-        
-        # Create reviews lookup dict
-        reviews_by_professional = {}
-        for review_data in reviews_data:
-            reviews_by_professional[review_data['professional__professional_id']] = {
-                'avg_rating': review_data['avg_rating'] or 0,
-                'review_count': review_data['review_count']
-            }
+        # Score every candidate service against the query in one database round trip
+        relevance_by_service = {}
+        if service_query and not is_all_services and professionals_with_location:
+            relevance_by_service = get_relevance_by_service(
+                Service.objects.filter(
+                    professional_id__in=[p['professional'].professional_id for p in professionals_with_location],
+                    **SEARCHABLE_SERVICE_FILTERS
+                ),
+                service_query
+            )
         
-        # Batch fetch latest highest reviews
-        latest_reviews = ClientReview.objects.filter(
-            professional__professional_id__in=professional_ids,
-            status='APPROVED',
-            review_visible=True,
-            rating=5
-        ).select_related('client__user').order_by('professional__professional_id', '-created_at').distinct('professional__professional_id')
-        
-        latest_reviews_by_professional = {}
-        for review in latest_reviews:
-            prof_id = review.professional.professional_id
-            latest_reviews_by_professional[prof_id] = {
-                'text': review.review_text,
-                'author_profile_pic': review.client.user.profile_picture.url if (
-                    review.client and 
-                    review.client.user and 
-                    hasattr(review.client.user, 'profile_picture') and 
-                    review.client.user.profile_picture
-                ) else None
-            }
-
         # Now filter services for each professional
         results = []
         
         for prof_data in professionals_with_location:
-            professional = prof_data['professional']
-            address = prof_data['address']
-            
-            # Get services from pre-fetched data
-            services = services_by_professional.get(professional.professional_id, [])
+            # Get services from the search document
+            services = prof_data['document'].services
             
             # Filter by animal types if specified
-            if animal_types:
-                # Expand animal types to include related species
-                expanded_animal_types = []
-                for animal in animal_types:
-                    expanded_animal_types.append(animal)
-                    # If searching for lizards (singular or plural), also include bearded dragons and leopard geckos
-                    if animal.lower() in ['lizard', 'lizards']:
-                        expanded_animal_types.extend(['bearded dragons', 'leopard geckos'])
-                
-                logger.debug(f"Original animal_types: {animal_types}")
-                logger.debug(f"Expanded animal_types: {expanded_animal_types}")
-                
-                animal_filtered_services = []
-                for service in services:
-                    if service.animal_types and isinstance(service.animal_types, dict):
-                        # Check if any of the requested animal types are in the service's animal_types
-                        service_animals = list(service.animal_types.keys())
-                        logger.debug(f"Service {service.service_id} animals: {service_animals}")
-                        
-                        # More flexible matching logic
-                        service_matched = False
-                        for requested_animal in expanded_animal_types:
-                            for service_animal in service_animals:
-                                # Check for partial matches (ignoring case and plural/singular differences)
-                                requested_lower = requested_animal.lower().strip()
-                                service_lower = service_animal.lower().strip()
-                                
-                                # Direct substring match (both ways)
-                                if requested_lower in service_lower or service_lower in requested_lower:
-                                    service_matched = True
-                                    break
-                                
-                                # Handle plurals by removing 's' for comparison
-                                requested_singular = requested_lower.rstrip('s')
-                                service_singular = service_lower.rstrip('s')
-                                if requested_singular in service_singular or service_singular in requested_singular:
-                                    service_matched = True
-                                    break
-                            
-                            if service_matched:
-                                break
-                        
-                        if service_matched:
-                            logger.debug(f"Service {service.service_id} matched!")
-                            animal_filtered_services.append(service)
-                        
-                services = animal_filtered_services
+            if requested_animal_tokens:
+                services = filter_services_by_animal_tokens(services, requested_animal_tokens)
             
             # Filter by price range
             price_filtered_services = [
                 service for service in services
-                if price_min <= float(service.base_rate) <= price_max
+                if price_min <= float(service['base_rate']) <= price_max
             ]
             services = price_filtered_services
             
@@ -478,7 +476,7 @@ def search_professionals(request):
             
             for service in services:
                 # Check overnight requirement
-                if overnight_service and not service.is_overnight:
+                if overnight_service and not service['is_overnight']:
                     # If overnight is required but service doesn't offer it, it's a fuzzy match
                     is_exact_match = False
                 else:
@@ -488,20 +486,8 @@ def search_professionals(request):
                 # Check service query relevance
                 relevance_score = 0
                 if service_query and not is_all_services:
-                    service_name_lower = service.service_name.lower()
-                    service_desc_lower = service.description.lower()
-                    query_lower = service_query.lower()
-                    
-                    # Exact match in name gets highest score
-                    if query_lower in service_name_lower:
-                        relevance_score = 3
-                    # Exact match in description gets medium score
-                    elif query_lower in service_desc_lower:
-                        relevance_score = 2
-                    # Partial word matches get lower score
-                    elif any(word in service_name_lower or word in service_desc_lower 
-                            for word in query_lower.split()):
-                        relevance_score = 1
+                    # 3 = query in name, 2 = query in description, 1 = any word matches (see services.text_search)
+                    relevance_score = relevance_by_service.get(service['service_id'], 0)
                     
                     # If no relevance and we have a specific service query, skip this service
                     if relevance_score == 0:
@@ -513,7 +499,7 @@ def search_professionals(request):
                 service_data = {
                     'service': service,
                     'relevance_score': relevance_score,
-                    'is_overnight_match': service.is_overnight if overnight_service else True
+                    'is_overnight_match': service['is_overnight'] if overnight_service else True
                 }
                 
                 # Categorize as exact or fuzzy match
@@ -526,80 +512,17 @@ def search_professionals(request):
             best_service = None
             if exact_matches:
                 # Sort exact matches by relevance score, then by price
-                exact_matches.sort(key=lambda x: (-x['relevance_score'], x['service'].base_rate))
+                exact_matches.sort(key=lambda x: (-x['relevance_score'], Decimal(x['service']['base_rate'])))
                 best_service = exact_matches[0]['service']
                 match_type = 'exact'
             elif fuzzy_matches:
                 # Sort fuzzy matches by relevance score, then by price
-                fuzzy_matches.sort(key=lambda x: (-x['relevance_score'], x['service'].base_rate))
+                fuzzy_matches.sort(key=lambda x: (-x['relevance_score'], Decimal(x['service']['base_rate'])))
                 best_service = fuzzy_matches[0]['service']
                 match_type = 'fuzzy'
             
             if best_service:
-                # Format location string
-                location_parts = []
-                if address.city:
-                    location_parts.append(address.city)
-                if address.state:
-                    location_parts.append(address.state)
-                location_str = ', '.join(location_parts)
-                
-                # Get profile picture URL
-                profile_picture_url = None
-                if professional.user.profile_picture:
-                    profile_picture_url = professional.user.profile_picture.url
-                
-                # Ensure coordinates are valid before including in result
-                coord_lat = address.coordinates.get('latitude')
-                coord_lng = address.coordinates.get('longitude')
-                
-                if coord_lat is None or coord_lng is None:
-                    continue  # Skip this professional if coordinates are invalid
-                
-                # Get review data from pre-fetched data
-                review_data = reviews_by_professional.get(professional.professional_id, {'avg_rating': 0, 'review_count': 0})
-                avg_rating = review_data['avg_rating']
-                review_count = review_data['review_count']
-                
-                # Format the average rating (5.0 if >= 4.995, otherwise round to 2 decimal places)
-                formatted_avg_rating = 5.0 if avg_rating >= 4.995 else round(avg_rating, 2)
-                
-                # Get the latest highest-rated review text from pre-fetched data
-                latest_review_data = latest_reviews_by_professional.get(professional.professional_id, {'text': None, 'author_profile_pic': None})
-                latest_review_text = latest_review_data['text']
-                latest_review_author_profile_pic = latest_review_data['author_profile_pic']
-                
-                result = {
-                    'professional_id': professional.professional_id,
-                    'name': professional.user.name,
-                    'profile_picture_url': profile_picture_url,
-                    'location': location_str,
-                    'coordinates': {
-                        'latitude': float(coord_lat),
-                        'longitude': float(coord_lng)
-                    },
-                    'primary_service': {
-                        'service_id': best_service.service_id,
-                        'service_name': best_service.service_name,
-                        'price_per_visit': float(best_service.base_rate),
-                        'unit_of_time': best_service.unit_of_time,
-                        'is_overnight': best_service.is_overnight
-                    },
-                    'match_type': match_type,
-                    'distance': prof_data['distance'],
-                    'reviews': {
-                        'average_rating': formatted_avg_rating,
-                        'review_count': review_count,
-                        'latest_highest_review_text': latest_review_text,
-                        'latest_review_author_profile_pic': latest_review_author_profile_pic
-                    },
-                    'badges': {
-                        'is_background_checked': professional.is_background_checked,
-                        'is_insured': professional.is_insured,
-                        'is_elite_pro': professional.is_elite_pro
-                    }
-                }
-                results.append(result)
+                results.append(build_search_result(prof_data, best_service, match_type))
         
         logger.debug(f"Found {len(results)} professionals with matching services")
         
@@ -613,99 +536,28 @@ def search_professionals(request):
             fallback_message = f"No professionals found for '{original_service_query}'"
             logger.info(f"Performing fallback search for all services in Colorado Springs")
             
-            # Reset search to Colorado Springs with all services
-            user_coords = (38.8339, -104.8214)  # Colorado Springs coordinates
-            used_location = "Colorado Springs, Colorado"
-            
-            # Re-run the location filtering for fallback
-            professionals_with_location = []
-            for professional in professionals_query:
-                try:
-                    address = Address.objects.get(
-                        user=professional.user,
-                        address_type=AddressType.SERVICE
-                    )
-                    
-                    if address.coordinates and isinstance(address.coordinates, dict):
-                        prof_lat = address.coordinates.get('latitude')
-                        prof_lng = address.coordinates.get('longitude')
-                        
-                        if prof_lat and prof_lng:
-                            prof_coords = (float(prof_lat), float(prof_lng))
-                            distance = calculate_distance(user_coords, prof_coords)
-                            
-                            if distance <= radius_miles:
-                                professionals_with_location.append({
-                                    'professional': professional,
-                                    'address': address,
-                                    'distance': distance,
-                                    'coordinates': prof_coords
-                                })
-                except Address.DoesNotExist:
-                    continue
+            # Re-run the location filtering for fallback, unless the primary search already covered Colorado Springs
+            if user_coords != DEFAULT_SEARCH_COORDINATES:
+                user_coords = DEFAULT_SEARCH_COORDINATES
+                professionals_with_location = find_search_candidates(
+                    user_coords, radius_miles, price_min, price_max, requested_animal_tokens,
+                    filter_background_checked, filter_insured, filter_elite_pro
+                )
+            used_location = DEFAULT_SEARCH_LOCATION
             
             # Re-run service filtering for fallback (all services)
             results = []
             for prof_data in professionals_with_location:
-                professional = prof_data['professional']
-                address = prof_data['address']
-                
-                # Get all approved services for this professional
-                services = Service.objects.filter(
-                    professional=professional,
-                    moderation_status='APPROVED',
-                    is_active=True,
-                    searchable=True,
-                    is_archived=False
-                )
+                services = prof_data['document'].services
                 
                 # Filter by animal types if specified
-                if animal_types:
-                    # Expand animal types to include related species
-                    expanded_animal_types = []
-                    for animal in animal_types:
-                        expanded_animal_types.append(animal)
-                        # If searching for lizards (singular or plural), also include bearded dragons and leopard geckos
-                        if animal.lower() in ['lizard', 'lizards']:
-                            expanded_animal_types.extend(['bearded dragons', 'leopard geckos'])
-                    
-                    animal_filtered_services = []
-                    for service in services:
-                        if service.animal_types and isinstance(service.animal_types, dict):
-                            service_animals = list(service.animal_types.keys())
-                            
-                            # More flexible matching logic
-                            service_matched = False
-                            for requested_animal in expanded_animal_types:
-                                for service_animal in service_animals:
-                                    # Check for partial matches (ignoring case and plural/singular differences)
-                                    requested_lower = requested_animal.lower().strip()
-                                    service_lower = service_animal.lower().strip()
-                                    
-                                    # Direct substring match (both ways)
-                                    if requested_lower in service_lower or service_lower in requested_lower:
-                                        service_matched = True
-                                        break
-                                    
-                                    # Handle plurals by removing 's' for comparison
-                                    requested_singular = requested_lower.rstrip('s')
-                                    service_singular = service_lower.rstrip('s')
-                                    if requested_singular in service_singular or service_singular in requested_singular:
-                                        service_matched = True
-                                        break
-                                
-                                if service_matched:
-                                    break
-                            
-                            if service_matched:
-                                animal_filtered_services.append(service)
-                    
-                    services = animal_filtered_services
+                if requested_animal_tokens:
+                    services = filter_services_by_animal_tokens(services, requested_animal_tokens)
                 
                 # Filter by price range
                 price_filtered_services = [
                     service for service in services
-                    if price_min <= float(service.base_rate) <= price_max
+                    if price_min <= float(service['base_rate']) <= price_max
                 ]
                 services = price_filtered_services
                 
@@ -713,72 +565,9 @@ def search_professionals(request):
                     continue
                 
                 # For fallback, select the best service for display (highest price first)
-                best_service = select_best_service_for_display(services)
-                
-                # Format location string
-                location_parts = []
-                if address.city:
-                    location_parts.append(address.city)
-                if address.state:
-                    location_parts.append(address.state)
-                location_str = ', '.join(location_parts)
-                
-                # Get profile picture URL
-                profile_picture_url = None
-                if professional.user.profile_picture:
-                    profile_picture_url = professional.user.profile_picture.url
-                
-                # Ensure coordinates are valid before including in result
-                coord_lat = address.coordinates.get('latitude')
-                coord_lng = address.coordinates.get('longitude')
-                
-                if coord_lat is None or coord_lng is None:
-                    continue  # Skip this professional if coordinates are invalid
-                
-                # Get review data from pre-fetched data (fallback section)
-                review_data = reviews_by_professional.get(professional.professional_id, {'avg_rating': 0, 'review_count': 0})
-                avg_rating = review_data['avg_rating']
-                review_count = review_data['review_count']
-                
-                # Format the average rating
-                formatted_avg_rating = 5.0 if avg_rating >= 4.995 else round(avg_rating, 2)
-                
-                # Get the latest highest-rated review text from pre-fetched data
-                latest_review_data = latest_reviews_by_professional.get(professional.professional_id, {'text': None, 'author_profile_pic': None})
-                latest_review_text = latest_review_data['text']
-                latest_review_author_profile_pic = latest_review_data['author_profile_pic']
-                
-                result = {
-                    'professional_id': professional.professional_id,
-                    'name': professional.user.name,
-                    'profile_picture_url': profile_picture_url,
-                    'location': location_str,
-                    'coordinates': {
-                        'latitude': float(coord_lat),
-                        'longitude': float(coord_lng)
-                    },
-                    'primary_service': {
-                        'service_id': best_service.service_id,
-                        'service_name': best_service.service_name,
-                        'price_per_visit': float(best_service.base_rate),
-                        'unit_of_time': best_service.unit_of_time,
-                        'is_overnight': best_service.is_overnight
-                    },
-                    'match_type': 'fallback',
-                    'distance': prof_data['distance'],
-                    'reviews': {
-                        'average_rating': formatted_avg_rating,
-                        'review_count': review_count,
-                        'latest_highest_review_text': latest_review_text,
-                        'latest_review_author_profile_pic': latest_review_author_profile_pic
-                    },
-                    'badges': {
-                        'is_background_checked': professional.is_background_checked,
-                        'is_insured': professional.is_insured,
-                        'is_elite_pro': professional.is_elite_pro
-                    }
-                }
-                results.append(result)
+                best_service = select_best_service_summary(services)
+                results.append(build_search_result(prof_data, best_service, 'fallback'))
+        
         
         # Separate exact and fuzzy matches for badge-aware sorting
         exact_results = [r for r in results if r['match_type'] == 'exact']
@@ -790,14 +579,17 @@ def search_professionals(request):
             badges = result['badges']
             return badges['is_background_checked'] or badges['is_insured'] or badges['is_elite_pro']
         
+        # Seeded from the search token so every page of this search sees the same order
+        search_rng = get_search_rng(search_token)
+        
         # Sort each group by badges, then randomize within badge groups
         def sort_by_badges_and_randomize(results_list):
             with_badges = [r for r in results_list if has_badges(r)]
             without_badges = [r for r in results_list if not has_badges(r)]
             
             # Randomize within each badge group
-            random.shuffle(with_badges)
-            random.shuffle(without_badges)
+            search_rng.shuffle(with_badges)
+            search_rng.shuffle(without_badges)
             
             # Return with badges first, then without badges
             return with_badges + without_badges
@@ -810,39 +602,27 @@ def search_professionals(request):
         # Combine with exact matches first, then fuzzy, then fallback
         final_results = sorted_exact_results + sorted_fuzzy_results + sorted_fallback_results
         
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_results = final_results[start_idx:end_idx]
-        
-        # Remove match_type from final response (internal use only)
-        for result in paginated_results:
-            del result['match_type']
-            del result['distance']  # Remove distance for now as requested
+        # Cache the ordered result set so later pages don't recompute it
+        save_search_session(
+            search_token,
+            params_key,
+            [
+                (r['professional_id'], r['primary_service']['service_id'], r['match_type'], r['distance'])
+                for r in final_results
+            ],
+            fallback_message,
+            used_location
+        )
         
-        response_data = {
-            'professionals': paginated_results,
-            'total_count': len(final_results),
-            'has_more': end_idx < len(final_results),
-            'page': page,
-            'page_size': page_size,
-            'fallback_message': fallback_message,
-            'search_location': used_location
-        }
+        # Apply pagination
+        paginated_results = final_results[offset:offset + page_size]
+        response_data = build_search_page_response(
+            paginated_results, len(final_results), offset, page_size,
+            fallback_message, used_location, search_token
+        )
         
         # Store search log in database for analytics and business intelligence
-        search_params_for_log = {
-            'animal_types': animal_types,
-            'location': location,
-            'service_query': service_query,
-            'overnight_service': overnight_service,
-            'price_min': price_min,
-            'price_max': price_max,
-            'radius_miles': radius_miles,
-            'filter_background_checked': filter_background_checked,
-            'filter_insured': filter_insured,
-            'filter_elite_pro': filter_elite_pro
-        }
+        search_params_for_log = search_params
         
         results_data_for_log = {
             'results_found': len(final_results),
@@ -854,11 +634,10 @@ def search_professionals(request):
         # Only create search log if skip_logging is False
         if not skip_logging:
             try:
-                # Create search log entry (handles deduplication automatically)
-                search_log = SearchLog.create_from_search_params(request, search_params_for_log, results_data_for_log)
-                logger.debug(f"Search log created with ID: {search_log.search_id}")
+                # Written in batches by a background thread (handles deduplication automatically)
+                enqueue_search_log(build_search_log_entry(request, search_params_for_log, results_data_for_log))
             except Exception as e:
-                logger.error(f"Failed to create search log: {str(e)}")
+                logger.error(f"Failed to queue search log: {str(e)}")
         else:
             logger.debug("Skipping search log creation due to skip_logging=True")
         
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from reviews.rating_aggregates import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = 'Recompute the rating aggregates stored on Professional from approved, visible client reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--professional-id',
+            type=int,
+            action='append',
+            dest='professional_ids',
+            help='Only rebuild this professional (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        updated = rebuild_rating_aggregates(options['professional_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates for {updated} professionals"))
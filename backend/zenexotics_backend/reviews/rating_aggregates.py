@@ -0,0 +1,145 @@
+"""
+Maintains the denormalized ClientReview aggregates stored on Professional:
+average_rating, review_count, review_rating_total and latest_highlight_review.
+
+Only APPROVED, visible reviews count. Every ClientReview save/delete applies
+the difference between the review's old and new state with F() updates, so
+nothing re-aggregates the whole review table. rebuild_rating_aggregates()
+recomputes everything from scratch for backfills and repairs.
+"""
+
+import logging
+
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+
+from professionals.models import Professional
+from .models import ClientReview
+
+logger = logging.getLogger(__name__)
+
+# Reviews with this rating can be shown as a professional's highlighted review
+HIGHLIGHT_REVIEW_RATING = 5
+
+
+def snapshot_review(review):
+    """The parts of a ClientReview that affect its professional's aggregates"""
+    return {
+        'professional_id': review.professional_id,
+        'status': review.status,
+        'review_visible': review.review_visible,
+        'rating': review.rating,
+    }
+
+
+def _counts_toward_rating(snapshot):
+    return bool(snapshot) and snapshot['status'] == 'APPROVED' and snapshot['review_visible']
+
+
+def _is_highlight(snapshot):
+    return _counts_toward_rating(snapshot) and snapshot['rating'] == HIGHLIGHT_REVIEW_RATING
+
+
+def _highlight_review_subquery(professional_ref):
+    """Latest highlight-eligible review for the professional referenced by professional_ref"""
+    return Subquery(
+        ClientReview.objects.filter(
+            professional=professional_ref,
+            status='APPROVED',
+            review_visible=True,
+            rating=HIGHLIGHT_REVIEW_RATING
+        ).order_by('-created_at', '-review_id').values('review_id')[:1]
+    )
+
+
+def _apply_rating_delta(professional_id, count_delta, total_delta):
+    """Shift a professional's count and rating total, recomputing the average in the same UPDATE"""
+    if not count_delta and not total_delta:
+        return
+
+    new_count = F('review_count') + count_delta
+    new_total = F('review_rating_total') + total_delta
+    Professional.objects.filter(professional_id=professional_id).update(
+        review_count=new_count,
+        review_rating_total=new_total,
+        average_rating=Case(
+            When(review_count__gt=-count_delta, then=Cast(new_total, FloatField()) / new_count),
+            default=Value(0.0),
+            output_field=FloatField()
+        )
+    )
+
+
+def apply_review_change(review, old_snapshot, new_snapshot):
+    """
+    Update the professional aggregates for one ClientReview change.
+
+    Args:
+        review: The ClientReview that was created, updated or deleted
+        old_snapshot: snapshot_review() from before the change (None when created)
+        new_snapshot: snapshot_review() after the change (None when deleted)
+    """
+    old_counts = _counts_toward_rating(old_snapshot)
+    new_counts = _counts_toward_rating(new_snapshot)
+
+    # Take the old state off the old professional and add the new state to the new one
+    # (they're the same professional unless the review was reassigned)
+    if old_counts:
+        _apply_rating_delta(old_snapshot['professional_id'], -1, -old_snapshot['rating'])
+    if new_counts:
+        _apply_rating_delta(new_snapshot['professional_id'], 1, new_snapshot['rating'])
+
+    was_highlight = _is_highlight(old_snapshot)
+    is_highlight = _is_highlight(new_snapshot)
+
+    if is_highlight and not (was_highlight and old_snapshot['professional_id'] == new_snapshot['professional_id']):
+        # Point at this review unless the professional already highlights a newer one
+        Professional.objects.filter(
+            Q(latest_highlight_review__isnull=True) | Q(latest_highlight_review__created_at__lte=review.created_at),
+            professional_id=new_snapshot['professional_id']
+        ).update(latest_highlight_review=review.review_id)
+
+    if was_highlight and not (is_highlight and old_snapshot['professional_id'] == new_snapshot['professional_id']):
+        # This review may have been the highlighted one. Deleting it already nulled the pointer (SET_NULL).
+        Professional.objects.filter(
+            Q(latest_highlight_review=review.review_id) | Q(latest_highlight_review__isnull=True),
+            professional_id=old_snapshot['professional_id']
+        ).update(latest_highlight_review=_highlight_review_subquery(OuterRef('professional_id')))
+
+
+def rebuild_rating_aggregates(professional_ids=None):
+    """
+    Recompute the rating aggregates from the review table.
+    Runs two UPDATE statements regardless of how many professionals are affected.
+
+    Args:
+        professional_ids: Only rebuild these professionals (default: all)
+
+    Returns:
+        int: Number of professionals updated
+    """
+    professionals = Professional.objects.all()
+    if professional_ids is not None:
+        professionals = professionals.filter(professional_id__in=professional_ids)
+
+    counted_reviews = ClientReview.objects.filter(
+        professional=OuterRef('professional_id'),
+        status='APPROVED',
+        review_visible=True
+    ).order_by().values('professional')
+
+    updated = professionals.update(
+        review_count=Coalesce(Subquery(counted_reviews.annotate(c=Count('review_id')).values('c')[:1]), 0),
+        review_rating_total=Coalesce(Subquery(counted_reviews.annotate(t=Sum('rating')).values('t')[:1]), 0),
+        latest_highlight_review=_highlight_review_subquery(OuterRef('professional_id')),
+    )
+    professionals.update(
+        average_rating=Case(
+            When(review_count__gt=0, then=Cast(F('review_rating_total'), FloatField()) / F('review_count')),
+            default=Value(0.0),
+            output_field=FloatField()
+        )
+    )
+
+    logger.info(f"Rebuilt rating aggregates for {updated} professionals")
+    return updated
@@ -0,0 +1,29 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import ClientReview
+from .rating_aggregates import snapshot_review, apply_review_change
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=ClientReview)
+def remember_review_rating_state(sender, instance, **kwargs):
+    """Keep the stored state so post_save can apply only the difference"""
+    instance._rating_snapshot = None
+    if instance.pk:
+        previous = ClientReview.objects.filter(pk=instance.pk).values(
+            'professional_id', 'status', 'review_visible', 'rating'
+        ).first()
+        instance._rating_snapshot = previous
+
+
+@receiver(post_save, sender=ClientReview)
+def update_rating_aggregates_on_save(sender, instance, created, **kwargs):
+    old_snapshot = None if created else getattr(instance, '_rating_snapshot', None)
+    apply_review_change(instance, old_snapshot, snapshot_review(instance))
+
+
+@receiver(post_delete, sender=ClientReview)
+def update_rating_aggregates_on_delete(sender, instance, **kwargs):
+    apply_review_change(instance, snapshot_review(instance), None)
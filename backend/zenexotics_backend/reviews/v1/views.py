@@ -140,8 +140,10 @@ class GetUserReviewsView(APIView):
 
                 safe_log("MBA32i4ofn4: clientreviews", reviews)
                 
-                # Calculate average rating
-                avg_rating = reviews.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
+                # Rating aggregates are maintained on the professional (see reviews.rating_aggregates)
+                rating_stats = Professional.objects.filter(user=target_user).values('average_rating', 'review_count').first()
+                avg_rating = rating_stats['average_rating'] if rating_stats else 0
+                review_count = rating_stats['review_count'] if rating_stats else 0
 
                 logger.info(f"MBA32i4ofn4: avg_rating: {avg_rating}")
                 
@@ -228,12 +230,13 @@ class GetUserReviewsView(APIView):
                         'reviewer_profile_picture': reviewer_profile_picture
                     })
 
+                review_count = len(reviews_data)
                 safe_log("MBA32i4ofn4: reviews_data", reviews_data)
             
             return Response({
                 'reviews': reviews_data,
                 'average_rating': 5.0 if avg_rating >= 4.995 else round(avg_rating, 2),
-                'review_count': len(reviews_data)
+                'review_count': review_count
             })
             
         except Exception as e:
@@ -0,0 +1,142 @@
+"""
+Normalized animal-token vocabulary used to match search requests to services.
+
+Service.animal_types keys ("Bearded Dragons", "Large Dogs", ...) and the animal
+types a client searches for are both reduced to sets of lowercase, singular
+tokens. A service matches a search when the two token sets intersect, which
+Postgres can answer from a GIN index (ArrayField __overlap) instead of
+string-matching every service per request.
+
+A service stores each animal's full name plus its head, the kind of animal it
+is: the last word ("Guinea Pigs" is a pig) and its synonym group ("Bearded
+Dragons" is a lizard). Heads are stored as "is:<word>" so they only match a
+search for that one word. Searching "pig" finds "Guinea Pigs", but "Pot Belly
+Pig" doesn't, and "Large Dogs" doesn't find "Small Dogs". A search also
+carries the last word of what was asked for as a full name, so "Large Dogs"
+still finds a service offering plain "Dogs".
+"""
+
+import re
+
+# Group -> animal names that are a kind of that group. Searching for the group
+# finds services offering a member ("lizard" finds "Bearded Dragons"); searching
+# for a member doesn't find the group or the other members.
+ANIMAL_SYNONYMS = {
+    'dog': ['puppy', 'canine'],
+    'cat': ['kitten', 'feline'],
+    'lizard': ['bearded dragon', 'leopard gecko', 'gecko', 'iguana', 'chameleon', 'skink', 'uromastyx'],
+    'snake': ['python', 'boa', 'corn snake', 'king snake'],
+    'turtle': ['tortoise'],
+    'rabbit': ['bunny'],
+    'bird': ['parrot', 'parakeet', 'budgie', 'cockatiel', 'cockatoo', 'macaw', 'finch', 'canary', 'conure', 'lovebird'],
+    'chicken': ['hen', 'rooster', 'chick'],
+    'horse': ['pony', 'equine'],
+}
+
+# Plurals the suffix rules below get wrong
+IRREGULAR_SINGULARS = {
+    'geese': 'goose',
+    'mice': 'mouse',
+    'oxen': 'ox',
+    'cattle': 'cow',
+    'puppies': 'puppy',
+    'bunnies': 'bunny',
+    'ponies': 'pony',
+}
+
+# Words that never end in a plural 's' we should strip
+UNCOUNTABLE_WORDS = {'fish', 'sheep', 'deer', 'moose', 'bison', 'swine', 'octopus', 'platypus', 'asparagus'}
+
+_SYNONYM_GROUPS = {
+    member: group
+    for group, members in ANIMAL_SYNONYMS.items()
+    for member in members
+}
+
+# Marks a service's head tokens so they can't match a search's full names
+HEAD_TOKEN_PREFIX = 'is:'
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9 ]+')
+
+
+def singularize_word(word):
+    """Best-effort singular form of one lowercase word"""
+    if word in IRREGULAR_SINGULARS:
+        return IRREGULAR_SINGULARS[word]
+    if word in UNCOUNTABLE_WORDS or len(word) <= 3:
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('ches', 'shes', 'xes', 'sses', 'zzes')):
+        return word[:-2]
+    if word.endswith('ss') or word.endswith('us'):
+        return word
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+def normalize_animal_name(name):
+    """'  Bearded Dragons ' -> 'bearded dragon'"""
+    if not isinstance(name, str):
+        return ''
+    cleaned = _NON_ALPHANUMERIC.sub(' ', name.lower())
+    return ' '.join(singularize_word(word) for word in cleaned.split())
+
+
+def head_token(word):
+    """Token a service stores for the kind of animal it offers ('is:pig')"""
+    return f'{HEAD_TOKEN_PREFIX}{word}'
+
+
+def get_service_animal_tokens(animal_types):
+    """
+    Tokens stored on a service for its animal_types keys: each full name, plus
+    head tokens for its last word and synonym group.
+
+    Args:
+        animal_types: Service.animal_types dict ({animal name: category})
+
+    Returns:
+        list: Sorted, de-duplicated tokens
+    """
+    if not isinstance(animal_types, dict):
+        return []
+
+    tokens = set()
+    for animal in animal_types.keys():
+        phrase = normalize_animal_name(animal)
+        if not phrase:
+            continue
+        last_word = phrase.split()[-1]
+        tokens.add(phrase)
+        tokens.add(head_token(last_word))
+        for name in (phrase, last_word):
+            group = _SYNONYM_GROUPS.get(name)
+            if group:
+                tokens.add(head_token(group))
+    return sorted(tokens)
+
+
+def get_requested_animal_tokens(animal_types):
+    """
+    Tokens for the animal types a client searched for: each full name and its
+    last word, plus the head token when the name is a single word.
+
+    Args:
+        animal_types: List of animal names from the search request
+
+    Returns:
+        list: Sorted, de-duplicated tokens
+    """
+    tokens = set()
+    for animal in animal_types or []:
+        phrase = normalize_animal_name(animal)
+        if not phrase:
+            continue
+        words = phrase.split()
+        tokens.add(phrase)
+        tokens.add(words[-1])
+        if len(words) == 1:
+            tokens.add(head_token(phrase))
+    return sorted(tokens)
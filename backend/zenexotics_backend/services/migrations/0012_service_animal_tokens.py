@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:24
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from services.animal_tokens import get_service_animal_tokens
+
+
+def backfill_animal_tokens(apps, schema_editor):
+    Service = apps.get_model('services', 'Service')
+
+    # Historical models don't run Service.save(), so compute the tokens here
+    services = list(Service.objects.all())
+    for service in services:
+        service.animal_tokens = get_service_animal_tokens(service.animal_types)
+    Service.objects.bulk_update(services, ['animal_tokens'], batch_size=500)
+
+
+def reverse_backfill_animal_tokens(apps, schema_editor):
+    # Column is dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0011_add_is_archived_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='animal_tokens',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['animal_tokens'], name='service_animal_tokens_gin'),
+        ),
+        migrations.RunPython(backfill_animal_tokens, reverse_backfill_animal_tokens),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:25
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+from services.text_search import SERVICE_SEARCH_VECTOR
+
+
+def backfill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Service = apps.get_model('services', 'Service')
+    Service.objects.update(search_vector=SERVICE_SEARCH_VECTOR)
+
+
+def reverse_backfill_search_vector(apps, schema_editor):
+    # Column is dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0012_service_animal_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='service_search_vector_gin'),
+        ),
+        migrations.RunPython(backfill_search_vector, reverse_backfill_search_vector),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+from services.animal_tokens import get_service_animal_tokens
+
+
+def recompute_animal_tokens(apps, schema_editor):
+    Service = apps.get_model('services', 'Service')
+    ProfessionalSearchDocument = apps.get_model('professionals', 'ProfessionalSearchDocument')
+
+    # Historical models don't run Service.save(), so compute the tokens here
+    services = list(Service.objects.all())
+    for service in services:
+        service.animal_tokens = get_service_animal_tokens(service.animal_types)
+    Service.objects.bulk_update(services, ['animal_tokens'], batch_size=500)
+
+    # Search documents carry a copy of each service's tokens and their union
+    documents = list(ProfessionalSearchDocument.objects.all())
+    for document in documents:
+        tokens = set()
+        for summary in document.services or []:
+            summary['animal_tokens'] = get_service_animal_tokens(summary.get('animal_types'))
+            tokens.update(summary['animal_tokens'])
+        document.animal_tokens = sorted(tokens)
+    ProfessionalSearchDocument.objects.bulk_update(documents, ['services', 'animal_tokens'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0013_service_search_vector'),
+        ('professionals', '0006_professional_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_animal_tokens, migrations.RunPython.noop),
+    ]
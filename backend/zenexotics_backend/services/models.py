@@ -1,6 +1,10 @@
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db.models import JSONField
+from .animal_tokens import get_service_animal_tokens
+from .text_search import refresh_service_search_vector
 
 class Service(models.Model):
     MODERATION_STATUS_CHOICES = [
@@ -44,6 +48,9 @@ class Service(models.Model):
     description = models.TextField()
     # Replace animal_type and categories with a single JSONField
     animal_types = JSONField(default=dict, help_text='JSON field mapping animal types to their categories')
+    # Normalized tokens for the animal_types keys (see services.animal_tokens).
+    # Kept in sync with animal_types in save() - never set this directly.
+    animal_tokens = ArrayField(models.CharField(max_length=100), default=list, blank=True, editable=False)
     base_rate = models.DecimalField(max_digits=10, decimal_places=2)
     additional_animal_rate = models.DecimalField(max_digits=10, decimal_places=2)
     holiday_rate = models.DecimalField(max_digits=10, decimal_places=2)
@@ -62,10 +69,29 @@ class Service(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     searchable = models.BooleanField(default=True)
+    # Full-text vector over service_name and description, refreshed in save() (see services.text_search)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.service_name} by {self.professional}"
 
+    def save(self, *args, **kwargs):
+        self.animal_tokens = get_service_animal_tokens(self.animal_types)
+
+        # Make sure partial saves of animal_types also persist the tokens
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'animal_types' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'animal_tokens'}
+
+        super().save(*args, **kwargs)
+
+        if update_fields is None or {'service_name', 'description'} & set(update_fields):
+            refresh_service_search_vector(self.service_id)
+
     class Meta:
         db_table = 'services'
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['animal_tokens'], name='service_animal_tokens_gin'),
+            GinIndex(fields=['search_vector'], name='service_search_vector_gin'),
+        ]
@@ -0,0 +1,94 @@
+"""
+Database-side relevance scoring of services against a free-text service query.
+
+Scores (same scale search_professionals has always used):
+    3 - the whole query appears in the service name
+    2 - the whole query appears in the description
+    1 - any word of the query matches the name or description
+    0 - no match
+
+On PostgreSQL the word-level match uses the GIN-indexed Service.search_vector
+(English stemming, so "walk" also finds "walking"). Other backends (SQLite in
+tests) fall back to per-word LIKE matching.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+SEARCH_CONFIG = 'english'
+
+# Name matches rank above description matches
+SERVICE_SEARCH_VECTOR = (
+    SearchVector('service_name', weight='A', config=SEARCH_CONFIG) +
+    SearchVector('description', weight='B', config=SEARCH_CONFIG)
+)
+
+NAME_MATCH_SCORE = 3
+DESCRIPTION_MATCH_SCORE = 2
+WORD_MATCH_SCORE = 1
+
+
+def supports_full_text_search():
+    return connection.vendor == 'postgresql'
+
+
+def _any_word_condition(words):
+    """Q object matching services where any of the words matches name or description"""
+    if supports_full_text_search():
+        query = None
+        for word in words:
+            word_query = SearchQuery(word, config=SEARCH_CONFIG)
+            query = word_query if query is None else query | word_query
+        return Q(search_vector=query)
+
+    condition = Q()
+    for word in words:
+        condition |= Q(service_name__icontains=word) | Q(description__icontains=word)
+    return condition
+
+
+def annotate_query_relevance(queryset, service_query):
+    """
+    Annotate a Service queryset with relevance (3/2/1/0) for service_query.
+
+    Args:
+        queryset: Service queryset
+        service_query: Raw query string from the search box
+
+    Returns:
+        QuerySet: queryset with a 'relevance' integer annotation
+    """
+    query = (service_query or '').strip()
+    words = query.lower().split()
+    if not words:
+        return queryset.annotate(relevance=Value(0, output_field=IntegerField()))
+
+    return queryset.annotate(
+        relevance=Case(
+            When(service_name__icontains=query, then=Value(NAME_MATCH_SCORE)),
+            When(description__icontains=query, then=Value(DESCRIPTION_MATCH_SCORE)),
+            When(_any_word_condition(words), then=Value(WORD_MATCH_SCORE)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    )
+
+
+def get_relevance_by_service(queryset, service_query):
+    """{service_id: relevance} for the services in queryset that match service_query at all"""
+    return dict(
+        annotate_query_relevance(queryset, service_query)
+        .filter(relevance__gt=0)
+        .order_by()
+        .values_list('service_id', 'relevance')
+    )
+
+
+def refresh_service_search_vector(service_id):
+    """Recompute the stored search_vector for one service (PostgreSQL only)"""
+    from .models import Service
+
+    if not supports_full_text_search():
+        return
+    Service.objects.filter(service_id=service_id).update(search_vector=SERVICE_SEARCH_VECTOR)
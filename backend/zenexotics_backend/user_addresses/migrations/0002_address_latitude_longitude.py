@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:08
+
+from django.db import migrations, models
+from core.geo_utils import extract_lat_lng
+
+
+def backfill_lat_lng(apps, schema_editor):
+    Address = apps.get_model('user_addresses', 'Address')
+
+    # Copy coordinates JSON into the new indexed float columns
+    addresses = list(Address.objects.exclude(coordinates__isnull=True))
+    for address in addresses:
+        address.latitude, address.longitude = extract_lat_lng(address.coordinates)
+    Address.objects.bulk_update(addresses, ['latitude', 'longitude'], batch_size=500)
+
+
+def reverse_backfill_lat_lng(apps, schema_editor):
+    # Columns are dropped on reverse, nothing to undo
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_addresses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['address_type', 'latitude', 'longitude'], name='address_type_lat_lng_idx'),
+        ),
+        migrations.RunPython(backfill_lat_lng, reverse_backfill_lat_lng),
+    ]
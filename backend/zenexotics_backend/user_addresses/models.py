@@ -1,5 +1,6 @@
 from django.db import models
 from users.models import User
+from core.geo_utils import extract_lat_lng
 
 class AddressType(models.TextChoices):
     SERVICE = 'SERVICE', 'Service'
@@ -15,6 +16,10 @@ class Address(models.Model):
     zip = models.CharField(max_length=20)
     country = models.CharField(max_length=100)
     coordinates = models.JSONField(null=True, blank=True)
+    # Denormalized copies of coordinates['latitude'/'longitude'] for indexed bounding-box queries.
+    # Kept in sync with coordinates in save() - never set these directly.
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     address_type = models.CharField(
         max_length=20,
         choices=AddressType.choices,
@@ -24,4 +29,21 @@ class Address(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        verbose_name_plural = 'Addresses' 
\ No newline at end of file
+        verbose_name_plural = 'Addresses'
+        indexes = [
+            models.Index(fields=['address_type', 'latitude', 'longitude'], name='address_type_lat_lng_idx'),
+        ]
+
+    def sync_coordinate_columns(self):
+        """Copy latitude/longitude out of the coordinates JSON into the indexed float columns"""
+        self.latitude, self.longitude = extract_lat_lng(self.coordinates)
+
+    def save(self, *args, **kwargs):
+        self.sync_coordinate_columns()
+
+        # Make sure partial saves of coordinates also persist the indexed columns
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'coordinates' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'latitude', 'longitude'}
+
+        super().save(*args, **kwargs)
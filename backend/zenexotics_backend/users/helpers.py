@@ -618,10 +618,9 @@ def get_user_reviews_data(user):
                 review_visible=True
             ).select_related('client', 'client__user', 'booking', 'booking__service_id')
             
-            # Calculate average rating for professional reviews
-            prof_avg_rating = professional_reviews.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
-            professional_average_rating = float(prof_avg_rating)
-            professional_review_count = professional_reviews.count()
+            # Rating aggregates are maintained on the professional (see reviews.rating_aggregates)
+            professional_average_rating = professional.average_rating
+            professional_review_count = professional.review_count
             
             # Format professional reviews data (reviews about this user as a professional)
             for review in professional_reviews:
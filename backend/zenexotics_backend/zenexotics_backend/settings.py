@@ -172,6 +172,7 @@ INSTALLED_APPS = [
     
     # Other apps
     'contracts',
+    'holiday_calendar',  # Holiday rules for holiday pricing
     'logs',  # Comprehensive logging app (includes search_logs, get_matched_logs)
     'interaction_logs',
     'error_logs',